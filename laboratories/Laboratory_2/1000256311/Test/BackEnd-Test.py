@@ -2,7 +2,7 @@ import requests
 import sys
 import io
 import os
-from LogSaver import Logger, DuplicadorSalida
+from LogSaver import Logger, DuplicadorSalida, archivos_de_log
 from reportlab.pdfgen import canvas
 import textwrap
 # Endpoints
@@ -125,7 +125,8 @@ def capturar_y_guardar_pdf():
 
     captura = io.StringIO()
     sys.stdout = DuplicadorSalida(sys.__stdout__, captura)
-    limpiar_archivo("Logs/app.log")
+    for archivo in archivos_de_log():
+        limpiar_archivo(archivo)
 
     try:
         integration_test()
@@ -136,8 +137,11 @@ def capturar_y_guardar_pdf():
 
     
 
-    with open("Logs/app.log", "r", encoding="utf-8") as f:
-        contenido_existente = f.read()
+    # Un archivo por proceso: Users_Service, Task_Service y esta prueba
+    contenido_existente = ""
+    for archivo in archivos_de_log():
+        with open(archivo, "r", encoding="utf-8") as f:
+            contenido_existente += f"--- {os.path.basename(archivo)} ---\n" + f.read()
         
     
 
@@ -154,7 +158,8 @@ def capturar_y_guardar_pdf():
     nombre_pdf = obtener_siguiente_numero()
     guardar_en_pdf(contenido_total, nombre_pdf)
     print(f"PDF generado: {nombre_pdf}")
-    limpiar_archivo("Logs/app.log")
+    for archivo in archivos_de_log():
+        limpiar_archivo(archivo)
 
 if __name__ == "__main__":
     capturar_y_guardar_pdf()
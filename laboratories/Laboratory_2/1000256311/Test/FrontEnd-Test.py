@@ -4,7 +4,7 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from LogSaver import Logger, DuplicadorSalida
+from LogSaver import Logger, DuplicadorSalida, archivos_de_log
 from reportlab.pdfgen import canvas
 import textwrap
 import sys
@@ -129,7 +129,8 @@ def capturar_y_guardar_pdf():
 
     captura = io.StringIO()
     sys.stdout = DuplicadorSalida(sys.__stdout__, captura)
-    limpiar_archivo("Logs/app.log")
+    for archivo in archivos_de_log():
+        limpiar_archivo(archivo)
 
     try:
         main()
@@ -140,8 +141,11 @@ def capturar_y_guardar_pdf():
 
     
 
-    with open("Logs/app.log", "r", encoding="utf-8") as f:
-        contenido_existente = f.read()
+    # Un archivo por proceso: Users_Service, Task_Service y esta prueba
+    contenido_existente = ""
+    for archivo in archivos_de_log():
+        with open(archivo, "r", encoding="utf-8") as f:
+            contenido_existente += f"--- {os.path.basename(archivo)} ---\n" + f.read()
         
     
 
@@ -158,7 +162,8 @@ def capturar_y_guardar_pdf():
     nombre_pdf = obtener_siguiente_numero()
     guardar_en_pdf(contenido_total, nombre_pdf)
     print(f"PDF generado: {nombre_pdf}")
-    limpiar_archivo("Logs/app.log")
+    for archivo in archivos_de_log():
+        limpiar_archivo(archivo)
 
 def main():
     # Main test runner that initializes the browser and runs the full E2E flow
@@ -1,6 +1,46 @@
+import atexit
+import copy
+import datetime
+import glob
+import json
 import logging
 import os
+import queue
+import sys
+import threading
 import traceback
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+def nombre_proceso():
+    """Users_Service, Task_Service, BackEnd-Test...: el programa que se está ejecutando"""
+    script = os.path.abspath(sys.argv[0]) if sys.argv and sys.argv[0] not in ("", "-c") else ""
+    nombre = os.path.splitext(os.path.basename(script))[0]
+    if nombre == "main":
+        nombre = os.path.basename(os.path.dirname(script))
+    return nombre or f"pid{os.getpid()}"
+
+# Ruta a la carpeta Logs dentro de Test (=> .../1000256311/Test/Logs/app-Users_Service.log)
+# Cada proceso escribe en su propio archivo: la rotación la hace cada uno por
+# su cuenta y, con un archivo compartido, un proceso lo renombraría mientras
+# el otro sigue escribiendo en el anterior. LOG_FILE cambia la ruta.
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+LOG_PATH = os.environ.get("LOG_FILE", os.path.join(BASE_DIR, "Logs", f"app-{nombre_proceso()}.log"))
+LOG_DIR = os.path.dirname(LOG_PATH)
+LOG_MAX_BYTES = int(os.environ.get("LOG_MAX_BYTES", str(5 * 1024 * 1024)))
+LOG_BACKUP_COUNT = int(os.environ.get("LOG_BACKUP_COUNT", "5"))
+
+LEVELS = {
+    "critical": logging.CRITICAL,
+    "debug": logging.DEBUG,
+    "error": logging.ERROR,
+    "warn": logging.WARNING,
+    "info": logging.INFO,
+}
+
+def archivos_de_log():
+    """Los archivos de log de todos los procesos (servicios y pruebas)"""
+    return sorted(glob.glob(os.path.join(LOG_DIR, "app*.log")))
+
 class DuplicadorSalida:
     def __init__(self, *destinos):
         self.destinos = destinos
@@ -10,49 +50,133 @@ class DuplicadorSalida:
     def flush(self):
         for d in self.destinos:
             d.flush()
-class Logger():
 
-    def __init__(self):
-        self.logger = self.__set_logger()
-        
-    def __set_logger(self):
-        # log_directory = 'Logs'
-        # log_filename = 'app.log'
-        base_dir = os.path.dirname(os.path.abspath(__file__))  # => .../1000256311/Test
-
-        # Ruta a la carpeta Logs dentro de Test
-        log_directory = os.path.join(base_dir, "Logs")
-        log_filename = "app.log"
-        logger = logging.getLogger(__name__)
-        logger.setLevel(logging.DEBUG)
+class JsonLinesFormatter(logging.Formatter):
+    """Un objeto JSON por línea: fecha, nivel, mensaje y dónde se originó"""
 
-        log_path = os.path.join(log_directory, log_filename)
-        file_handler = logging.FileHandler(log_path, encoding='utf-8')
-        file_handler.setLevel(logging.DEBUG)
+    def format(self, record):
+        entry = {
+            "time": datetime.datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "message": record.getMessage(),
+            "source": f"{record.module}:{record.funcName}:{record.lineno}",
+            "process": record.process,
+            "thread": record.threadName,
+        }
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False)
+
+class JsonQueueHandler(QueueHandler):
+    """QueueHandler que guarda la traza de la excepción en exc_text
+
+    QueueHandler.prepare borra exc_info (no se puede pasar entre hilos tal
+    cual) y añade la traza al mensaje; aquí el mensaje queda solo y la traza
+    llega al formateador en su propio campo.
+    """
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.exc_info = None
+        return record
+
+class BufferedRotatingFileHandler(RotatingFileHandler):
+    """RotatingFileHandler que no hace flush por cada línea
+
+    RotatingFileHandler consulta el tamaño con seek()/tell(), lo que vacía el
+    buffer en cada registro; aquí el tamaño se lleva en memoria y el flush lo
+    hace el listener cuando la cola queda vacía.
+    """
+
+    def __init__(self, filename, maxBytes=0, backupCount=0, encoding="utf-8"):
+        super().__init__(filename, maxBytes=maxBytes, backupCount=backupCount, encoding=encoding, delay=True)
+        self._size = os.path.getsize(filename) if os.path.exists(filename) else 0
 
-        formatter = logging.Formatter('%(asctime)s | %(levelname)s | %(message)s', "%Y-%m-%d %H:%M:%S")
-        file_handler.setFormatter(formatter)
+    def emit(self, record):
+        try:
+            line = self.format(record) + self.terminator
+            size = len(line.encode(self.encoding))
+            if self.maxBytes > 0 and self._size and self._size + size > self.maxBytes:
+                self.doRollover()
+                self._size = 0
+            if self.stream is None:
+                self.stream = self._open()
+            self.stream.write(line)
+            self._size += size
+        except Exception:
+            self.handleError(record)
+
+class FlushingQueueListener(QueueListener):
+    """Escribe los registros en segundo plano y hace flush solo cuando la cola se vacía"""
+
+    def dequeue(self, block):
+        try:
+            return self.queue.get_nowait()
+        except queue.Empty:
+            for handler in self.handlers:
+                handler.flush()
+            return self.queue.get(block)
 
-        if (logger.hasHandlers()):
-            logger.handlers.clear()
+_setup_lock = threading.Lock()
+_listener = None
 
-        logger.addHandler(file_handler)
+def configure_logging(path=LOG_PATH, max_bytes=LOG_MAX_BYTES, backup_count=LOG_BACKUP_COUNT):
+    """Configura una sola vez por proceso el logger de la aplicación y lo devuelve
 
+    Quien registra solo encola el mensaje (QueueHandler); un hilo del
+    QueueListener lo escribe como JSON en el archivo, que rota al llegar a
+    `max_bytes`. Al terminar el proceso se vacía la cola.
+    """
+    global _listener
+    logger = logging.getLogger(__name__)
+    # add_to_log pasa por aquí en cada registro: ya configurado, no se toma el lock
+    if _listener is not None:
         return logger
+    with _setup_lock:
+        if _listener is not None:
+            return logger
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        file_handler = BufferedRotatingFileHandler(path, maxBytes=max_bytes, backupCount=backup_count)
+        file_handler.setLevel(logging.DEBUG)
+        file_handler.setFormatter(JsonLinesFormatter())
+
+        log_queue = queue.SimpleQueue()
+        logger.setLevel(logging.DEBUG)
+        logger.handlers.clear()
+        logger.addHandler(JsonQueueHandler(log_queue))
+
+        _listener = FlushingQueueListener(log_queue, file_handler, respect_handler_level=True)
+        _listener.start()
+        atexit.register(shutdown_logging)
+    return logger
+
+def shutdown_logging():
+    """Escribe lo que quede en la cola y cierra el archivo"""
+    global _listener
+    with _setup_lock:
+        listener, _listener = _listener, None
+    if listener is not None:
+        listener.stop()
+        for handler in listener.handlers:
+            handler.close()
+
+class Logger():
+
+    def __init__(self):
+        self.logger = configure_logging()
+
     @classmethod
     def add_to_log(cls,level,message):
         try:
-            logger = cls.__set_logger(cls)
-            if (level == "critical"):
-                logger.critical(message)
-            elif (level == "debug"):
-                logger.debug(message)
-            elif (level == "error"):
-                logger.error(message)
-            elif (level == "warn"):
-                logger.warning(message)
-            elif (level == "info"):
-                logger.info(message)
+            numeric_level = LEVELS.get(level)
+            if numeric_level is not None:
+                # stacklevel=2: el origen del registro es quien llamó a add_to_log
+                configure_logging().log(numeric_level, message, stacklevel=2)
 
         except Exception as ex:
             print(traceback.format_exc())
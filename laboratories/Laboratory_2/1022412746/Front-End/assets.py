@@ -0,0 +1,108 @@
+"""
+Static assets built once at startup
+
+Every file in static/ is read when the Front-End starts, renamed after a hash
+of its content (app.css -> app.1a2b3c4d.css) and compressed once with gzip
+and, if the brotli package is installed, brotli. GET /assets/<name> serves
+the variant the client accepts with `Cache-Control: immutable` for a year:
+a changed file gets a new name, so a cached copy never has to be revalidated.
+
+Pages (the HTML shell) are also rendered and compressed once, and served
+with a strong ETag and `no-cache`: browsers revalidate them on every visit
+and get a bodiless 304 while nothing changed.
+"""
+
+import gzip
+import hashlib
+import mimetypes
+from pathlib import Path
+
+from flask import Response, abort, request
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Smaller bodies aren't worth compressing
+COMPRESS_MIN_BYTES = 256
+ASSET_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+PAGE_CACHE_CONTROL = 'no-cache'
+
+
+class Asset:
+    """A body with its precompressed variants: {None: raw, 'gzip': ..., 'br': ...}"""
+
+    def __init__(self, body, content_type, cache_control):
+        self.content_type = content_type
+        self.cache_control = cache_control
+        self.digest = hashlib.sha256(body).hexdigest()
+        self.variants = {None: body}
+        if len(body) >= COMPRESS_MIN_BYTES:
+            # Compressed once, so the slowest, smallest settings are affordable
+            self._add('gzip', gzip.compress(body, compresslevel=9, mtime=0))
+            if brotli is not None:
+                self._add('br', brotli.compress(body, quality=11))
+
+    def _add(self, encoding, body):
+        if len(body) < len(self.variants[None]):
+            self.variants[encoding] = body
+
+    def response(self):
+        """The variant the request accepts, or 304 if its ETag matches"""
+        encoding = request.accept_encodings.best_match([e for e in ('br', 'gzip') if e in self.variants])
+        # One ETag per variant: they are different representations
+        etag = self.digest[:16] + (f'-{encoding}' if encoding else '')
+        if request.if_none_match.contains(etag):
+            response = Response(status=304)
+        else:
+            response = Response(self.variants[encoding], content_type=self.content_type)
+            if encoding:
+                response.headers['Content-Encoding'] = encoding
+        response.set_etag(etag)
+        response.vary.add('Accept-Encoding')
+        response.headers['Cache-Control'] = self.cache_control
+        return response
+
+
+class AssetPipeline:
+    def __init__(self, static_dir, url_prefix='/assets'):
+        self.static_dir = Path(static_dir)
+        self.url_prefix = url_prefix
+        self.assets = {}    # fingerprinted name -> Asset
+        self.manifest = {}  # source name -> fingerprinted name
+        self.pages = {}
+
+    def init_app(self, app):
+        self.build()
+        app.add_url_rule(f'{self.url_prefix}/<path:name>', 'asset', self.serve, methods=['GET'])
+        app.jinja_env.globals['asset_url'] = self.url
+
+    def build(self):
+        for path in sorted(p for p in self.static_dir.rglob('*') if p.is_file()):
+            source = path.relative_to(self.static_dir).as_posix()
+            content_type = mimetypes.guess_type(path.name)[0] or 'application/octet-stream'
+            if content_type.startswith('text/') or content_type == 'application/javascript':
+                content_type += '; charset=utf-8'
+            asset = Asset(path.read_bytes(), content_type, ASSET_CACHE_CONTROL)
+            stem, dot, suffix = source.rpartition('.')
+            name = f'{stem}.{asset.digest[:10]}.{suffix}' if dot else f'{source}.{asset.digest[:10]}'
+            self.assets[name] = asset
+            self.manifest[source] = name
+
+    def url(self, source):
+        """Fingerprinted URL of a file in static/"""
+        return f'{self.url_prefix}/{self.manifest[source]}'
+
+    def serve(self, name):
+        asset = self.assets.get(name)
+        if asset is None:
+            abort(404)
+        return asset.response()
+
+    def add_page(self, name, html):
+        """Keep a rendered page; serve it with page(name)"""
+        self.pages[name] = Asset(html.encode('utf-8'), 'text/html; charset=utf-8', PAGE_CACHE_CONTROL)
+
+    def page(self, name):
+        return self.pages[name].response()
@@ -0,0 +1,105 @@
+"""
+Backend-for-frontend for the task list: the page only talks to its own origin
+
+The page used to call Users_Service and Task_Service itself, and naming the
+owner of every task took one more request per user. Dashboard reads keyset
+pages of Task_Service's GET /tasks and names their owners with a single
+GET /users?ids= for those not in a short-lived name cache, over a pooled
+keep-alive session. Rows are compact:
+
+    [id, title, user_id, user_name]       (user_name null for a deleted owner)
+
+Dashboard.task_index() answers the page's first load in one round trip: the
+page index of GET /tasks/page-index and the first page, fetched from
+Task_Service at the same time.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class UpstreamError(Exception):
+    """A service couldn't be reached or answered with an error"""
+
+
+class UserNames:
+    """id -> name (None for a deleted user), remembered for `ttl` seconds"""
+
+    def __init__(self, session, users_url, timeout, ttl=30.0, max_entries=50000, clock=time.monotonic):
+        self.session = session
+        self.url = f'{users_url}/users'
+        self.timeout = timeout
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._names = {}
+
+    def lookup(self, user_ids):
+        now = self._clock()
+        with self._lock:
+            cached = {user_id: self._names.get(user_id) for user_id in user_ids}
+        names = {user_id: entry[0] for user_id, entry in cached.items() if entry and entry[1] > now}
+        missing = sorted(set(user_ids) - names.keys())
+        if missing:
+            try:
+                response = self.session.get(self.url, params={'ids': ','.join(map(str, missing))},
+                                            timeout=self.timeout)
+            except requests.RequestException as e:
+                raise UpstreamError(f'{self.url}: {e}') from None
+            if response.status_code != 200:
+                raise UpstreamError(f'{self.url}: HTTP {response.status_code}')
+            fetched = dict.fromkeys(missing)
+            fetched.update((user['id'], user['name']) for user in response.json()['found'])
+            names.update(fetched)
+            with self._lock:
+                if len(self._names) + len(fetched) > self.max_entries:
+                    self._names.clear()
+                expires = now + self.ttl
+                self._names.update((user_id, (name, expires)) for user_id, name in fetched.items())
+        return names
+
+
+class Dashboard:
+    def __init__(self, users_url, tasks_url, pool_size=4, connect_timeout=0.5, read_timeout=5.0):
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.timeout = (connect_timeout, read_timeout)
+        self.tasks_url = f"{tasks_url.rstrip('/')}/tasks"
+        self.names = UserNames(self.session, users_url.rstrip('/'), self.timeout)
+        self._pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix='dashboard')
+
+    def _get(self, url, params):
+        try:
+            response = self.session.get(url, params=params, timeout=self.timeout)
+        except requests.RequestException as e:
+            raise UpstreamError(f'{url}: {e}') from None
+        if response.status_code != 200:
+            raise UpstreamError(f'{url}: HTTP {response.status_code}')
+        return response.json()
+
+    def task_page(self, params):
+        """One keyset page of GET /tasks (`params` are passed through) with owners' names
+
+        Returns {"tasks": [[id, title, user_id, user_name], ...], "next_after"}.
+        """
+        page = self._get(self.tasks_url, params)
+        names = self.names.lookup({task['user_id'] for task in page['items']})
+        return {'tasks': [[task['id'], task['title'], task['user_id'], names.get(task['user_id'])]
+                          for task in page['items']],
+                'next_after': page['next_after']}
+
+    def task_index(self, params):
+        """GET /tasks/page-index for these filters plus its first page, fetched concurrently
+
+        Returns {"page_size", "total", "anchors", "first_page": [[id, title, user_id, user_name], ...]}.
+        """
+        index = self._pool.submit(self._get, f'{self.tasks_url}/page-index', params)
+        first_page = self._pool.submit(self.task_page, params)
+        return {**index.result(), 'first_page': first_page.result()['tasks']}
@@ -1,171 +1,78 @@
-from flask import Flask, render_template_string
+from flask import Flask, jsonify, render_template, request
+import os
+import sys
 
-frontend = Flask(__name__)
+# Modules shared with the services live in ../shared
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from shared import config
+from shared.health import Health
+from assets import AssetPipeline
+from dashboard import Dashboard, UpstreamError
 
-HTML = '''
-<!DOCTYPE html>
-<html lang="es">
-<head>
-  <meta charset="UTF-8">
-  <title>Laboratorio de Integración</title>
-  <style>
-    * {
-      box-sizing: border-box;
-    }
-    body {
-      font-family: 'Segoe UI', sans-serif;
-      background: #f0f2f5;
-      margin: 0;
-      padding: 40px;
-      display: flex;
-      flex-direction: column;
-      align-items: center;
-    }
-    h1 {
-      margin-bottom: 30px;
-      color: #333;
-    }
-    .card {
-      background: white;
-      border-radius: 10px;
-      padding: 20px 30px;
-      margin-bottom: 30px;
-      width: 100%;
-      max-width: 500px;
-      box-shadow: 0 4px 8px rgba(0,0,0,0.1);
-    }
-    label {
-      font-weight: bold;
-      display: block;
-      margin-top: 15px;
-    }
-    input {
-      width: 100%;
-      padding: 10px;
-      margin-top: 5px;
-      border-radius: 5px;
-      border: 1px solid #ccc;
-    }
-    button {
-      width: 100%;
-      margin-top: 20px;
-      padding: 10px;
-      background: #4CAF50;
-      color: white;
-      font-size: 16px;
-      border: none;
-      border-radius: 5px;
-      cursor: pointer;
-      transition: background 0.3s;
-    }
-    button:hover {
-      background: #45a049;
-    }
-    .result {
-      margin-top: 10px;
-      color: green;
-      font-weight: bold;
-    }
-    .error {
-      margin-top: 10px;
-      color: red;
-      font-weight: bold;
-    }
-    ul {
-      padding-left: 20px;
-      margin-top: 10px;
-    }
-    li {
-      margin-bottom: 6px;
-    }
-  </style>
-</head>
-<body>
-  <h1>🔧 Laboratorio de Integración</h1>
+# static/ is served fingerprinted and precompressed by the asset pipeline, not by Flask
+frontend = Flask(__name__, static_folder=None)
+assets = AssetPipeline(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static'))
+assets.init_app(frontend)
 
-  <div class="card">
-    <h2>👤 Crear Usuario</h2>
-    <label>Nombre:</label>
-    <input id='username' placeholder='Ej: Ana'>
-    <button onclick='crearUsuario()'>Crear Usuario</button>
-    <div id="user-result" class="result"></div>
-  </div>
+# GET /healthz and GET /readyz, like the services (no database here)
+health = Health()
+health.init_app(frontend)
 
-  <div class="card">
-    <h2>📝 Crear Tarea</h2>
-    <label>ID de Usuario:</label>
-    <input id='userid' placeholder='Ej: 1'>
-    <label>Título de la tarea:</label>
-    <input id='task' placeholder='Ej: Terminar laboratorio'>
-    <button onclick='crearTarea()'>Crear Tarea</button>
-    <div id="task-result" class="result"></div>
-  </div>
+# GET /api/tasks and /api/tasks/index: pages of tasks with their owners' names
+dashboard = Dashboard(config.users_service_url(), config.tasks_service_url())
 
-  <div class="card">
-    <h2>📋 Tareas</h2>
-    <button onclick='verTareas()'>Actualizar lista de tareas</button>
-    <ul id='tasks'></ul>
-  </div>
+# The page only depends on the configuration, so it is rendered once
+with frontend.app_context():
+    assets.add_page('index', render_template('index.html', users_url=config.users_service_url(),
+                                             tasks_url=config.tasks_service_url()))
 
-<script>
-function crearUsuario() {
-  const name = document.getElementById('username').value;
-  fetch('http://localhost:5001/users', {
-    method: 'POST',
-    headers: {'Content-Type': 'application/json'},
-    body: JSON.stringify({name})
-  }).then(r => r.json()).then(data => {
-    const result = document.getElementById('user-result');
-    if (data.id) {
-      result.textContent = `✅ Usuario creado con ID ${data.id}`;
-      result.className = 'result';
-    } else {
-      result.textContent = `❌ Error: ${data.error}`;
-      result.className = 'error';
-    }
-  });
-}
+@frontend.route('/')
+def index():
+    return assets.page('index')
 
-function crearTarea() {
-  const title = document.getElementById('task').value;
-  const user_id = document.getElementById('userid').value;
-  fetch('http://localhost:5002/tasks', {
-    method: 'POST',
-    headers: {'Content-Type': 'application/json'},
-    body: JSON.stringify({title, user_id})
-  }).then(r => r.json()).then(data => {
-    const result = document.getElementById('task-result');
-    if (data.id) {
-      result.textContent = `✅ Tarea creada con ID ${data.id}`;
-      result.className = 'result';
-    } else {
-      result.textContent = `❌ Error: ${data.error}`;
-      result.className = 'error';
-    }
-  });
-}
+@frontend.route('/api/tasks', methods=['GET'])
+def api_tasks():
+    """One page of tasks with their owners' names, for the virtualized list
 
-function verTareas() {
-  fetch('http://localhost:5002/tasks')
-    .then(r => r.json())
-    .then(data => {
-      let ul = document.getElementById('tasks');
-      ul.innerHTML = '';
-      data.forEach(t => {
-        let li = document.createElement('li');
-        li.innerText = `${t.title} (Usuario ID: ${t.user_id})`;
-        ul.appendChild(li);
-      });
-    });
-}
-</script>
-</body>
-</html>
-'''
+    ?after=, ?limit=, ?user_id= and ?title_contains= as in Task_Service's GET /tasks.
+    """
+    params, error = task_params(('after', 'limit', 'user_id'))
+    if error:
+        return error
+    try:
+        return jsonify(dashboard.task_page(params))
+    except UpstreamError as e:
+        return jsonify({'error': f'Servicio no disponible: {e}'}), 502
 
-@frontend.route('/')
-def index():
-    return render_template_string(HTML)
+@frontend.route('/api/tasks/index', methods=['GET'])
+def api_task_index():
+    """The page's first load in one round trip: the page index and the first page
+
+    ?limit=, ?user_id= and ?title_contains= as in Task_Service's GET /tasks/page-index.
+    """
+    params, error = task_params(('limit', 'user_id'))
+    if error:
+        return error
+    try:
+        return jsonify(dashboard.task_index(params))
+    except UpstreamError as e:
+        return jsonify({'error': f'Servicio no disponible: {e}'}), 502
+
+def task_params(names):
+    """(query parameters for Task_Service, None) or (None, 400 response)"""
+    params = {}
+    for name in names:
+        value = request.args.get(name, '').strip()
+        if value:
+            if not value.isdigit():
+                return None, (jsonify({'error': f'{name} debe ser un entero no negativo'}), 400)
+            params[name] = value
+    params.setdefault('limit', '100')
+    if request.args.get('title_contains'):
+        params['title_contains'] = request.args['title_contains']
+    return params, None
 
 if __name__ == '__main__':
-    frontend.run(port=5000)
+    health.mark_ready()
+    host, port = config.bind('frontend')
+    frontend.run(host=host, port=port)
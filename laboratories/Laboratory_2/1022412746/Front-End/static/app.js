@@ -0,0 +1,281 @@
+// Service URLs come from the stack configuration (shared/config.py), via
+// data attributes of the page, so this file stays the same for every stack
+const USERS_URL = document.body.dataset.usersUrl;
+const TASKS_URL = document.body.dataset.tasksUrl;
+
+// Form results carry data-state: "pending" from the click until the answer
+// arrives, then "done" (with data-id) or "error", so tests wait for that
+// instead of sleeping
+function showResult(id, data, message) {
+  const result = document.getElementById(id);
+  if (data.id) {
+    result.textContent = `✅ ${message} ${data.id}`;
+    result.className = 'result';
+    result.dataset.id = data.id;
+    result.dataset.state = 'done';
+  } else {
+    result.textContent = `❌ Error: ${data.error}`;
+    result.className = 'error';
+    delete result.dataset.id;
+    result.dataset.state = 'error';
+  }
+}
+
+function submitForm(id, url, body, message) {
+  document.getElementById(id).dataset.state = 'pending';
+  return fetch(url, {
+    method: 'POST',
+    headers: {'Content-Type': 'application/json'},
+    body: JSON.stringify(body)
+  }).then(r => r.json())
+    .catch(e => ({error: e.message}))
+    .then(data => showResult(id, data, message));
+}
+
+function crearUsuario() {
+  const name = document.getElementById('username').value;
+  return submitForm('user-result', USERS_URL + '/users', {name}, 'Usuario creado con ID');
+}
+
+function crearTarea() {
+  const title = document.getElementById('task').value;
+  const user_id = document.getElementById('userid').value;
+  return submitForm('task-result', TASKS_URL + '/tasks', {title, user_id}, 'Tarea creada con ID');
+}
+
+// Virtualized task list: only the rows in view, plus a margin, exist in the
+// DOM, so a million tasks cost the same to draw as a hundred. Rows come in
+// keyset pages: Task_Service's /tasks/page-index gives the first id of every
+// page, so any page can be fetched directly, through the Front-End's
+// /api/tasks, which adds the owners' names. Fetched pages are kept in a
+// bounded LRU cache.
+const ROW_HEIGHT = 28;
+const PAGE_SIZE = 100;
+const OVERSCAN_ROWS = 10;
+const MAX_CACHED_PAGES = 50;
+// Browsers cap element heights (about 17M px in Firefox): taller lists scroll proportionally
+const MAX_SCROLL_HEIGHT = 8000000;
+
+const list = {
+  filters: null,       // query string of the filters the index was loaded for
+  index: null,         // {page_size, total, anchors}
+  pages: new Map(),    // page number -> rows, least recently used first
+  loading: new Map(),  // page number -> token of the request in flight
+  generation: 0,       // bumped by every index request; older answers are dropped
+  error: null,
+};
+
+function filterQuery() {
+  const params = new URLSearchParams({limit: PAGE_SIZE});
+  const userId = document.getElementById('filter-userid').value.trim();
+  const title = document.getElementById('filter-title').value.trim();
+  if (userId) {
+    params.set('user_id', userId);
+  }
+  if (title) {
+    params.set('title_contains', title);
+  }
+  return params.toString();
+}
+
+// Rows [anchors[page], anchors[page + 1]) of the index; unchanged bounds mean unchanged rows
+function pageBounds(index, page) {
+  return page + 1 < index.anchors.length
+    ? `${index.anchors[page]}-${index.anchors[page + 1]}`
+    : `${index.anchors[page]}-end-${index.total}`;
+}
+
+// Load the page index for the current filters, with the first page in the same
+// answer from the Front-End. With keepPages, cached pages whose bounds did not
+// move are kept (a change elsewhere doesn't refetch them).
+function loadIndex(keepPages) {
+  const filters = filterQuery();
+  const generation = ++list.generation;
+  document.getElementById('tasks').dataset.state = 'loading';
+  return fetch(`/api/tasks/index?${filters}`, {cache: 'no-cache'})
+    .then(r => r.json())
+    .then(index => {
+      if (generation !== list.generation) {
+        return;
+      }
+      if (index.error) {
+        throw new Error(index.error);
+      }
+      const old = list.index;
+      if (keepPages && old && filters === list.filters) {
+        for (const page of [...list.pages.keys()]) {
+          if (page >= index.anchors.length || pageBounds(old, page) !== pageBounds(index, page)) {
+            list.pages.delete(page);
+          }
+        }
+      } else {
+        list.pages.clear();
+      }
+      list.loading.clear();
+      if (index.anchors.length) {
+        list.pages.set(0, index.first_page);
+      }
+      list.filters = filters;
+      list.index = index;
+      list.error = null;
+      render();
+    })
+    .catch(e => {
+      if (generation === list.generation) {
+        list.error = e.message;
+        render();
+      }
+    });
+}
+
+function loadPage(page) {
+  const rows = list.pages.get(page);
+  if (rows) {
+    // Most recently used goes last
+    list.pages.delete(page);
+    list.pages.set(page, rows);
+    return;
+  }
+  if (list.loading.has(page)) {
+    return;
+  }
+  const token = {};
+  list.loading.set(page, token);
+  const after = list.index.anchors[page] - 1;
+  fetch(`/api/tasks?${list.filters}&after=${after}`)
+    .then(r => r.json())
+    .then(data => {
+      if (list.loading.get(page) !== token) {
+        return;  // the index changed meanwhile
+      }
+      list.loading.delete(page);
+      if (data.error) {
+        throw new Error(data.error);
+      }
+      list.pages.set(page, data.tasks);
+      while (list.pages.size > MAX_CACHED_PAGES) {
+        list.pages.delete(list.pages.keys().next().value);
+      }
+      scheduleRender();
+    })
+    .catch(e => {
+      if (list.loading.get(page) === token) {
+        list.loading.delete(page);
+      }
+      list.error = e.message;
+      scheduleRender();
+    });
+}
+
+function taskText([id, title, userId, userName]) {
+  return userName === null
+    ? `${title} (Usuario ID: ${userId})`
+    : `${title} (Usuario: ${userName}, ID: ${userId})`;
+}
+
+let renderQueued = false;
+function scheduleRender() {
+  if (!renderQueued) {
+    renderQueued = true;
+    requestAnimationFrame(() => {
+      renderQueued = false;
+      render();
+    });
+  }
+}
+
+// Draw the rows in view; #tasks gets data-state="ready" once all of them are
+// loaded ("loading" while a page is on its way, "error" if a request failed)
+// and data-filters, the query string of the filters those rows match
+function render() {
+  const viewport = document.getElementById('task-viewport');
+  const ul = document.getElementById('tasks');
+  const index = list.index;
+  const total = index ? index.total : 0;
+  const count = document.getElementById('task-count');
+  count.textContent = list.error ? `❌ Error: ${list.error}` : index ? `${total} tareas` : '';
+  count.className = list.error ? 'task-count error' : 'task-count';
+
+  const height = Math.min(total * ROW_HEIGHT, MAX_SCROLL_HEIGHT);
+  document.getElementById('task-spacer').style.height = `${height}px`;
+  const viewRows = viewport.clientHeight / ROW_HEIGHT;
+  const maxScroll = Math.max(height - viewport.clientHeight, 0);
+  // Row at the top of the view: scrollTop / ROW_HEIGHT, unless the height is capped
+  const topRow = maxScroll > 0 ? viewport.scrollTop / maxScroll * Math.max(total - viewRows, 0) : 0;
+  const first = Math.max(Math.floor(topRow) - OVERSCAN_ROWS, 0);
+  const last = Math.min(Math.ceil(topRow + viewRows) + OVERSCAN_ROWS, total);
+  ul.style.transform = `translateY(${viewport.scrollTop + (first - topRow) * ROW_HEIGHT}px)`;
+
+  // The <li> nodes are reused; only their text changes while scrolling
+  while (ul.children.length < last - first) {
+    ul.appendChild(document.createElement('li'));
+  }
+  while (ul.children.length > last - first) {
+    ul.lastChild.remove();
+  }
+  let missing = false;
+  for (let row = first; row < last; row++) {
+    const li = ul.children[row - first];
+    const rows = list.pages.get(Math.floor(row / index.page_size));
+    const task = rows && rows[row % index.page_size];
+    if (task) {
+      li.className = '';
+      li.dataset.taskId = task[0];
+      li.textContent = taskText(task);
+    } else {
+      li.className = 'loading';
+      delete li.dataset.taskId;
+      li.textContent = 'Cargando…';
+      missing = true;
+    }
+  }
+  if (index && last > first) {
+    for (let page = Math.floor(first / index.page_size); page <= Math.floor((last - 1) / index.page_size); page++) {
+      loadPage(page);
+    }
+  }
+  ul.dataset.filters = list.filters || '';
+  ul.dataset.state = list.error ? 'error' : missing ? 'loading' : 'ready';
+}
+
+function debounce(func, ms) {
+  let timer = null;
+  return () => {
+    clearTimeout(timer);
+    timer = setTimeout(func, ms);
+  };
+}
+
+// Reload from the first row (the button, and typing in a filter)
+function verTareas() {
+  document.getElementById('task-viewport').scrollTop = 0;
+  return loadIndex(false);
+}
+
+// Live updates: Task_Service pushes every task creation and deletion as a
+// Server-Sent Event. EventSource reconnects by itself and resumes with
+// Last-Event-ID, so no change is lost while the connection is down. A burst
+// of changes costs one reload of the index and refetches only the pages whose
+// rows changed: pages are keyset ranges, so one create or delete can move the
+// bounds of every later page, which a delta on the cached rows can't tell.
+// data-stream on <body> tells tests whether the stream is open.
+const refreshIndex = debounce(() => loadIndex(true), 200);
+
+function seguirTareas() {
+  const stream = new EventSource(TASKS_URL + '/tasks/stream');
+  stream.addEventListener('create', refreshIndex);
+  stream.addEventListener('delete', refreshIndex);
+  // The change log restarted (database recreated): reload from scratch
+  stream.addEventListener('reset', () => loadIndex(false));
+  stream.addEventListener('ready', () => { document.body.dataset.stream = 'open'; });
+  stream.onerror = () => { document.body.dataset.stream = 'reconnecting'; };
+}
+
+document.getElementById('task-viewport').addEventListener('scroll', scheduleRender);
+window.addEventListener('resize', scheduleRender);
+const applyFilters = debounce(verTareas, 250);
+document.getElementById('filter-userid').addEventListener('input', applyFilters);
+document.getElementById('filter-title').addEventListener('input', applyFilters);
+
+seguirTareas();
+verTareas();
@@ -0,0 +1,287 @@
+"""
+asyncio (ASGI) serving mode for Task_Service
+
+Same JSON contracts as main.py for GET/POST /tasks, GET /users/<id>/tasks
+and DELETE /tasks/<id>, on the same SQLite file: lists carry ETags (304,
+cached bodies, MessagePack and compression through shared/versioning.py),
+users are checked against the replica first, and writes append to the
+task_change log. The Users_Service check runs on a pooled aiohttp client and
+the database on SQLAlchemy's asyncio engine (aiosqlite), so a request
+waiting on either holds no thread.
+
+Run it instead of main.py, not next to it: table versions live in each
+process, so neither app's ETags or cached lists change on the other's
+writes. A GET /tasks/stream of a main.py on the same file would only find
+these writes in task_change when it next wakes up without a local write
+(every 15 s).
+
+Not served here: batches, bulk deletes, /tasks/page-index, /tasks/stream,
+/metrics and group commit; run main.py for those.
+
+    uvicorn async_main:service_b --port 5002     (from Task_Service/)
+    python async_main.py                          (same, TASKS_HOST/TASKS_PORT)
+"""
+
+import asyncio
+import os
+import sys
+
+from quart import Quart, Response, jsonify, request
+from quart_cors import cors
+from sqlalchemy import Column, Integer, MetaData, String, Table, delete, event, insert, select
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from async_users_client import AsyncUsersServiceClient
+from user_cache import AsyncUserVerificationCache
+from user_replica import UserReplica
+from users_client import ServiceUnavailable, UsersServiceClient
+
+# Modules shared by both services live in ../shared
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from shared import config
+from shared.serialization import dumps_json
+from shared.storage import POOL_SIZE, apply_pragmas, is_file_database
+from shared.versioning import ListCache, TableVersions, conditional_list_async
+
+service_b = cors(Quart(__name__))
+
+# Same database as the Flask app: instance/tasks.db unless TASKS_DATABASE_URI overrides it
+instance_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'instance')
+os.makedirs(instance_dir, exist_ok=True)
+database_uri = config.setting('TASKS_DATABASE_URI', f"sqlite:///{os.path.join(instance_dir, 'tasks.db')}")
+engine = create_async_engine(database_uri.replace('sqlite://', 'sqlite+aiosqlite://', 1),
+                             **({'pool_size': POOL_SIZE, 'max_overflow': POOL_SIZE}
+                                if is_file_database(database_uri) else {}))
+if is_file_database(database_uri):
+    event.listen(engine.sync_engine, 'connect', lambda dbapi_connection, _record: apply_pragmas(dbapi_connection))
+
+# Keyset pagination and NDJSON streaming, as in main.py
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+STREAM_BATCH_SIZE = 1000
+
+# The tables main.py maps as Task and TaskChange (same names, columns and index)
+metadata = MetaData()
+tasks = Table(
+    'task', metadata,
+    Column('id', Integer, primary_key=True),
+    Column('title', String(100), nullable=False),
+    Column('user_id', Integer, nullable=False, index=True),
+)
+task_changes = Table(
+    'task_change', metadata,
+    Column('seq', Integer, primary_key=True),
+    Column('task_id', Integer, nullable=False),
+    Column('op', String(10), nullable=False),
+    Column('title', String(100)),
+    Column('user_id', Integer),
+)
+
+# Bumped by the handlers after each commit (main.py's session events do it
+# there); it only counts this process's writes
+table_versions = TableVersions(None, ['task'])
+list_cache = ListCache()
+
+users_client = AsyncUsersServiceClient(
+    config.users_service_url(),
+    pool_size=int(os.environ.get('USERS_SERVICE_POOL_SIZE', '100'))
+)
+user_cache = AsyncUserVerificationCache(users_client.user_exists)
+
+# Same replica as main.py, on its own thread and blocking client; lookup()
+# only takes a lock, so the event loop can call it. Disabled with USER_REPLICA=0.
+USER_REPLICA_WAIT = 20.0
+user_replica = UserReplica(
+    UsersServiceClient(config.users_service_url(),
+                       pool_size=1, read_timeout=USER_REPLICA_WAIT + 5, max_retries=0),
+    wait=USER_REPLICA_WAIT,
+    on_change=user_cache.invalidate,
+    logger=service_b.logger
+)
+
+# SQLite takes one writer at a time; queueing writers here is cheaper than
+# letting them collide and back off in SQLite's busy handler
+write_lock = None
+
+# /readyz answers 200 once the schema exists, as in main.py
+ready = False
+
+@service_b.before_serving
+async def create_schema():
+    global write_lock, ready
+    write_lock = asyncio.Lock()
+    async with engine.begin() as connection:
+        await connection.run_sync(metadata.create_all)
+    if os.environ.get('USER_REPLICA', '1') != '0':
+        user_replica.start()
+    ready = True
+
+@service_b.after_serving
+async def close_pools():
+    user_replica.stop()
+    await users_client.close()
+    await engine.dispose()
+
+@service_b.route('/tasks', methods=['POST'])
+async def create_task():
+    data = await request.get_json(silent=True)
+    if not data or not data.get('title') or not data.get('user_id'):
+        return jsonify({'error': 'Datos inválidos'}), 400
+    try:
+        user_exists = await verify_user(data['user_id'])
+    except ServiceUnavailable as e:
+        return jsonify({'error': str(e)}), 503
+    except Exception as e:
+        return jsonify({'error': f'Error de conexión al verificar usuario: {str(e)}'}), 500
+
+    if not user_exists:
+        return jsonify({'error': 'ID de usuario inválido'}), 400
+
+    async with write_lock, engine.begin() as connection:
+        result = await connection.execute(
+            insert(tasks).values(title=data['title'], user_id=data['user_id']).returning(tasks.c.id, tasks.c.user_id)
+        )
+        task_id, user_id = result.one()
+        await connection.execute(insert(task_changes).values(
+            task_id=task_id, op='create', title=data['title'], user_id=user_id))
+    table_versions.bump('task')
+    return jsonify({'id': task_id, 'title': data['title'], 'user_id': user_id}), 201
+
+async def verify_user(user_id):
+    """True if the user exists; raises ServiceUnavailable when nobody can tell (as in main.py)"""
+    if user_replica.lookup(user_id):
+        return True
+    try:
+        return await user_cache.exists(user_id)
+    except ServiceUnavailable:
+        known = user_replica.lookup(user_id, max_age=user_replica.grace)
+        if known is None:
+            raise
+        return known
+
+@service_b.route('/tasks', methods=['GET'])
+async def get_tasks():
+    try:
+        user_id = int_arg(request.args.get('user_id'))
+    except ValueError:
+        return jsonify({'error': 'user_id debe ser un entero no negativo'}), 400
+    return await list_tasks(user_id, request.args.get('title_contains') or None)
+
+@service_b.route('/users/<int:user_id>/tasks', methods=['GET'])
+async def get_user_tasks(user_id):
+    return await list_tasks(user_id)
+
+async def list_tasks(user_id=None, title_contains=None):
+    try:
+        after = int_arg(request.args.get('after'))
+        limit = int_arg(request.args.get('limit'))
+    except ValueError:
+        return jsonify({'error': 'limit y after deben ser enteros no negativos'}), 400
+    if limit == 0:
+        # Parsed once for both formats: NDJSON would stream nothing and JSON fall back to a default page
+        return jsonify({'error': 'limit debe ser al menos 1'}), 400
+
+    if request.accept_mimetypes.best == 'application/x-ndjson':
+        return stream_tasks_ndjson(after, limit, user_id, title_contains)
+
+    async def build_data():
+        if after is None and limit is None:
+            async with engine.connect() as connection:
+                rows = (await connection.execute(task_rows_query(user_id=user_id, title_contains=title_contains))).all()
+            return [{'id': task_id, 'title': title, 'user_id': owner} for task_id, title, owner in rows]
+
+        page_size = min(limit or DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE)
+        async with engine.connect() as connection:
+            rows = (await connection.execute(task_rows_query(after, user_id, title_contains).limit(page_size))).all()
+        items = [{'id': task_id, 'title': title, 'user_id': owner} for task_id, title, owner in rows]
+        next_after = items[-1]['id'] if len(items) == page_size else None
+        return {'items': items, 'next_after': next_after}
+
+    return await conditional_list_async(table_versions, list_cache, 'task', build_data, request, Response)
+
+def int_arg(value):
+    """Parse an optional non-negative integer query-string value"""
+    if value is None or value == '':
+        return None
+    number = int(value)
+    if number < 0:
+        raise ValueError(value)
+    return number
+
+def task_rows_query(after=None, user_id=None, title_contains=None):
+    """SELECT id, title, user_id ordered by id, starting after the given id (keyset)"""
+    query = select(tasks.c.id, tasks.c.title, tasks.c.user_id).order_by(tasks.c.id)
+    if user_id is not None:
+        query = query.where(tasks.c.user_id == user_id)
+    if title_contains:
+        query = query.where(tasks.c.title.contains(title_contains, autoescape=True))
+    if after is not None:
+        query = query.where(tasks.c.id > after)
+    return query
+
+def stream_tasks_ndjson(after=None, limit=None, user_id=None, title_contains=None):
+    """Stream one JSON object per line from a server-side cursor"""
+    query = task_rows_query(after, user_id, title_contains)
+    if limit is not None:
+        query = query.limit(limit)
+
+    async def generate():
+        async with engine.connect() as connection:
+            result = await connection.stream(query.execution_options(yield_per=STREAM_BATCH_SIZE))
+            async for task_id, title, owner in result:
+                yield dumps_json({'id': task_id, 'title': title, 'user_id': owner}) + b'\n'
+
+    return Response(generate(), mimetype='application/x-ndjson')
+
+@service_b.route('/tasks/<int:task_id>', methods=['DELETE'])
+async def delete_task(task_id):
+    async with write_lock, engine.begin() as connection:
+        result = await connection.execute(delete(tasks).where(tasks.c.id == task_id).returning(tasks.c.user_id))
+        deleted = result.one_or_none()
+        if deleted is not None:
+            await connection.execute(insert(task_changes).values(task_id=task_id, op='delete', user_id=deleted.user_id))
+    if deleted is not None:
+        table_versions.bump('task')
+        return jsonify({'message': f'Task {task_id} deleted successfully'}), 200
+    return jsonify({'error': 'Task not found'}), 404
+
+@service_b.route('/healthz', methods=['GET'])
+async def healthz():
+    return jsonify({'status': 'ok'})
+
+@service_b.route('/readyz', methods=['GET'])
+async def readyz():
+    if not ready:
+        return jsonify({'status': 'starting'}), 503
+    try:
+        async with engine.connect() as connection:
+            await connection.exec_driver_sql('SELECT 1')
+    except Exception as e:
+        return jsonify({'status': 'unavailable', 'error': str(e)}), 503
+    return jsonify({'status': 'ready'})
+
+@service_b.route('/tasks/user-cache', methods=['GET'])
+async def user_cache_stats():
+    """Hit/miss counters of the user verification cache, plus the state of the replica"""
+    return jsonify({**user_cache.stats(), 'replica': user_replica.stats()})
+
+@service_b.route('/tasks/user-cache', methods=['DELETE'])
+async def forget_deleted_users():
+    """Drop deleted users from the cache and the replica: {"user_ids": [...]}, or everyone without it
+
+    Users_Service calls this before it answers a delete, so the next task for
+    a deleted user is rejected instead of accepted until its cached answer expires.
+    """
+    data = await request.get_json(silent=True)
+    user_ids = data.get('user_ids') if isinstance(data, dict) else None
+    if user_ids is not None and not isinstance(user_ids, list):
+        return jsonify({'error': 'user_ids must be a list'}), 400
+    for user_id in [None] if user_ids is None else user_ids:
+        user_cache.invalidate(user_id)
+        user_replica.forget(user_id)
+    return jsonify({'forgotten': 'all' if user_ids is None else len(user_ids)})
+
+if __name__ == '__main__':
+    import uvicorn
+    host, port = config.bind('tasks')
+    uvicorn.run(service_b, host=host, port=port)
@@ -0,0 +1,84 @@
+import asyncio
+
+import aiohttp
+
+from users_client import CircuitBreaker, ServiceUnavailable
+
+
+class AsyncUsersServiceClient:
+    """asyncio counterpart of UsersServiceClient, for the ASGI Task_Service
+
+    Same timeouts, retries and circuit breaker; the keep-alive pool is an
+    aiohttp connector, so a lookup in flight holds a socket but no thread.
+    (httpx's pool scans every connection on each request, which dominated
+    the CPU profile with a few hundred lookups in flight.)
+    """
+
+    def __init__(self, base_url, pool_size=20, connect_timeout=0.5, read_timeout=2.0,
+                 max_retries=2, backoff=0.05, breaker=None):
+        self.base_url = base_url.rstrip('/')
+        self.pool_size = pool_size
+        # Requests wait for a free connection instead of failing, like pool_block=True
+        self.timeout = aiohttp.ClientTimeout(total=None, sock_connect=connect_timeout, sock_read=read_timeout)
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.breaker = breaker or CircuitBreaker()
+        self.session = None
+
+    def _session(self):
+        # aiohttp sessions belong to the running event loop, so it's created on first use
+        if self.session is None:
+            self.session = aiohttp.ClientSession(
+                self.base_url,
+                connector=aiohttp.TCPConnector(limit=self.pool_size),
+                timeout=self.timeout
+            )
+        return self.session
+
+    async def get(self, path, **kwargs):
+        """GET with timeouts, bounded retries and the circuit breaker
+
+        Returns (status, body) for any status below 500; raises
+        ServiceUnavailable when Users_Service is unhealthy.
+        """
+        if not self.breaker.allow_request():
+            raise ServiceUnavailable('Users_Service no disponible (circuito abierto)')
+
+        # As in UsersServiceClient.get: the breaker learns every outcome, even a
+        # cancellation or an unexpected error, or a half-open trial would block
+        # every later call
+        succeeded = False
+        try:
+            last_error = None
+            for attempt in range(self.max_retries + 1):
+                if attempt:
+                    await asyncio.sleep(self.backoff * (2 ** (attempt - 1)))
+                try:
+                    async with self._session().get(path, **kwargs) as response:
+                        body = await response.read()
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    last_error = e
+                    continue
+                if response.status < 500:
+                    succeeded = True
+                    return response.status, body
+                last_error = f'{response.status} de Users_Service'
+            raise ServiceUnavailable(f'Users_Service no disponible: {last_error}')
+        finally:
+            if succeeded:
+                self.breaker.record_success()
+            else:
+                self.breaker.record_failure()
+
+    async def user_exists(self, user_id):
+        """True/False for 200/404, None for any other answer"""
+        status, _ = await self.get(f'/users/{user_id}')
+        if status == 200:
+            return True
+        if status == 404:
+            return False
+        return None
+
+    async def close(self):
+        if self.session is not None:
+            await self.session.close()
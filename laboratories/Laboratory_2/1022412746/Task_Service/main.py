@@ -1,52 +1,454 @@
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, Response, stream_with_context
 from flask_sqlalchemy import SQLAlchemy
 from flask_cors import CORS
-import requests
+from sqlalchemy import event
+from sqlalchemy.exc import OperationalError
+import functools
 import os
+import sys
+import time
+from user_cache import UserVerificationCache
+from user_replica import UserReplica
+from users_client import InvalidUserIds, UsersServiceClient, ServiceUnavailable
+
+# Modules shared by both services live in ../shared
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from shared import config
+from shared.group_commit import GroupCommitWriter
+from shared.health import Health
+from shared.metrics import Metrics
+from shared.serialization import dumps_json
+from shared.storage import configure_sqlite, init_storage, is_locked_error, retry_when_locked, start_wal_checkpointer
+from shared.versioning import ListCache, TableVersions, conditional_list
 
 service_b = Flask(__name__)
 CORS(service_b)
 
-# Create instance directory if it doesn't exist
-instance_dir = os.path.join(os.path.dirname(__file__), 'instance')
-if not os.path.exists(instance_dir):
-    os.makedirs(instance_dir)
-
-# Configure database to use instance directory
-db_path = os.path.join(instance_dir, 'tasks.db')
-service_b.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{db_path}'
-service_b.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+# SQLite file in the instance directory, with the shared storage profile (WAL, busy timeout, ...)
+configure_sqlite(service_b, 'tasks.db', 'TASKS_DATABASE_URI')
 db = SQLAlchemy(service_b)
+engine = init_storage(service_b, db)
+
+# Per-route request counts/latencies, SQL timings and outbound calls, served at GET /metrics
+metrics = Metrics()
+metrics.init_app(service_b)
+metrics.instrument_engine(engine)
+
+# GET /healthz (process up) and GET /readyz (schema created, database answering)
+health = Health()
+health.init_app(service_b, db)
+
+# Largest array accepted by POST /tasks/batch
+MAX_BATCH_SIZE = 10000
+
+# Keyset pagination for GET /tasks: default/maximum page size, and rows
+# fetched per round trip when streaming NDJSON
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+STREAM_BATCH_SIZE = 1000
+
+# IDs per IN (...) clause in bulk deletes (older SQLite builds cap bound parameters at 999)
+IN_CLAUSE_CHUNK = 999
+
+# GET /tasks/stream: changes read per query, idle time before a keep-alive
+# comment, how long one connection lasts (EventSource reconnects by itself
+# and resumes with Last-Event-ID) and the reconnection delay it is told to use
+STREAM_CHANGES_BATCH = 500
+STREAM_HEARTBEAT = 15.0
+STREAM_MAX_SECONDS = 300.0
+STREAM_RETRY_MS = 1000
 
 class Task(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(100), nullable=False)
-    user_id = db.Column(db.Integer, nullable=False)
+    user_id = db.Column(db.Integer, nullable=False, index=True)
+
+class TaskChange(db.Model):
+    """Append-only log of task creations and deletions, streamed by GET /tasks/stream"""
+    seq = db.Column(db.Integer, primary_key=True)
+    task_id = db.Column(db.Integer, nullable=False)
+    op = db.Column(db.String(10), nullable=False)
+    title = db.Column(db.String(100))
+    user_id = db.Column(db.Integer)
+
+# Changes are written by the same flush as the task rows, so they commit (or
+# roll back) together; one multi-row INSERT per flush keeps batches cheap
+@event.listens_for(db.session, 'after_flush')
+def log_task_changes(session, flush_context):
+    changes = [{'task_id': task.id, 'op': 'create', 'title': task.title, 'user_id': task.user_id}
+               for task in session.new if isinstance(task, Task)]
+    changes += [{'task_id': task.id, 'op': 'delete', 'title': None, 'user_id': task.user_id}
+                for task in session.deleted if isinstance(task, Task)]
+    if changes:
+        session.connection().execute(TaskChange.__table__.insert(), changes)
+
+def log_bulk_delete(*criteria):
+    """Log the tasks a set-based DELETE is about to remove (those skip the flush)"""
+    deleted = db.select(Task.id, db.literal('delete'), Task.user_id).where(*criteria)
+    db.session.execute(db.insert(TaskChange).from_select(['task_id', 'op', 'user_id'], deleted))
+
+# Version of the task table, bumped on every commit that writes it; list
+# responses carry it as their ETag and are cached per version
+table_versions = TableVersions(db, ['task'])
+list_cache = ListCache()
+
+def ensure_indexes():
+    """create_all() skips tables that already exist, so add any missing index explicitly"""
+    for index in Task.__table__.indexes:
+        index.create(db.engine, checkfirst=True)
+
+# Shared keep-alive client for Users_Service (pooled, with timeouts and a circuit breaker)
+observe_users_service = functools.partial(metrics.observe_outbound, 'users_service')
+users_client = UsersServiceClient(config.users_service_url(),
+                                  pool_size=int(os.environ.get('USERS_SERVICE_POOL_SIZE', '20')),
+                                  observe=observe_users_service)
+
+# Remembers user lookups so repeated task creations skip the remote call
+user_cache = UserVerificationCache(users_client.user_exists, users_client.users_exist)
+
+# Local copy of the valid user IDs, followed from the Users_Service change feed.
+# It has its own client: long polls must not share the pool, timeouts or
+# circuit breaker of the request path. Disabled with USER_REPLICA=0.
+USER_REPLICA_WAIT = 20.0
+user_replica = UserReplica(
+    UsersServiceClient(config.users_service_url(),
+                       pool_size=1, read_timeout=USER_REPLICA_WAIT + 5, max_retries=0,
+                       observe=observe_users_service),
+    wait=USER_REPLICA_WAIT,
+    on_change=user_cache.invalidate,
+    logger=service_b.logger
+)
+
+def verify_user(user_id):
+    """True if the user exists; raises ServiceUnavailable when nobody can tell
+
+    Users known to a fresh replica are accepted locally. Anything else is
+    checked remotely (a user created a moment ago may not be replicated yet),
+    and while Users_Service is down the replica answers for up to `grace` seconds.
+    """
+    if user_replica.lookup(user_id):
+        return True
+    try:
+        return user_cache.exists(user_id)
+    except ServiceUnavailable:
+        known = user_replica.lookup(user_id, max_age=user_replica.grace)
+        if known is None:
+            raise
+        return known
+
+def verify_users(user_ids):
+    """verify_user() for many IDs: {str(user_id): bool}, with one remote call for the rest"""
+    result = {}
+    unknown = []
+    for user_id in user_ids:
+        if user_replica.lookup(user_id):
+            result[str(user_id)] = True
+        else:
+            unknown.append(user_id)
+    if unknown:
+        try:
+            result.update(user_cache.exists_many(unknown))
+        except ServiceUnavailable:
+            for user_id in unknown:
+                known = user_replica.lookup(user_id, max_age=user_replica.grace)
+                if known is None:
+                    raise
+                result[str(user_id)] = known
+    return result
+
+def env_flag(name):
+    return os.environ.get(name, '').lower() in ('1', 'true', 'yes')
+
+# Opt-in group commit: concurrent POST /tasks share one transaction
+task_writer = None
+if env_flag('GROUP_COMMIT'):
+    task_writer = GroupCommitWriter(
+        service_b, db, Task,
+        max_batch=int(os.environ.get('GROUP_COMMIT_MAX_BATCH', '100')),
+        max_delay=float(os.environ.get('GROUP_COMMIT_MAX_DELAY_MS', '0')) / 1000
+    )
 
 @service_b.route('/tasks', methods=['POST'])
+@retry_when_locked(session=lambda: db.session)
 def create_task():
     data = request.get_json()
     if not data or not data.get('title') or not data.get('user_id'):
         return jsonify({'error': 'Datos inválidos'}), 400
     try:
-        user_check = requests.get(f'http://localhost:5001/users/{data["user_id"]}')
+        user_exists = verify_user(data['user_id'])
+    except ServiceUnavailable as e:
+        return jsonify({'error': str(e)}), 503
     except Exception as e:
         return jsonify({'error': f'Error de conexión al verificar usuario: {str(e)}'}), 500
 
-    if user_check.status_code != 200:
+    if not user_exists:
         return jsonify({'error': 'ID de usuario inválido'}), 400
 
+    if task_writer is not None:
+        try:
+            return jsonify(task_writer.insert(title=data['title'], user_id=int(data['user_id']))), 201
+        except TimeoutError as e:
+            return jsonify({'error': str(e)}), 503
+
     task = Task(title=data['title'], user_id=data['user_id'])
     db.session.add(task)
     db.session.commit()
     return jsonify({'id': task.id, 'title': task.title, 'user_id': task.user_id}), 201
 
+@service_b.route('/tasks/batch', methods=['POST'])
+@retry_when_locked(session=lambda: db.session)
+def create_tasks_batch():
+    """Create many tasks in one transaction, reporting errors per item"""
+    data = request.get_json(silent=True)
+    items = data.get('tasks') if isinstance(data, dict) else data
+    if not isinstance(items, list) or not items:
+        return jsonify({'error': 'Se requiere una lista de tareas'}), 400
+    if len(items) > MAX_BATCH_SIZE:
+        return jsonify({'error': f'Máximo {MAX_BATCH_SIZE} tareas por lote'}), 400
+
+    errors = []
+    candidates = []
+    for index, item in enumerate(items):
+        if not isinstance(item, dict) or not item.get('title') or not item.get('user_id'):
+            errors.append({'index': index, 'error': 'Datos inválidos'})
+            continue
+        user_id = item['user_id']
+        if isinstance(user_id, str) and user_id.strip().isdigit():
+            user_id = int(user_id)
+        # JSON true and 3.7 are not user IDs, even though int() would take them
+        if isinstance(user_id, bool) or not isinstance(user_id, int):
+            errors.append({'index': index, 'error': 'ID de usuario inválido'})
+            continue
+        candidates.append((index, item['title'], user_id))
+
+    # Users the replica does not vouch for are verified in a single round trip to Users_Service
+    try:
+        user_exists = verify_users({user_id for _, _, user_id in candidates})
+    except ServiceUnavailable as e:
+        return jsonify({'error': str(e)}), 503
+    except InvalidUserIds as e:
+        return jsonify({'error': f'Users_Service rechazó los IDs de usuario: {e}', 'user_ids': e.user_ids}), 400
+    except Exception as e:
+        return jsonify({'error': f'Error de conexión al verificar usuarios: {str(e)}'}), 500
+
+    pending = []
+    for index, title, user_id in candidates:
+        if user_exists.get(str(user_id)):
+            pending.append((index, Task(title=title, user_id=user_id)))
+        else:
+            errors.append({'index': index, 'error': 'ID de usuario inválido'})
+
+    if pending:
+        try:
+            db.session.add_all([task for _, task in pending])
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            if isinstance(e, OperationalError) and is_locked_error(e):
+                raise  # retry_when_locked re-runs the whole batch
+            return jsonify({'error': str(e)}), 500
+
+    created = [{'index': index, 'id': t.id, 'title': t.title, 'user_id': t.user_id} for index, t in pending]
+    errors.sort(key=lambda error: error['index'])
+    # The request itself was fine even when no item was: each one reports its error
+    return jsonify({'created': created, 'errors': errors}), 201 if created else 200
+
 @service_b.route('/tasks', methods=['GET'])
 def get_tasks():
-    tasks = Task.query.all()
-    return jsonify([{'id': t.id, 'title': t.title, 'user_id': t.user_id} for t in tasks])
+    try:
+        user_id = int_arg(request.args.get('user_id'))
+    except ValueError:
+        return jsonify({'error': 'user_id debe ser un entero no negativo'}), 400
+    return list_tasks(user_id, request.args.get('title_contains') or None)
+
+@service_b.route('/users/<int:user_id>/tasks', methods=['GET'])
+def get_user_tasks(user_id):
+    return list_tasks(user_id)
+
+def list_tasks(user_id=None, title_contains=None):
+    """List tasks, optionally only those of one user (served by the user_id index)
+    and/or whose title contains a substring"""
+    try:
+        after = int_arg(request.args.get('after'))
+        limit = int_arg(request.args.get('limit'))
+    except ValueError:
+        return jsonify({'error': 'limit y after deben ser enteros no negativos'}), 400
+    if limit == 0:
+        # Parsed once for both formats: NDJSON would stream nothing and JSON fall back to a default page
+        return jsonify({'error': 'limit debe ser al menos 1'}), 400
+
+    if request.accept_mimetypes.best == 'application/x-ndjson':
+        return stream_tasks_ndjson(after, limit, user_id, title_contains)
+
+    # Only runs when this version of the table hasn't been served for this
+    # query string and format. Column tuples skip building Task objects.
+    def build_data():
+        if after is None and limit is None:
+            rows = db.session.execute(task_rows_query(user_id=user_id, title_contains=title_contains)).all()
+            return [{'id': task_id, 'title': title, 'user_id': owner} for task_id, title, owner in rows]
+
+        page_size = min(limit or DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE)
+        rows = db.session.execute(task_rows_query(after, user_id, title_contains).limit(page_size)).all()
+        items = [{'id': task_id, 'title': title, 'user_id': owner} for task_id, title, owner in rows]
+        next_after = items[-1]['id'] if len(items) == page_size else None
+        return {'items': items, 'next_after': next_after}
+
+    return conditional_list(table_versions, list_cache, 'task', build_data)
+
+@service_b.route('/tasks/page-index', methods=['GET'])
+def task_page_index():
+    """First id of every page of GET /tasks, so a client can jump to any page
+
+    Same filters as GET /tasks (user_id, title_contains) and page size
+    (?limit=). Page k is then GET /tasks?after=<anchors[k] - 1>&limit=<page_size>.
+    Responds {"page_size", "total", "anchors"}, with ETag revalidation.
+    """
+    try:
+        user_id = int_arg(request.args.get('user_id'))
+        page_size = min(int_arg(request.args.get('limit')) or DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE)
+    except ValueError:
+        return jsonify({'error': 'user_id y limit deben ser enteros no negativos'}), 400
+    filters = task_filters(user_id, request.args.get('title_contains') or None)
+
+    def build_data():
+        # One recursive query hops from each page's first id to the next one
+        # (OFFSET page_size on the primary key), without leaving SQLite
+        hops = db.select(db.func.min(Task.id).label('id')).where(*filters).cte('anchors', recursive=True)
+        next_anchor = db.select(Task.id).where(*filters, Task.id >= hops.c.id).order_by(Task.id) \
+            .limit(1).offset(page_size).scalar_subquery()
+        hops = hops.union_all(db.select(next_anchor).where(hops.c.id.is_not(None)))
+        anchors = db.session.execute(db.select(hops.c.id).where(hops.c.id.is_not(None))).scalars().all()
+        total = 0
+        if anchors:
+            last_page = db.session.execute(
+                db.select(db.func.count()).select_from(Task).where(*filters, Task.id >= anchors[-1])
+            ).scalar()
+            total = (len(anchors) - 1) * page_size + last_page
+        return {'page_size': page_size, 'total': total, 'anchors': anchors}
+
+    return conditional_list(table_versions, list_cache, 'task', build_data)
+
+def int_arg(value):
+    """Parse an optional non-negative integer query-string value"""
+    if value is None or value == '':
+        return None
+    number = int(value)
+    if number < 0:
+        raise ValueError(value)
+    return number
+
+def task_filters(user_id=None, title_contains=None):
+    filters = []
+    if user_id is not None:
+        filters.append(Task.user_id == user_id)
+    if title_contains:
+        filters.append(Task.title.contains(title_contains, autoescape=True))
+    return filters
+
+def task_rows_query(after=None, user_id=None, title_contains=None):
+    """SELECT id, title, user_id ordered by id, starting after the given id (keyset)"""
+    query = db.select(Task.id, Task.title, Task.user_id).order_by(Task.id)
+    query = query.where(*task_filters(user_id, title_contains))
+    if after is not None:
+        query = query.where(Task.id > after)
+    return query
+
+def stream_tasks_ndjson(after=None, limit=None, user_id=None, title_contains=None):
+    """Stream one JSON object per line from a server-side cursor"""
+    query = task_rows_query(after, user_id, title_contains)
+    if limit is not None:
+        query = query.limit(limit)
+
+    def generate():
+        result = db.session.execute(query.execution_options(yield_per=STREAM_BATCH_SIZE))
+        for task_id, title, owner in result:
+            yield dumps_json({'id': task_id, 'title': title, 'user_id': owner}) + b'\n'
+
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+@service_b.route('/tasks/stream', methods=['GET'])
+def stream_task_changes():
+    """Server-Sent Events: a `create` or `delete` event per task change, oldest first
+
+    The event id is the change's seq. A reconnecting EventSource sends the
+    last one it saw as Last-Event-ID (or pass ?last_event_id=) and the stream
+    resumes right after it; without one only changes from now on are sent.
+    The first event, `ready`, carries the seq the stream starts from. A
+    `reset` event means the log restarted (the database was recreated) and
+    the client must reload the list.
+    """
+    try:
+        last_event_id = int_arg(request.headers.get('Last-Event-ID') or request.args.get('last_event_id'))
+    except ValueError:
+        return jsonify({'error': 'Last-Event-ID debe ser un entero no negativo'}), 400
+    head = task_changes_head()
+    # Released here; the generator only opens short read transactions
+    db.session.close()
+
+    def generate():
+        since = head if last_event_id is None else last_event_id
+        yield f'retry: {STREAM_RETRY_MS}\n\n'
+        if since > head:
+            since = head
+            yield f'id: {since}\nevent: reset\ndata: {{}}\n\n'
+        yield f'id: {since}\nevent: ready\ndata: {{"seq": {since}}}\n\n'
+
+        deadline = time.monotonic() + STREAM_MAX_SECONDS
+        while True:
+            # Read before querying, so a commit in between is never missed
+            version = table_versions.current('task')[0]
+            rows = db.session.execute(
+                db.select(TaskChange.seq, TaskChange.task_id, TaskChange.op, TaskChange.title, TaskChange.user_id)
+                .where(TaskChange.seq > since).order_by(TaskChange.seq).limit(STREAM_CHANGES_BATCH)
+            ).all()
+            db.session.close()
+            for seq, task_id, op, title, user_id in rows:
+                data = {'id': task_id, 'user_id': user_id}
+                if op == 'create':
+                    data['title'] = title
+                yield f'id: {seq}\nevent: {op}\ndata: {dumps_json(data).decode()}\n\n'
+                since = seq
+            if len(rows) == STREAM_CHANGES_BATCH:
+                continue
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            if table_versions.wait_for_change('task', version, min(STREAM_HEARTBEAT, remaining)) == version:
+                # Keeps proxies from closing an idle connection and notices clients that left
+                yield ': keep-alive\n\n'
+
+    response = Response(stream_with_context(generate()), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+def task_changes_head():
+    """Latest seq in the task change log (0 when empty)"""
+    return db.session.execute(db.select(db.func.max(TaskChange.seq))).scalar() or 0
+
+@service_b.route('/tasks/user-cache', methods=['GET'])
+def user_cache_stats():
+    """Hit/miss counters of the user verification cache, plus the state of the replica"""
+    return jsonify({**user_cache.stats(), 'replica': user_replica.stats()})
+
+@service_b.route('/tasks/user-cache', methods=['DELETE'])
+def forget_deleted_users():
+    """Drop deleted users from the cache and the replica: {"user_ids": [...]}, or everyone without it
+
+    Users_Service calls this before it answers a delete, so the next task for
+    a deleted user is rejected instead of accepted until its cached answer expires.
+    """
+    data = request.get_json(silent=True)
+    user_ids = data.get('user_ids') if isinstance(data, dict) else None
+    if user_ids is not None and not isinstance(user_ids, list):
+        return jsonify({'error': 'user_ids must be a list'}), 400
+    for user_id in [None] if user_ids is None else user_ids:
+        user_cache.invalidate(user_id)
+        user_replica.forget(user_id)
+    return jsonify({'forgotten': 'all' if user_ids is None else len(user_ids)})
 
 @service_b.route('/tasks/<int:task_id>', methods=['DELETE'])
+@retry_when_locked(session=lambda: db.session)
 def delete_task(task_id):
     task = Task.query.get(task_id)
     if task:
@@ -59,9 +461,10 @@ def delete_task(task_id):
 def cleanup_tasks():
     """Delete all tasks - for testing purposes only"""
     try:
+        log_bulk_delete()
         num_deleted = Task.query.delete()
         db.session.commit()
-        return jsonify({'message': f'Deleted {num_deleted} tasks'}), 200
+        return jsonify({'message': f'Deleted {num_deleted} tasks', 'deleted': num_deleted}), 200
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
@@ -78,20 +481,88 @@ def cleanup_specific_tasks():
         if not isinstance(task_ids, list):
             return jsonify({'error': 'task_ids must be a list'}), 400
         
-        deleted_count = 0
-        for task_id in task_ids:
-            task = Task.query.get(task_id)
-            if task:
-                db.session.delete(task)
-                deleted_count += 1
-        
+        deleted_count = delete_tasks_in(Task.id, task_ids)
+        db.session.commit()
+        return jsonify({'message': f'Deleted {deleted_count} specific tasks', 'deleted': deleted_count}), 200
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+@service_b.route('/users/<int:user_id>/tasks', methods=['DELETE'])
+def delete_user_tasks(user_id):
+    """Delete every task of a user in one statement (used by the Users_Service cascade)"""
+    try:
+        log_bulk_delete(Task.user_id == user_id)
+        deleted_count = Task.query.filter(Task.user_id == user_id).delete(synchronize_session=False)
         db.session.commit()
-        return jsonify({'message': f'Deleted {deleted_count} specific tasks'}), 200
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
+    user_cache.invalidate(user_id)
+    return jsonify({'message': f'Deleted {deleted_count} tasks of user {user_id}', 'deleted': deleted_count}), 200
+
+@service_b.route('/tasks/bulk', methods=['DELETE'])
+def bulk_delete_tasks():
+    """Delete tasks matching a filter: {"ids": [...], "user_ids": [...], "title": "...", "title_contains": "..."}
+
+    Criteria are combined with AND; at least one is required so an empty
+    body can't wipe the table (use /tasks/cleanup for that).
+    """
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({'error': 'Se requiere un filtro en JSON'}), 400
+
+    criteria = []
+    for field, column in (('ids', Task.id), ('user_ids', Task.user_id)):
+        if field in data:
+            values = data[field]
+            if not isinstance(values, list) or not all(isinstance(v, int) for v in values):
+                return jsonify({'error': f'{field} debe ser una lista de enteros'}), 400
+            criteria.append((column, values))
+    filters = []
+    if data.get('title'):
+        filters.append(Task.title == data['title'])
+    if data.get('title_contains'):
+        filters.append(Task.title.contains(data['title_contains'], autoescape=True))
+    if not criteria and not filters:
+        return jsonify({'error': 'Se requiere al menos un criterio (ids, user_ids, title, title_contains)'}), 400
+
+    try:
+        if criteria:
+            # The longest list is chunked; the rest are applied as plain filters
+            criteria.sort(key=lambda criterion: len(criterion[1]))
+            column, values = criteria.pop()
+            filters.extend(c.in_(v) for c, v in criteria)
+            deleted_count = delete_tasks_in(column, values, *filters)
+        else:
+            log_bulk_delete(*filters)
+            deleted_count = Task.query.filter(*filters).delete(synchronize_session=False)
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+    for user_id in data.get('user_ids', []):
+        user_cache.invalidate(user_id)
+    return jsonify({'message': f'Deleted {deleted_count} tasks', 'deleted': deleted_count}), 200
+
+def delete_tasks_in(column, values, *filters):
+    """Set-based DELETE ... WHERE column IN (...), one statement per chunk of values"""
+    deleted_count = 0
+    values = list(dict.fromkeys(values))
+    for start in range(0, len(values), IN_CLAUSE_CHUNK):
+        chunk = values[start:start + IN_CLAUSE_CHUNK]
+        log_bulk_delete(column.in_(chunk), *filters)
+        deleted_count += Task.query.filter(column.in_(chunk), *filters).delete(synchronize_session=False)
+    return deleted_count
 
 if __name__ == '__main__':
     with service_b.app_context():
         db.create_all()
-    service_b.run(port=5002)
+        ensure_indexes()
+    health.mark_ready()
+    start_wal_checkpointer(service_b, db)
+    if os.environ.get('USER_REPLICA', '1') != '0':
+        user_replica.start()
+    host, port = config.bind('tasks')
+    service_b.run(host=host, port=port)
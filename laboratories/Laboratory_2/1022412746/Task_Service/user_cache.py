@@ -0,0 +1,212 @@
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+
+from users_client import ServiceUnavailable
+
+
+class _Flight:
+    """A lookup in progress that concurrent callers can wait on"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class UserVerificationCache:
+    """Caches whether a user exists in Users_Service
+
+    Positive and negative answers are kept with separate TTLs in a bounded
+    LRU. Concurrent lookups for the same user share a single remote call.
+    A lookup that was in flight when invalidate() ran answers its callers
+    but is not cached, so a deleted user can't be cached again as valid.
+    """
+
+    def __init__(self, fetch, fetch_many=None, max_size=10000, positive_ttl=30.0, negative_ttl=5.0,
+                 clock=time.monotonic):
+        # fetch(user_id) -> True / False when the answer can be cached,
+        # None when it can't (e.g. Users_Service answered with a 5xx)
+        # fetch_many(user_ids) -> {str(user_id): bool} in one round trip
+        self._fetch = fetch
+        self._fetch_many = fetch_many
+        self.max_size = max_size
+        self.positive_ttl = positive_ttl
+        self.negative_ttl = negative_ttl
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._flights = {}
+        self._lock = threading.Lock()
+        self._generation = 0  # bumped by invalidate()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+
+    def exists(self, user_id):
+        """Return True if the user exists, False otherwise"""
+        key = str(user_id)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                exists, expires_at = entry
+                if expires_at > self._clock():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return exists
+                del self._entries[key]
+
+            flight = self._flights.get(key)
+            if flight is not None:
+                self.coalesced += 1
+                leader = False
+            else:
+                self.misses += 1
+                flight = _Flight()
+                self._flights[key] = flight
+                leader = True
+            generation = self._generation
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return bool(flight.result)
+
+        try:
+            flight.result = self._fetch(user_id)
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                if flight.error is None and flight.result is not None and generation == self._generation:
+                    self._store(key, flight.result)
+                del self._flights[key]
+            flight.done.set()
+        return bool(flight.result)
+
+    def exists_many(self, user_ids):
+        """Return {str(user_id): bool}, fetching every cache miss in one round trip"""
+        result = {}
+        missing = []
+        with self._lock:
+            generation = self._generation
+            now = self._clock()
+            for user_id in user_ids:
+                key = str(user_id)
+                if key in result:
+                    continue
+                entry = self._entries.get(key)
+                if entry is not None and entry[1] > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    result[key] = entry[0]
+                else:
+                    self.misses += 1
+                    result[key] = None
+                    missing.append(key)
+
+        if missing:
+            if self._fetch_many is None:
+                # One call per miss; answers fetch() can't vouch for (None) are not cached
+                fetched = {}
+                for key in missing:
+                    exists = self._fetch(key)
+                    if exists is not None:
+                        fetched[key] = exists
+            else:
+                fetched = self._fetch_many(missing)
+            with self._lock:
+                for key in missing:
+                    exists = bool(fetched.get(key, False))
+                    result[key] = exists
+                    if key in fetched and generation == self._generation:
+                        self._store(key, exists)
+        return result
+
+    def invalidate(self, user_id=None):
+        """Drop one user from the cache, or everything when no ID is given"""
+        with self._lock:
+            self._generation += 1
+            if user_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(str(user_id), None)
+
+    def stats(self):
+        """Counters used to see how much load the cache removes"""
+        with self._lock:
+            lookups = self.hits + self.misses + self.coalesced
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'coalesced': self.coalesced,
+                'evictions': self.evictions,
+                'hit_ratio': round((self.hits + self.coalesced) / lookups, 4) if lookups else 0.0
+            }
+
+    def _store(self, key, exists):
+        ttl = self.positive_ttl if exists else self.negative_ttl
+        if ttl <= 0:
+            return
+        self._entries[key] = (exists, self._clock() + ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+
+class AsyncUserVerificationCache(UserVerificationCache):
+    """UserVerificationCache for the asyncio Task_Service
+
+    Same LRU, TTLs and counters; fetch is a coroutine function and exists()
+    is awaited. Concurrent lookups for the same user await a single future.
+    Only touch it from one event loop.
+    """
+
+    async def exists(self, user_id):
+        """Return True if the user exists, False otherwise"""
+        key = str(user_id)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                exists, expires_at = entry
+                if expires_at > self._clock():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return exists
+                del self._entries[key]
+
+            flight = self._flights.get(key)
+            if flight is not None:
+                self.coalesced += 1
+            else:
+                self.misses += 1
+                self._flights[key] = asyncio.get_running_loop().create_future()
+            generation = self._generation
+
+        if flight is not None:
+            # shield: a waiter that gets cancelled must not cancel the shared lookup
+            return bool(await asyncio.shield(flight))
+
+        flight = self._flights[key]
+        try:
+            result = await self._fetch(user_id)
+        except BaseException as e:
+            # A cancelled leader still has to release its waiters
+            flight.set_exception(e if isinstance(e, Exception) else ServiceUnavailable('Verificación cancelada'))
+            flight.exception()  # mark as retrieved when nobody was waiting
+            raise
+        else:
+            flight.set_result(result)
+        finally:
+            with self._lock:
+                if (flight.done() and not flight.exception() and flight.result() is not None
+                        and generation == self._generation):
+                    self._store(key, flight.result())
+                del self._flights[key]
+        return bool(result)
@@ -0,0 +1,140 @@
+import logging
+import threading
+import time
+
+from users_client import ServiceUnavailable
+
+
+class UserReplica:
+    """In-memory set of valid user IDs, kept current from the Users_Service change feed
+
+    A background thread loads /users/changes/snapshot once and then long-polls
+    /users/changes, applying creates and deletes in order. lookup() answers
+    locally while the replica is fresh (the last poll came back within
+    `wait` + `max_lag` seconds) and returns None when it isn't, so callers
+    fall back to the remote check.
+    """
+
+    def __init__(self, client, wait=20.0, max_lag=5.0, grace=60.0, on_change=None, clock=time.monotonic,
+                 logger=None):
+        # client: a UsersServiceClient whose read timeout is longer than `wait`
+        # on_change(user_id) is called for every applied change (e.g. to drop cached answers)
+        # logger: where failed syncs are reported (the service's app.logger)
+        self._client = client
+        self._logger = logger or logging.getLogger(__name__)
+        self.wait = wait
+        self.max_lag = max_lag
+        self.grace = grace
+        self._on_change = on_change
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._ids = set()
+        self._seq = None
+        self._synced_at = None
+        self._stop = threading.Event()
+        self._thread = None
+        self.snapshots = 0
+        self.changes_applied = 0
+        self.errors = 0
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name='user-replica', daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def stop(self):
+        self._stop.set()
+
+    def lookup(self, user_id, max_age=None):
+        """True/False from the replica, None when it is older than `max_age` seconds"""
+        if max_age is None:
+            max_age = self.wait + self.max_lag
+        try:
+            user_id = int(user_id)
+        except (TypeError, ValueError):
+            return None
+        with self._lock:
+            if self._synced_at is None or self._clock() - self._synced_at > max_age:
+                return None
+            return user_id in self._ids
+
+    def forget(self, user_id=None):
+        """Stop vouching for a user deleted ahead of the feed (everyone when no ID is given)
+
+        Only ever sends lookups to the remote check, so it is safe even if the
+        feed already applied the change.
+        """
+        with self._lock:
+            if user_id is None:
+                self._ids.clear()
+            else:
+                try:
+                    self._ids.discard(int(user_id))
+                except (TypeError, ValueError):
+                    pass
+
+    def stats(self):
+        with self._lock:
+            age = None if self._synced_at is None else round(self._clock() - self._synced_at, 3)
+            return {
+                'users': len(self._ids),
+                'seq': self._seq,
+                'age': age,
+                'snapshots': self.snapshots,
+                'changes_applied': self.changes_applied,
+                'errors': self.errors
+            }
+
+    def sync_once(self, wait=0):
+        """Load the snapshot if needed, otherwise apply one poll of the feed"""
+        if self._seq is None:
+            self._load_snapshot()
+            return
+
+        response = self._client.get('/users/changes', operation='changes', params={'since': self._seq, 'wait': wait})
+        if response.status_code != 200:
+            raise ServiceUnavailable(f'Feed de cambios respondió {response.status_code}')
+        body = response.json()
+        if body['head'] < self._seq:
+            # Users_Service lost its log (e.g. the database was recreated)
+            self._load_snapshot()
+            return
+
+        with self._lock:
+            for change in body['changes']:
+                if change['op'] == 'create':
+                    self._ids.add(change['user_id'])
+                else:
+                    self._ids.discard(change['user_id'])
+            self._seq = body['next']
+            self._synced_at = self._clock()
+            self.changes_applied += len(body['changes'])
+        if self._on_change is not None:
+            for change in body['changes']:
+                self._on_change(change['user_id'])
+
+    def _load_snapshot(self):
+        response = self._client.get('/users/changes/snapshot', operation='snapshot')
+        if response.status_code != 200:
+            raise ServiceUnavailable(f'Snapshot de usuarios respondió {response.status_code}')
+        body = response.json()
+        with self._lock:
+            self._ids = set(body['user_ids'])
+            self._seq = body['seq']
+            self._synced_at = self._clock()
+            self.snapshots += 1
+        if self._on_change is not None:
+            self._on_change(None)
+
+    def _run(self):
+        delay = 0.5
+        while not self._stop.is_set():
+            try:
+                self.sync_once(wait=self.wait)
+                delay = 0.5
+            except Exception as e:
+                # Keep the last known set; lookup() stops trusting it once it gets old
+                self.errors += 1
+                self._logger.warning('User replica sync failed: %s', e)
+                self._stop.wait(delay)
+                delay = min(delay * 2, 10.0)
@@ -0,0 +1,166 @@
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class ServiceUnavailable(Exception):
+    """Raised when Users_Service can't be reached or the circuit is open"""
+
+
+class InvalidUserIds(ValueError):
+    """Users_Service rejected a lookup (400); user_ids are the IDs it was asked about"""
+
+    def __init__(self, message, user_ids):
+        super().__init__(message)
+        self.user_ids = user_ids
+
+
+class CircuitBreaker:
+    """Stops calling a dependency after repeated failures
+
+    closed -> open after `failure_threshold` consecutive failures.
+    open -> half-open once `reset_timeout` seconds have passed; a single
+    trial call is let through and closes the circuit again if it succeeds.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half-open'
+
+    def __init__(self, failure_threshold=5, reset_timeout=10.0, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+
+    @property
+    def state(self):
+        with self._lock:
+            if self._state == self.OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+                return self.HALF_OPEN
+            return self._state
+
+    def allow_request(self):
+        """Return True if a call may be attempted right now"""
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.OPEN:
+                if self._clock() - self._opened_at < self.reset_timeout:
+                    return False
+                self._state = self.HALF_OPEN
+                self._trial_in_flight = False
+            if self._trial_in_flight:
+                return False
+            self._trial_in_flight = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self._state = self.OPEN
+                self._opened_at = self._clock()
+            self._trial_in_flight = False
+
+
+class UsersServiceClient:
+    """Keep-alive HTTP client for Task_Service -> Users_Service calls"""
+
+    def __init__(self, base_url, pool_size=20, connect_timeout=0.5, read_timeout=2.0,
+                 max_retries=2, backoff=0.05, breaker=None, observe=None):
+        # observe(operation, seconds, status) is called after every HTTP attempt,
+        # with the status code or 'error' (e.g. Metrics.observe_outbound)
+        self.base_url = base_url.rstrip('/')
+        self.observe = observe
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.breaker = breaker or CircuitBreaker()
+        self.session = requests.Session()
+        # pool_block keeps the number of open sockets to Users_Service bounded
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, pool_block=True, max_retries=0)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def get(self, path, operation='get', **kwargs):
+        """GET with timeouts, bounded retries and the circuit breaker
+
+        Returns the response for any status below 500; raises
+        ServiceUnavailable when Users_Service is unhealthy.
+        """
+        if not self.breaker.allow_request():
+            raise ServiceUnavailable('Users_Service no disponible (circuito abierto)')
+
+        # Whatever happens (even an unexpected exception) the breaker learns
+        # the outcome, or a half-open trial would block every later call
+        succeeded = False
+        try:
+            last_error = None
+            for attempt in range(self.max_retries + 1):
+                if attempt:
+                    time.sleep(self.backoff * (2 ** (attempt - 1)))
+                start = time.perf_counter()
+                try:
+                    response = self.session.get(f'{self.base_url}{path}', timeout=self.timeout, **kwargs)
+                except requests.RequestException as e:
+                    self._observe(operation, start, 'error')
+                    last_error = e
+                    continue
+                self._observe(operation, start, response.status_code)
+                if response.status_code < 500:
+                    succeeded = True
+                    return response
+                last_error = requests.HTTPError(f'{response.status_code} de Users_Service')
+            raise ServiceUnavailable(f'Users_Service no disponible: {last_error}')
+        finally:
+            if succeeded:
+                self.breaker.record_success()
+            else:
+                self.breaker.record_failure()
+
+    def user_exists(self, user_id):
+        """True/False for 200/404, None for any other answer"""
+        response = self.get(f'/users/{user_id}', operation='user_exists')
+        if response.status_code == 200:
+            return True
+        if response.status_code == 404:
+            return False
+        return None
+
+    def users_exist(self, user_ids, chunk_size=1000):
+        """Resolve many users with GET /users?ids=... and return {user_id: bool}"""
+        ids = [str(user_id) for user_id in user_ids]
+        result = {}
+        for start in range(0, len(ids), chunk_size):
+            chunk = ids[start:start + chunk_size]
+            response = self.get('/users', operation='users_exist', params={'ids': ','.join(chunk)})
+            if response.status_code == 400:
+                raise InvalidUserIds(response.json().get('error', 'IDs de usuario inválidos'), chunk)
+            if response.status_code != 200:
+                raise ServiceUnavailable(f'Consulta masiva de usuarios falló: {response.status_code}')
+            body = response.json()
+            for user in body['found']:
+                result[str(user['id'])] = True
+            for user_id in body['missing']:
+                result[str(user_id)] = False
+        return result
+
+    def _observe(self, operation, start, status):
+        if self.observe is not None:
+            self.observe(operation, time.perf_counter() - start, status)
+
+    def close(self):
+        self.session.close()
@@ -1,12 +1,12 @@
 import requests
-from test_utils import TestDataTracker, PDFReportGenerator
+from test_utils import TestDataTracker, PDFReportGenerator, USERS_SERVICE_URL, TASKS_SERVICE_URL
 import traceback
 import sys
 import os
 
 # Endpoints
-USERS_URL = "http://localhost:5001/users"
-TASKS_URL = "http://localhost:5002/tasks"
+USERS_URL = f"{USERS_SERVICE_URL}/users"
+TASKS_URL = f"{TASKS_SERVICE_URL}/tasks"
 
 # Initialize test utilities
 tracker = TestDataTracker()
@@ -58,10 +58,21 @@ def get_tasks():
         tracker.add_test_result("get_tasks", "FAILED", f"Error retrieving tasks: {str(e)}")
         raise
 
+def get_user_tasks(user_id):
+    try:
+        response = requests.get(TASKS_URL, params={"user_id": user_id})
+        response.raise_for_status()
+        tasks = response.json()
+        tracker.add_test_result("get_user_tasks", "PASSED", f"Retrieved {len(tasks)} tasks for user {user_id}")
+        return tasks
+    except Exception as e:
+        tracker.add_test_result("get_user_tasks", "FAILED", f"Error retrieving tasks for user {user_id}: {str(e)}")
+        raise
+
 def verify_task_user_association(user_id, task_id):
     try:
-        tasks = get_tasks()
-        user_tasks = [t for t in tasks if t["user_id"] == user_id]
+        # Filtered server-side through the user_id index instead of listing every task
+        user_tasks = get_user_tasks(user_id)
         
         if any(t["id"] == task_id for t in user_tasks):
             tracker.add_test_result("verify_task_user_association", "PASSED", 
@@ -143,7 +154,7 @@ def cleanup_and_verify():
         return {'users_deleted': 0, 'tasks_deleted': 0, 'errors': [str(e)]}, {'cleanup_verified': False}
 
 def generate_report(cleanup_results, verification_results):
-    print("\n[REPORT] Generating PDF report...")
+    print("\n[REPORT] Rendering PDF report in the background...")
     
     try:
         report_path = report_generator.generate_report(
@@ -152,7 +163,7 @@ def generate_report(cleanup_results, verification_results):
             verification_results=verification_results,
             test_type="Backend Integration Test"
         )
-        print(f"[SUCCESS] Report generated successfully: {report_path}")
+        print(f"[SUCCESS] Report queued: {report_path} (results in {tracker.test_results.path})")
         return report_path
     except Exception as e:
         print(f"[FAILED] Report generation failed: {str(e)}")
@@ -174,4 +185,12 @@ if __name__ == "__main__":
         
     except Exception as e:
         print(f"[FAILED] Test execution failed: {str(e)}")
-        traceback.print_exc()
\ No newline at end of file
+        traceback.print_exc()
+        sys.exit(1)
+
+    # Wait for the PDF here rather than at exit, so a report that wasn't written counts
+    reports_written = report_generator.wait()
+    if not reports_written:
+        print("[ERROR] The PDF report could not be rendered")
+    # Non-zero exit status when a step failed, so run_tests.py and run_stacks.py can tell
+    sys.exit(1 if tracker.test_results.failed or not reports_written else 0)
\ No newline at end of file
@@ -1,118 +1,75 @@
 import sys
-import os
-import time
-import requests
+import argparse
 import traceback
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from test_utils import TestDataTracker, PDFReportGenerator
+from pages import LabPage, StepTimer, chrome
+from test_utils import TestDataTracker, PDFReportGenerator, config
 
 # Initialize test utilities
 tracker = TestDataTracker()
 report_generator = PDFReportGenerator()
+timer = StepTimer()
 
-def abrir_frontend(driver):
-    """Opens the frontend application in the browser"""
+def abrir_frontend(page):
+    """Opens the frontend application and waits until the task list and live feed are ready"""
     try:
-        driver.get("http://localhost:5000")
-        time.sleep(2)  # Give the page time to load
-        tracker.add_test_result("abrir_frontend", "PASSED", "Frontend opened successfully")
+        page.open()
+        tracker.add_test_result("abrir_frontend", "PASSED", f"Frontend ready in {timer.last():.2f}s")
         return True
     except Exception as e:
         tracker.add_test_result("abrir_frontend", "FAILED", f"Error opening frontend: {str(e)}")
         return False
 
-def crear_usuario(driver, wait):
-    """Fills out the user creation form and submits it"""
+def crear_usuario(page):
+    """Fills out the user creation form, submits it and waits for the answer"""
     try:
-        username_input = driver.find_element(By.ID, "username")
-        username_input.send_keys("Ana")
-        time.sleep(1)
-        driver.find_element(By.XPATH, "//button[contains(text(), 'Crear Usuario')]").click()
-        time.sleep(2)
-
-        user_result = driver.find_element(By.ID, "user-result").text
+        user_id = page.create_user("Ana")
         # Filter out Unicode characters for console output
-        user_result_clean = ''.join(char for char in user_result if ord(char) < 128)
+        user_result_clean = ''.join(char for char in page.result_text("user-result") if ord(char) < 128)
         print("Resultado usuario:", user_result_clean)
-        
-        if "Usuario creado con ID" in user_result:
-            user_id = ''.join(filter(str.isdigit, user_result))  # Extract numeric ID from result
-            
-            # Track the created user for cleanup
-            tracker.track_user(int(user_id))
-            tracker.add_test_result("crear_usuario", "PASSED", f"User 'Ana' created with ID {user_id}")
-            return user_id
-        else:
-            tracker.add_test_result("crear_usuario", "FAILED", f"User creation failed: {user_result}")
-            return None
-            
+
+        # Track the created user for cleanup
+        tracker.track_user(user_id)
+        tracker.add_test_result("crear_usuario", "PASSED", f"User 'Ana' created with ID {user_id} in {timer.last():.2f}s")
+        return user_id
+
     except Exception as e:
         tracker.add_test_result("crear_usuario", "FAILED", f"Error creating user: {str(e)}")
         raise
 
-def crear_tarea(driver, wait, user_id):
-    """Fills out the task creation form with a task and user ID, then submits it"""
+def crear_tarea(page, user_id):
+    """Fills out the task creation form with a task and user ID, submits it and waits for the answer"""
     try:
-        task_input = driver.find_element(By.ID, "task")
-        task_input.send_keys("Terminar laboratorio")
-        time.sleep(1)
-
-        userid_input = driver.find_element(By.ID, "userid")
-        userid_input.send_keys(user_id)
-        userid_input.send_keys('\t')  # Force focus out of the input to trigger validation
-        time.sleep(1)
-
-        crear_tarea_btn = wait.until(
-            EC.element_to_be_clickable((By.XPATH, "//button[text()='Crear Tarea']"))
-        )
-        crear_tarea_btn.click()
-        time.sleep(2)
-
-        wait.until(
-            EC.text_to_be_present_in_element((By.ID, "task-result"), "Tarea creada con ID")
-        )
-        task_result = driver.find_element(By.ID, "task-result")
+        task_id = page.create_task("Terminar laboratorio", user_id)
         # Filter out Unicode characters for console output
-        task_result_clean = ''.join(char for char in task_result.text if ord(char) < 128)
+        task_result_clean = ''.join(char for char in page.result_text("task-result") if ord(char) < 128)
         print("Texto en task_result:", task_result_clean)
-        
-        if "Tarea creada con ID" in task_result.text:
-            task_id = ''.join(filter(str.isdigit, task_result.text))
-            
-            # Track the created task for cleanup
-            tracker.track_task(int(task_id))
-            tracker.add_test_result("crear_tarea", "PASSED", f"Task 'Terminar laboratorio' created with ID {task_id}")
-            return task_id
-        else:
-            tracker.add_test_result("crear_tarea", "FAILED", f"Task creation failed: {task_result.text}")
-            return None
-            
+
+        # Track the created task for cleanup
+        tracker.track_task(task_id)
+        tracker.add_test_result("crear_tarea", "PASSED", f"Task 'Terminar laboratorio' created with ID {task_id} in {timer.last():.2f}s")
+        return task_id
+
     except Exception as e:
         tracker.add_test_result("crear_tarea", "FAILED", f"Error creating task: {str(e)}")
         raise
 
-def ver_tareas(driver):
-    """Clicks the button to refresh the task list and verifies the new task appears"""
+def ver_tareas(page, user_id, task_id):
+    """Filters the task list by the user and verifies the new task appears in it"""
     try:
-        driver.find_element(By.XPATH, "//button[contains(text(), 'Actualizar lista de tareas')]").click()
-        time.sleep(2)
-
-        tasks = driver.find_element(By.ID, "tasks").text
+        # Other tasks may fill the view: show only this user's
+        page.filter_tasks(user_id=user_id)
+        tasks = page.task_row(task_id).text
         # Filter out Unicode characters for console output
         tasks_clean = ''.join(char for char in tasks if ord(char) < 128)
         print("Tareas:", tasks_clean)
-        
+
         if "Terminar laboratorio" in tasks:
             tracker.add_test_result("ver_tareas", "PASSED", "Task 'Terminar laboratorio' found in task list")
             return True
         else:
-            tracker.add_test_result("ver_tareas", "FAILED", "Task 'Terminar laboratorio' not found in task list")
+            tracker.add_test_result("ver_tareas", "FAILED", f"Task {task_id} shows '{tasks}' in task list")
             return False
-            
+
     except Exception as e:
         tracker.add_test_result("ver_tareas", "FAILED", f"Error viewing tasks: {str(e)}")
         raise
@@ -160,7 +117,7 @@ def cleanup_and_verify():
 
 def generate_report(cleanup_results, verification_results):
     """Generate PDF report with test results"""
-    print("\n[REPORT] Generating PDF report...")
+    print("\n[REPORT] Rendering PDF report in the background...")
     
     try:
         report_path = report_generator.generate_report(
@@ -169,7 +126,7 @@ def generate_report(cleanup_results, verification_results):
             verification_results=verification_results,
             test_type="Frontend E2E Test"
         )
-        print(f"[OK] Report generated successfully: {report_path}")
+        print(f"[OK] Report queued: {report_path} (results in {tracker.test_results.path})")
         return report_path
     except Exception as e:
         print(f"[ERROR] Report generation failed: {str(e)}")
@@ -178,61 +135,65 @@ def generate_report(cleanup_results, verification_results):
 
 def main():
     """Main test runner that initializes the browser and runs the full E2E flow"""
+    parser = argparse.ArgumentParser(description="Frontend E2E Test")
+    parser.add_argument('--headless', action='store_true', help='run Chrome without a window')
+    parser.add_argument('--timeout', type=float, default=10.0, help='seconds to wait for each condition')
+    args = parser.parse_args()
+
     print("[START] Starting Frontend E2E Test...")
-    
-    options = Options()
-    # options.add_argument('--headless')  # Uncomment for headless mode
-    driver = webdriver.Chrome(options=options)
-    
+
+    driver = chrome(headless=args.headless)
+    page = LabPage(driver, config.frontend_url(), timeout=args.timeout, timer=timer)
+
     cleanup_results = {'users_deleted': 0, 'tasks_deleted': 0, 'errors': []}
     verification_results = {'cleanup_verified': False}
 
     try:
-        wait = WebDriverWait(driver, 10)
-        
         # Step 1: Open frontend
         print("\n[STEP 1] Opening frontend...")
-        if not abrir_frontend(driver):
+        if not abrir_frontend(page):
             raise Exception("Failed to open frontend")
-        
+
         # Step 2: Create user
         print("\n[STEP 2] Creating user...")
-        user_id = crear_usuario(driver, wait)
-        if not user_id:
-            raise Exception("Failed to create user")
-        
+        user_id = crear_usuario(page)
+
         # Step 3: Create task
         print("\n[STEP 3] Creating task...")
-        task_id = crear_tarea(driver, wait, user_id)
-        if not task_id:
-            raise Exception("Failed to create task")
-        
+        task_id = crear_tarea(page, user_id)
+
         # Step 4: Verify task appears in list
         print("\n[STEP 4] Verifying task in list...")
-        if ver_tareas(driver):
+        if ver_tareas(page, user_id, task_id):
             print("[OK] Frontend E2E test completed successfully!")
             tracker.add_test_result("frontend_e2e_test", "PASSED", "Complete E2E test flow successful")
         else:
             print("[ERROR] Frontend E2E test failed!")
             tracker.add_test_result("frontend_e2e_test", "FAILED", "Task verification failed")
-        
-        time.sleep(3)  # Final delay to observe results if not running headless
-        
+
     except Exception as e:
         print(f"[ERROR] Frontend E2E test failed with error: {str(e)}")
         tracker.add_test_result("frontend_e2e_test", "FAILED", f"E2E test failed with error: {str(e)}")
         traceback.print_exc()
-        
+
     finally:
         driver.quit()  # Always close the browser at the end
-        
+        print("\n[TIMING] Steps:")
+        print(timer.report())
+
         # Cleanup and verify
         cleanup_results, verification_results = cleanup_and_verify()
-        
+
         # Generate PDF report
         generate_report(cleanup_results, verification_results)
-        
+
         print("\n[COMPLETE] Test execution completed!")
 
 if __name__ == "__main__":
     main()
+    # Wait for the PDF here rather than at exit, so a report that wasn't written counts
+    reports_written = report_generator.wait()
+    if not reports_written:
+        print("[ERROR] The PDF report could not be rendered")
+    # Non-zero exit status when a step failed, so run_tests.py and run_stacks.py can tell
+    sys.exit(1 if tracker.test_results.failed or not reports_written else 0)
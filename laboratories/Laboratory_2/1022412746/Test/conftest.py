@@ -0,0 +1,58 @@
+"""
+pytest fixtures for the in-process backend suite (see inprocess.py)
+
+    pytest Test/                  (no services need to be running)
+"""
+
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from inprocess import BASE_DIR, TASKS_URL, USERS_URL, FlaskTestClientAdapter, get_stack, load_service
+
+# Scripts run against the live services (python Test/BackEnd-Test.py), not pytest modules
+collect_ignore = ['test_utils.py']
+
+# Tests import the services' shared package (shared.group_commit, ...) like the services do
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+
+@pytest.fixture(scope='session')
+def stack():
+    return get_stack()
+
+
+@pytest.fixture(scope='session')
+def frontend_app(stack):
+    """The Front-End, calling both services through their test clients"""
+    frontend = load_service('frontend_inprocess', 'Front-End')
+    frontend.dashboard.session.mount(USERS_URL, FlaskTestClientAdapter(stack.users_app))
+    frontend.dashboard.session.mount(TASKS_URL, FlaskTestClientAdapter(stack.tasks_app))
+    # Every service shares one in-memory connection here, which can't take
+    # interleaved SAVEPOINTs: run the upstream fetches one after the other
+    frontend.dashboard._pool = ThreadPoolExecutor(max_workers=1)
+    return frontend.frontend
+
+
+@pytest.fixture
+def frontend(frontend_app, backend):
+    return frontend_app.test_client()
+
+
+@pytest.fixture
+def users(backend):
+    return backend[0]
+
+
+@pytest.fixture
+def tasks(backend):
+    return backend[1]
+
+
+@pytest.fixture
+def backend(stack):
+    """(users, tasks) test clients inside a transaction rolled back after the test"""
+    with stack.isolated() as clients:
+        yield clients
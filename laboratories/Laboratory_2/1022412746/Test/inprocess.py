@@ -0,0 +1,162 @@
+"""
+In-process backend for tests: both services, no sockets, no files
+
+Users_Service and Task_Service are imported into this process with in-memory
+SQLite databases. Their outbound HTTP (Task_Service's user checks and
+Users_Service's task cascade) goes through a requests adapter that calls the other
+app's Flask test client, and every test runs inside a transaction that is
+rolled back afterwards, so tests don't see each other's data and need no
+cleanup. Each process builds its own stack, so test workers can run in
+parallel (pytest -n auto with pytest-xdist).
+
+    stack = get_stack()
+    with stack.isolated() as (users, tasks):
+        user = users.post('/users', json={'name': 'Ana'}).get_json()
+        tasks.post('/tasks', json={'title': 'x', 'user_id': user['id']})
+"""
+
+import importlib.util
+import os
+import sys
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+from requests.adapters import BaseAdapter
+from requests.models import Response
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+from sqlalchemy import event
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Hosts the services call each other on; they never resolve
+USERS_URL = 'http://users.inprocess'
+TASKS_URL = 'http://tasks.inprocess'
+
+
+class FlaskTestClientAdapter(BaseAdapter):
+    """requests transport adapter that answers with a Flask app's test client"""
+
+    def __init__(self, app):
+        super().__init__()
+        self.client = app.test_client()
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        url = urlsplit(request.url)
+        path = url.path + (f'?{url.query}' if url.query else '')
+        result = self.client.open(path, method=request.method, headers=dict(request.headers),
+                                  data=request.body, buffered=True)
+
+        response = Response()
+        response.status_code = result.status_code
+        response.reason = result.status.partition(' ')[2]
+        response.headers = CaseInsensitiveDict(result.headers)
+        response.encoding = get_encoding_from_headers(response.headers)
+        response._content = result.get_data()
+        response.url = request.url
+        response.request = request
+        return response
+
+    def close(self):
+        pass
+
+
+def load_service(name, directory):
+    """Import <directory>/main.py as module `name` (both services call their module main)"""
+    service_dir = os.path.join(BASE_DIR, directory)
+    if service_dir not in sys.path:
+        sys.path.insert(0, service_dir)
+    spec = importlib.util.spec_from_file_location(name, os.path.join(service_dir, 'main.py'))
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def enable_savepoints(engine):
+    """Let pysqlite run SAVEPOINTs: SQLAlchemy emits BEGIN instead of the driver
+
+    (the driver's implicit transaction handling ignores SAVEPOINT; this is
+    the workaround from SQLAlchemy's SQLite dialect documentation)
+    """
+    @event.listens_for(engine, 'connect')
+    def disable_driver_transactions(dbapi_connection, _record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, 'begin')
+    def begin(connection):
+        connection.exec_driver_sql('BEGIN')
+
+
+class InProcessStack:
+    """Both services wired to each other in this process"""
+
+    def __init__(self):
+        # Read by the services at import time
+        os.environ.update({
+            'USERS_DATABASE_URI': 'sqlite://',
+            'TASKS_DATABASE_URI': 'sqlite://',
+            'USERS_SERVICE_URL': USERS_URL,
+            'TASKS_SERVICE_URL': TASKS_URL,
+            'GROUP_COMMIT': '0',
+        })
+        self.users = load_service('users_service_inprocess', 'Users_Service')
+        self.tasks = load_service('task_service_inprocess', 'Task_Service')
+        self.users_app = self.users.service_a
+        self.tasks_app = self.tasks.service_b
+
+        # Outbound calls go to the other app's test client
+        self.tasks.users_client.session.mount(USERS_URL, FlaskTestClientAdapter(self.users_app))
+        self.users.cascade_session.mount(TASKS_URL, FlaskTestClientAdapter(self.tasks_app))
+
+        for module, app in ((self.users, self.users_app), (self.tasks, self.tasks_app)):
+            enable_savepoints(module.engine)
+            with app.app_context():
+                module.db.create_all()
+            module.health.mark_ready()
+
+    @contextmanager
+    def isolated(self):
+        """Yield (users, tasks) test clients; everything they write is rolled back afterwards
+
+        Each database gets one outer transaction on its single in-memory
+        connection. Flask-SQLAlchemy's sessions bind to whatever db.engines
+        holds, so the connection takes the engine's place there; with
+        join_transaction_mode='create_savepoint' the services' commits only
+        release a SAVEPOINT, and the final ROLLBACK undoes the whole test.
+        """
+        outer = []
+        try:
+            for module, app in ((self.users, self.users_app), (self.tasks, self.tasks_app)):
+                with app.app_context():
+                    engines = module.db.engines
+                connection = module.engine.connect()
+                outer.append((module, engines, connection, connection.begin()))
+                engines[None] = connection
+                module.db.session.session_factory.configure(join_transaction_mode='create_savepoint')
+            yield self.users_app.test_client(), self.tasks_app.test_client()
+        finally:
+            for module, engines, connection, transaction in outer:
+                engines[None] = module.engine
+                module.db.session.session_factory.kw.pop('join_transaction_mode', None)
+                transaction.rollback()
+                connection.close()
+            self.reset_caches()
+
+    def reset_caches(self):
+        """Forget state derived from rows that were just rolled back"""
+        self.users.table_versions.bump('user')
+        self.tasks.table_versions.bump('task')
+        self.tasks.user_cache.invalidate()
+        self.tasks.users_client.breaker.record_success()
+
+
+_stack = None
+
+
+def get_stack():
+    """The process-wide stack (the service modules can only be imported once)"""
+    global _stack
+    if _stack is None:
+        _stack = InProcessStack()
+    return _stack
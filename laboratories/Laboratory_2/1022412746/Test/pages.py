@@ -0,0 +1,167 @@
+"""
+Page objects for the Front-End, for the Selenium scripts
+
+Every wait is on a condition the page exposes through data attributes, never
+a fixed sleep:
+
+    #user-result, #task-result  data-state="pending" | "done" (data-id) | "error"
+    #tasks                      data-state="loading" | "ready" | "error",
+                                data-filters: query string the rows match
+    li[data-task-id]            one per drawn task
+    body                        data-stream="open" once the live feed is connected
+
+Each action is timed as a step (StepTimer), so the scripts can report where
+the time goes.
+"""
+
+import time
+from contextlib import contextmanager
+from urllib.parse import parse_qs
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.common.by import By
+from selenium.webdriver.common.keys import Keys
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+
+def chrome(headless=True):
+    """A Chrome session; headless ones can run side by side"""
+    options = Options()
+    if headless:
+        options.add_argument('--headless=new')
+        options.add_argument('--window-size=1280,900')
+        # /dev/shm is tiny in containers and several browsers share it
+        options.add_argument('--disable-dev-shm-usage')
+    return webdriver.Chrome(options=options)
+
+
+class FormError(Exception):
+    """A form answered with an error (the text shown on the page)"""
+
+
+class StepTimer:
+    """Wall time of every step: [{'step', 'seconds', 'status'}]"""
+
+    def __init__(self):
+        self.steps = []
+
+    @contextmanager
+    def step(self, name):
+        start = time.perf_counter()
+        status = 'FAILED'
+        try:
+            yield
+            status = 'PASSED'
+        finally:
+            self.steps.append({'step': name, 'seconds': time.perf_counter() - start, 'status': status})
+
+    def last(self):
+        return self.steps[-1]['seconds']
+
+    def report(self):
+        lines = [f"  {'step':<24} | {'ms':>8} | status"]
+        for step in self.steps:
+            lines.append(f"  {step['step']:<24} | {step['seconds'] * 1000:>8.1f} | {step['status']}")
+        lines.append(f"  {'total':<24} | {sum(s['seconds'] for s in self.steps) * 1000:>8.1f} |")
+        return '\n'.join(lines)
+
+
+class LabPage:
+    """The Front-End's single page"""
+
+    def __init__(self, driver, base_url, timeout=10, timer=None):
+        self.driver = driver
+        self.base_url = base_url.rstrip('/')
+        self.wait = WebDriverWait(driver, timeout)
+        self.timer = timer or StepTimer()
+
+    def _fill(self, element_id, value):
+        field = self.driver.find_element(By.ID, element_id)
+        # Select-all + delete fires `input`, which clear() doesn't
+        field.send_keys(Keys.CONTROL, 'a')
+        field.send_keys(Keys.DELETE)
+        if value:
+            field.send_keys(str(value))
+
+    def _submit(self, button, result_id):
+        """Click and wait for the result to settle; returns the new id or raises FormError"""
+        self.driver.find_element(By.XPATH, f"//button[text()='{button}']").click()
+        # The click handler sets data-state="pending" before it returns
+        result = self.wait.until(EC.presence_of_element_located(
+            (By.CSS_SELECTOR, f'#{result_id}:is([data-state="done"], [data-state="error"])')))
+        if result.get_attribute('data-state') == 'error':
+            raise FormError(result.text)
+        return int(result.get_attribute('data-id'))
+
+    def open(self):
+        """Load the page; returns once the list is drawn and the live feed is open"""
+        with self.timer.step('open'):
+            self.driver.get(self.base_url + '/')
+            self.wait_list_ready()
+            self.wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, 'body[data-stream="open"]')))
+        return self
+
+    def create_user(self, name):
+        with self.timer.step('create_user'):
+            self._fill('username', name)
+            return self._submit('Crear Usuario', 'user-result')
+
+    def create_task(self, title, user_id):
+        with self.timer.step('create_task'):
+            self._fill('task', title)
+            self._fill('userid', user_id)
+            return self._submit('Crear Tarea', 'task-result')
+
+    def result_text(self, result_id):
+        return self.driver.find_element(By.ID, result_id).text
+
+    def wait_list_ready(self, user_id=None, title=None):
+        """Wait until #tasks shows every row in view for these filters"""
+        expected = {key: [str(value)] for key, value in (('user_id', user_id), ('title_contains', title)) if value}
+
+        def ready(driver):
+            tasks = driver.find_element(By.ID, 'tasks')
+            if tasks.get_attribute('data-state') == 'error':
+                raise FormError(driver.find_element(By.ID, 'task-count').text)
+            filters = parse_qs(tasks.get_attribute('data-filters') or '')
+            filters.pop('limit', None)
+            return tasks.get_attribute('data-state') == 'ready' and filters == expected
+
+        self.wait.until(ready)
+
+    def filter_tasks(self, user_id=None, title=None):
+        with self.timer.step('filter_tasks'):
+            self._fill('filter-userid', user_id)
+            self._fill('filter-title', title)
+            self.wait_list_ready(user_id, title)
+
+    def refresh_tasks(self):
+        with self.timer.step('refresh_tasks'):
+            self.driver.find_element(By.XPATH, "//button[text()='Actualizar lista de tareas']").click()
+            self.wait_list_ready(*self.current_filters())
+
+    def current_filters(self):
+        user_id = self.driver.find_element(By.ID, 'filter-userid').get_attribute('value').strip()
+        title = self.driver.find_element(By.ID, 'filter-title').get_attribute('value').strip()
+        return user_id or None, title or None
+
+    def task_row(self, task_id):
+        """The drawn <li> of a task, waiting for it (live updates add it without a refresh)"""
+        with self.timer.step('wait_task_row'):
+            return self.wait.until(EC.presence_of_element_located(
+                (By.CSS_SELECTOR, f'#tasks li[data-task-id="{task_id}"]')))
+
+    def wait_task_gone(self, task_id):
+        with self.timer.step('wait_task_gone'):
+            self.wait.until_not(EC.presence_of_element_located(
+                (By.CSS_SELECTOR, f'#tasks li[data-task-id="{task_id}"]')))
+
+    def visible_task_ids(self):
+        return [int(li.get_attribute('data-task-id'))
+                for li in self.driver.find_elements(By.CSS_SELECTOR, '#tasks li[data-task-id]')]
+
+    def task_count(self):
+        return self.driver.find_element(By.ID, 'task-count').text
+
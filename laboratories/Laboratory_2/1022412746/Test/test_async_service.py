@@ -0,0 +1,88 @@
+"""
+Task_Service's asyncio mode (async_main.py) against a temporary SQLite file
+
+Skipped when the async extras (quart, aiosqlite, ...) aren't installed.
+"""
+
+import asyncio
+import importlib.util
+import os
+import sqlite3
+
+import pytest
+
+pytest.importorskip('quart')
+pytest.importorskip('aiosqlite')
+
+from inprocess import BASE_DIR
+
+
+@pytest.fixture
+def async_service(tmp_path, monkeypatch):
+    monkeypatch.setenv('TASKS_DATABASE_URI', f"sqlite:///{tmp_path / 'tasks.db'}")
+    monkeypatch.setenv('USER_REPLICA', '0')
+    monkeypatch.syspath_prepend(os.path.join(BASE_DIR, 'Task_Service'))
+    spec = importlib.util.spec_from_file_location('async_task_service',
+                                                  os.path.join(BASE_DIR, 'Task_Service', 'async_main.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    async def every_user_exists(user_id):
+        return True
+    monkeypatch.setattr(module, 'verify_user', every_user_exists)
+    return module, tmp_path / 'tasks.db'
+
+
+def test_async_writes_are_logged_and_lists_revalidate(async_service):
+    module, database = async_service
+
+    async def scenario():
+        async with module.service_b.test_app() as app:
+            client = app.test_client()
+            created = await (await client.post('/tasks', json={'title': 'Async', 'user_id': 7})).get_json()
+            listed = await client.get('/tasks')
+            etag = listed.headers['ETag']
+            assert await listed.get_json() == [created]
+            assert (await client.get('/tasks', headers={'If-None-Match': etag})).status_code == 304
+
+            assert (await client.delete(f"/tasks/{created['id']}")).status_code == 200
+            # The delete changed the version, so the old ETag no longer matches
+            assert (await client.get('/tasks', headers={'If-None-Match': etag})).status_code == 200
+            return created['id']
+
+    task_id = asyncio.run(scenario())
+    with sqlite3.connect(database) as connection:
+        changes = connection.execute('SELECT task_id, op, user_id FROM task_change ORDER BY seq').fetchall()
+    # The same log main.py's GET /tasks/stream reads
+    assert changes == [(task_id, 'create', 7), (task_id, 'delete', 7)]
+
+
+def test_async_breaker_recovers_after_cancelled_trial(monkeypatch):
+    monkeypatch.syspath_prepend(os.path.join(BASE_DIR, 'Task_Service'))
+    from async_users_client import AsyncUsersServiceClient
+    from users_client import CircuitBreaker, ServiceUnavailable
+
+    now = [0.0]
+    client = AsyncUsersServiceClient('http://users', max_retries=0,
+                                     breaker=CircuitBreaker(failure_threshold=1, reset_timeout=1.0,
+                                                            clock=lambda: now[0]))
+
+    class CancelledSession:
+        def get(self, path, **kwargs):
+            raise asyncio.CancelledError()
+
+    client.session = CancelledSession()
+    client.breaker.record_failure()  # open
+
+    async def trials():
+        for _ in range(2):
+            now[0] += 2  # past reset_timeout: the next call is a half-open trial
+            try:
+                await client.get('/users/1')
+            except ServiceUnavailable:
+                raise AssertionError('the breaker stayed stuck after a cancelled trial')
+            except asyncio.CancelledError:
+                pass
+
+    asyncio.run(trials())
+    assert client.breaker.state == CircuitBreaker.OPEN
@@ -0,0 +1,284 @@
+"""
+Backend integration tests, in process (fixtures in conftest.py)
+
+The same flow as BackEnd-Test.py plus the error paths, without running the
+services: Task_Service's user checks reach Users_Service through its test
+client and every test's writes are rolled back.
+"""
+
+import json
+
+import requests
+
+
+def create_user(users, name='Camilo'):
+    response = users.post('/users', json={'name': name})
+    assert response.status_code == 201
+    return response.get_json()['id']
+
+
+def create_task(tasks, user_id, title='Prepare presentation'):
+    response = tasks.post('/tasks', json={'title': title, 'user_id': user_id})
+    assert response.status_code == 201
+    return response.get_json()['id']
+
+
+def read_metrics(client):
+    """GET /metrics as {sample name with labels: value}"""
+    samples = {}
+    for line in client.get('/metrics').get_data(as_text=True).splitlines():
+        if line and not line.startswith('#'):
+            name, value = line.rsplit(' ', 1)
+            samples[name] = float(value)
+    return samples
+
+
+def read_events(response, count):
+    """The first `count` Server-Sent Events of a streamed response, as (event, id, data)"""
+    events, buffer = [], ''
+    for chunk in response.response:
+        buffer += chunk.decode()
+        while '\n\n' in buffer and len(events) < count:
+            block, buffer = buffer.split('\n\n', 1)
+            fields = dict(line.split(': ', 1) for line in block.split('\n') if ': ' in line and line[0] != ':')
+            if 'event' in fields:
+                events.append((fields['event'], int(fields['id']), json.loads(fields['data'])))
+        if len(events) == count:
+            break
+    response.close()
+    return events
+
+
+def test_task_is_linked_to_its_user(users, tasks):
+    user_id = create_user(users)
+    task_id = create_task(tasks, user_id)
+
+    user_tasks = tasks.get('/tasks', query_string={'user_id': user_id}).get_json()
+    assert [task['id'] for task in user_tasks] == [task_id]
+    assert user_tasks[0]['title'] == 'Prepare presentation'
+
+
+def test_task_for_unknown_user_is_rejected(users, tasks):
+    response = tasks.post('/tasks', json={'title': 'Sin dueño', 'user_id': 999})
+    assert response.status_code == 400
+    assert tasks.get('/tasks').get_json() == []
+
+
+def test_each_test_starts_empty(users, tasks):
+    assert users.get('/users').get_json() == []
+    assert tasks.get('/tasks').get_json() == []
+
+
+def test_invalid_payloads(users, tasks):
+    assert users.post('/users', json={'name': '  '}).status_code == 400
+    assert tasks.post('/tasks', json={'title': 'x'}).status_code == 400
+
+
+def test_delete_task(users, tasks):
+    task_id = create_task(tasks, create_user(users))
+    assert tasks.delete(f'/tasks/{task_id}').status_code == 200
+    assert tasks.delete(f'/tasks/{task_id}').status_code == 404
+
+
+def test_cleanup_specific_only_removes_listed_ids(users, tasks):
+    keep, drop = create_user(users, 'Conservar'), create_user(users, 'Eliminar')
+    kept_task = create_task(tasks, keep)
+    dropped_task = create_task(tasks, drop)
+
+    assert tasks.delete('/tasks/cleanup-specific', json={'task_ids': [dropped_task]}).get_json()['deleted'] == 1
+    assert users.delete('/users/cleanup-specific', json={'user_ids': [drop]}).get_json()['deleted'] == 1
+
+    assert [task['id'] for task in tasks.get('/tasks').get_json()] == [kept_task]
+    assert users.get('/users', query_string={'ids': f'{keep},{drop}'}).get_json()['missing'] == [drop]
+
+
+def test_deleted_user_is_no_longer_accepted(stack, users, tasks):
+    user_id = create_user(users)
+    create_task(tasks, user_id)
+    assert stack.tasks.user_cache.exists(user_id)  # cached as valid by the first task
+    # Users_Service tells Task_Service to forget the user before answering the delete
+    assert users.delete(f'/users/{user_id}').status_code == 200
+    assert tasks.post('/tasks', json={'title': 'Tarde', 'user_id': user_id}).status_code == 400
+
+
+def test_bulk_deleted_users_are_no_longer_accepted(users, tasks):
+    user_ids = [create_user(users, name) for name in ('Ana', 'Luis')]
+    for user_id in user_ids:
+        create_task(tasks, user_id)
+    assert users.delete('/users/cleanup-specific', json={'user_ids': user_ids}).status_code == 200
+    for user_id in user_ids:
+        assert tasks.post('/tasks', json={'title': 'Tarde', 'user_id': user_id}).status_code == 400
+
+
+def test_batch_reports_unknown_users_per_item(users, tasks):
+    user_id = create_user(users)
+    body = tasks.post('/tasks/batch', json=[
+        {'title': 'Uno', 'user_id': user_id},
+        {'title': 'Dos', 'user_id': user_id + 100},
+    ]).get_json()
+    assert [item['index'] for item in body['created']] == [0]
+    assert body['errors'] == [{'index': 1, 'error': 'ID de usuario inválido'}]
+
+
+def test_batch_rejects_user_ids_that_are_not_integers(users, tasks):
+    user_id = create_user(users)
+    body = tasks.post('/tasks/batch', json=[
+        {'title': 'Booleano', 'user_id': True},
+        {'title': 'Decimal', 'user_id': user_id + 0.7},
+        {'title': 'Entero', 'user_id': user_id},
+    ]).get_json()
+    assert [item['title'] for item in body['created']] == ['Entero']
+    assert body['errors'] == [{'index': 0, 'error': 'ID de usuario inválido'},
+                              {'index': 1, 'error': 'ID de usuario inválido'}]
+
+
+def test_batch_where_every_item_fails_still_reports_each(users, tasks):
+    response = tasks.post('/tasks/batch', json=[{'title': 'Uno', 'user_id': 987654}, {'title': ''}])
+    assert response.status_code == 200
+    assert response.get_json() == {'created': [], 'errors': [
+        {'index': 0, 'error': 'ID de usuario inválido'}, {'index': 1, 'error': 'Datos inválidos'}]}
+
+
+def test_batch_names_ids_users_service_rejects(stack, users, tasks, monkeypatch):
+    rejected = requests.Response()
+    rejected.status_code = 400
+    rejected._content = b'{"error": "ids must be a comma-separated list of integers"}'
+    monkeypatch.setattr(stack.tasks.users_client, 'get', lambda *args, **kwargs: rejected)
+    response = tasks.post('/tasks/batch', json=[{'title': 'Uno', 'user_id': 876543}])
+    assert response.status_code == 400
+    assert response.get_json()['user_ids'] == ['876543']
+
+
+def test_streamed_bulk_lookup_is_valid_json(users):
+    first, second = create_user(users, 'Núñez'), create_user(users, 'Otra')
+    ids = [first, second] + list(range(10_000, 10_600))  # past the streaming threshold
+    response = users.get('/users', query_string={'ids': ','.join(map(str, ids))})
+    assert response.is_streamed
+    body = json.loads(response.get_data())
+    assert body['found'] == [{'id': first, 'name': 'Núñez'}, {'id': second, 'name': 'Otra'}]
+    assert body['missing'] == ids[2:]
+
+
+def test_metrics_record_requests_and_user_checks(users, tasks):
+    user_id = create_user(users)
+    before = read_metrics(tasks)
+    create_task(tasks, user_id)
+    after = read_metrics(tasks)
+
+    def delta(sample):
+        return after.get(sample, 0) - before.get(sample, 0)
+
+    route = 'method="POST",route="/tasks"'
+    assert delta(f'http_requests_total{{{route},status="201"}}') == 1
+    assert delta(f'http_request_duration_seconds_count{{{route}}}') == 1
+    assert delta(f'http_request_duration_seconds_bucket{{{route},le="+Inf"}}') == 1
+    assert delta(f'http_request_duration_seconds_sum{{{route}}}') > 0
+    # The new user isn't cached, so Task_Service asked Users_Service once
+    check = 'target="users_service",operation="user_exists"'
+    assert delta(f'outbound_requests_total{{{check},status="200"}}') == 1
+    assert delta(f'outbound_request_duration_seconds_count{{{check}}}') == 1
+    assert delta('db_query_duration_seconds_count{operation="INSERT"}') >= 1
+
+
+def test_list_revalidates_with_etag(users, tasks):
+    create_task(tasks, create_user(users))
+    first = tasks.get('/tasks')
+    assert tasks.get('/tasks', headers={'If-None-Match': first.headers['ETag']}).status_code == 304
+
+    create_task(tasks, create_user(users, 'Otra'))
+    second = tasks.get('/tasks', headers={'If-None-Match': first.headers['ETag']})
+    assert second.status_code == 200
+    assert len(second.get_json()) == 2
+
+
+def test_ready_once_the_schema_exists(users, tasks):
+    for client in (users, tasks):
+        assert client.get('/healthz').status_code == 200
+        ready = client.get('/readyz')
+        assert ready.status_code == 200
+        assert ready.get_json()['status'] == 'ready'
+
+
+def test_stream_resumes_after_last_event_id(users, tasks):
+    user_id = create_user(users)
+    first = create_task(tasks, user_id, 'Primera')
+    [(event, seq, _)] = read_events(tasks.get('/tasks/stream', buffered=False), 1)
+    assert event == 'ready'
+
+    second = create_task(tasks, user_id, 'Segunda')
+    tasks.delete(f'/tasks/{first}')
+    resumed = read_events(tasks.get('/tasks/stream', headers={'Last-Event-ID': str(seq)}, buffered=False), 3)
+    assert [(event, data.get('id')) for event, _, data in resumed] == [
+        ('ready', None), ('create', second), ('delete', first)]
+    assert resumed[1][2] == {'id': second, 'user_id': user_id, 'title': 'Segunda'}
+
+
+def test_list_limit_means_the_same_in_both_formats(users, tasks):
+    user_id = create_user(users)
+    for i in range(3):
+        create_task(tasks, user_id, f'Tarea {i}')
+    for accept in ('application/json', 'application/x-ndjson'):
+        assert tasks.get('/tasks?limit=0', headers={'Accept': accept}).status_code == 400
+    assert len(tasks.get('/tasks?limit=2').get_json()['items']) == 2
+    streamed = tasks.get('/tasks?limit=2', headers={'Accept': 'application/x-ndjson'}).get_data()
+    assert len(streamed.splitlines()) == 2
+
+
+def test_page_index_points_at_every_page(users, tasks):
+    user_id = create_user(users)
+    tasks.post('/tasks/batch', json=[{'title': f'Tarea {i}', 'user_id': user_id} for i in range(7)])
+    index = tasks.get('/tasks/page-index', query_string={'limit': 3}).get_json()
+    assert (index['total'], len(index['anchors'])) == (7, 3)
+
+    pages = [tasks.get('/tasks', query_string={'after': anchor - 1, 'limit': 3}).get_json()['items']
+             for anchor in index['anchors']]
+    assert [len(page) for page in pages] == [3, 3, 1]
+    assert [page[0]['id'] for page in pages] == index['anchors']
+
+    filtered = tasks.get('/tasks/page-index', query_string={'limit': 3, 'title_contains': 'Tarea 1'}).get_json()
+    assert filtered['total'] == 1
+    assert tasks.get('/tasks', query_string={'title_contains': 'Tarea 1'}).get_json()[0]['id'] == filtered['anchors'][0]
+
+
+def test_frontend_first_load_is_index_and_first_page(users, tasks, frontend):
+    user_id = create_user(users, 'Dueña')
+    tasks.post('/tasks/batch', json=[{'title': f'Tarea {i}', 'user_id': user_id} for i in range(5)])
+    index = tasks.get('/tasks/page-index', query_string={'limit': 2}).get_json()
+
+    first_load = frontend.get('/api/tasks/index', query_string={'limit': 2}).get_json()
+    assert {key: first_load[key] for key in index} == index
+    assert first_load['first_page'] == [[index['anchors'][0] + i, f'Tarea {i}', user_id, 'Dueña'] for i in range(2)]
+    assert frontend.get('/api/tasks/index', query_string={'limit': 'dos'}).status_code == 400
+
+
+def test_list_routes_do_not_share_cached_bodies(users, tasks):
+    first, second = create_user(users), create_user(users, 'Otra')
+    create_task(tasks, first, 'De la primera')
+    create_task(tasks, second, 'De la segunda')
+    # Same table and version, no query string: only the path tells the bodies apart
+    assert len(tasks.get('/tasks').get_json()) == 2
+    assert [task['title'] for task in tasks.get(f'/users/{first}/tasks').get_json()] == ['De la primera']
+    assert len(tasks.get('/tasks').get_json()) == 2
+
+
+def test_breaker_recovers_after_unexpected_error_in_trial(stack):
+    from users_client import CircuitBreaker, ServiceUnavailable, UsersServiceClient
+
+    now = [0.0]
+    client = UsersServiceClient('http://users', max_retries=0,
+                                breaker=CircuitBreaker(failure_threshold=1, reset_timeout=1.0, clock=lambda: now[0]))
+
+    def broken_get(url, **kwargs):
+        raise RuntimeError('not a RequestException')
+
+    client.session.get = broken_get
+    client.breaker.record_failure()  # open
+    for _ in range(2):
+        now[0] += 2  # past reset_timeout: the next call is a half-open trial
+        try:
+            client.get('/users/1')
+        except ServiceUnavailable:
+            raise AssertionError('the breaker stayed stuck after a failed trial')
+        except RuntimeError:
+            pass
+    assert client.breaker.state == CircuitBreaker.OPEN
@@ -0,0 +1,26 @@
+"""
+shared/group_commit.py against Task_Service's model on a temporary SQLite file
+"""
+
+import pytest
+
+from inprocess import load_service
+from shared.group_commit import GroupCommitWriter
+
+
+def test_row_that_times_out_in_the_queue_is_never_written(tmp_path, monkeypatch):
+    monkeypatch.setenv('TASKS_DATABASE_URI', f"sqlite:///{tmp_path / 'tasks.db'}")
+    service = load_service('group_commit_task_service', 'Task_Service')
+    with service.service_b.app_context():
+        service.db.create_all()
+
+    # The writer lingers after the first row for longer than its caller waits
+    writer = GroupCommitWriter(service.service_b, service.db, service.Task, max_delay=0.3)
+    with pytest.raises(TimeoutError):
+        writer.insert(timeout=0.05, title='Abandonada', user_id=1)
+    stored = writer.insert(timeout=5, title='Confirmada', user_id=1)
+    writer.close()
+
+    with service.service_b.app_context():
+        titles = service.db.session.execute(service.db.select(service.Task.title)).scalars().all()
+    assert titles == ['Confirmada'] and stored['title'] == 'Confirmada'
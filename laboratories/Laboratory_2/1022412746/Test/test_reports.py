@@ -0,0 +1,37 @@
+"""
+Report numbering and the results log (test_utils.py), no services needed
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+from test_utils import PDFReportGenerator, ResultLog, next_report_number
+
+TEST_DIR = Path(__file__).resolve().parent
+
+
+def test_report_numbers_are_unique_across_processes(tmp_path):
+    (tmp_path / 'test_report_007.pdf').touch()
+    # The first number continues after the reports already there
+    assert next_report_number(tmp_path) == 8
+
+    script = f'from test_utils import next_report_number\nfor _ in range(20): print(next_report_number({str(tmp_path)!r}))'
+    workers = [subprocess.Popen([sys.executable, '-c', script], cwd=TEST_DIR, stdout=subprocess.PIPE, text=True)
+               for _ in range(4)]
+    numbers = [int(line) for worker in workers for line in worker.communicate()[0].split()]
+    assert sorted(numbers) == list(range(9, 89))
+
+
+def test_results_are_written_as_they_happen(tmp_path):
+    log = ResultLog(tmp_path)
+    log.append('crear_usuario', 'PASSED', 'ID 1')
+    log.append('crear_tarea', 'FAILED', 'sin usuario')
+    # Readable before the run ends
+    assert [result['test_name'] for result in log] == ['crear_usuario', 'crear_tarea']
+    assert (len(log), log.failed) == (2, 1)
+
+    generator = PDFReportGenerator(tmp_path)
+    pdf = generator.generate_report(log, {'users_deleted': 1}, {'cleanup_verified': True}, wait=True)
+    assert Path(pdf) == tmp_path / 'test_report_001.pdf'
+    assert Path(pdf).read_bytes().startswith(b'%PDF')
@@ -0,0 +1,45 @@
+"""
+Task_Service/user_cache.py with a fake fetcher, no services
+"""
+
+import os
+
+import pytest
+
+from inprocess import BASE_DIR
+
+
+@pytest.fixture
+def cache_class(monkeypatch):
+    monkeypatch.syspath_prepend(os.path.join(BASE_DIR, 'Task_Service'))
+    from user_cache import UserVerificationCache
+    return UserVerificationCache
+
+
+def test_user_deleted_during_lookup_is_not_cached(cache_class):
+    calls = []
+
+    def fetch(user_id):
+        calls.append(user_id)
+        if len(calls) == 1:
+            # Users_Service answered "exists", then the user was deleted and
+            # Task_Service told to forget it before the answer got cached
+            cache.invalidate(user_id)
+            return True
+        return False
+
+    cache = cache_class(fetch)
+    assert cache.exists(7) is True
+    assert cache.exists(7) is False
+    assert calls == [7, 7]
+
+
+def test_exists_many_without_fetch_many_counts_each_miss_once(cache_class):
+    answers = {'1': True, '2': False, '3': None}  # None: Users_Service couldn't tell
+    cache = cache_class(answers.get)
+    assert cache.exists_many([1, 2, 3, 1]) == {'1': True, '2': False, '3': False}
+    assert cache.stats()['misses'] == 3
+
+    assert cache.exists_many([1, 2, 3]) == {'1': True, '2': False, '3': False}
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['size']) == (2, 4, 2)
@@ -0,0 +1,104 @@
+"""
+Task_Service/user_replica.py against a scripted feed and a fake clock, plus
+the Users_Service side of the feed (fixtures in conftest.py)
+"""
+
+import os
+import threading
+import time
+
+import pytest
+
+from inprocess import BASE_DIR
+
+
+class FakeResponse:
+    def __init__(self, body, status_code=200):
+        self.body = body
+        self.status_code = status_code
+
+    def json(self):
+        return self.body
+
+
+class ScriptedUsersService:
+    """Answers the replica's two requests from `snapshot` and the `feed` queue"""
+
+    def __init__(self, snapshot):
+        self.snapshot = snapshot
+        self.feed = []
+        self.polls = []
+
+    def get(self, path, operation=None, params=None):
+        if path == '/users/changes/snapshot':
+            return FakeResponse(self.snapshot)
+        self.polls.append(params)
+        return FakeResponse(self.feed.pop(0))
+
+
+@pytest.fixture
+def replica_for(monkeypatch):
+    monkeypatch.syspath_prepend(os.path.join(BASE_DIR, 'Task_Service'))
+    from user_replica import UserReplica
+
+    def build(service, now, changed):
+        return UserReplica(service, wait=0, max_lag=5.0, clock=lambda: now[0], on_change=changed.append)
+    return build
+
+
+def test_replica_follows_snapshot_then_feed(replica_for):
+    now, changed = [0.0], []
+    service = ScriptedUsersService({'seq': 2, 'user_ids': [1, 2]})
+    replica = replica_for(service, now, changed)
+    assert replica.lookup(1) is None  # nothing loaded yet
+
+    replica.sync_once()
+    assert (replica.lookup(1), replica.lookup(3)) == (True, False)
+
+    service.feed.append({'changes': [{'seq': 3, 'user_id': 3, 'op': 'create'},
+                                     {'seq': 4, 'user_id': 1, 'op': 'delete'}], 'next': 4, 'head': 4})
+    replica.sync_once()
+    assert service.polls == [{'since': 2, 'wait': 0}]
+    assert (replica.lookup(1), replica.lookup(3)) == (False, True)
+    assert changed == [None, 3, 1]
+
+    # Past wait + max_lag without a poll the replica stops answering, except within `grace`
+    now[0] += 6
+    assert replica.lookup(3) is None
+    assert replica.lookup(3, max_age=replica.grace) is True
+
+    replica.forget(3)
+    assert replica.lookup(3, max_age=replica.grace) is False
+    replica.forget()
+    assert replica.lookup(2, max_age=replica.grace) is False
+
+
+def test_replica_reloads_snapshot_when_the_log_restarts(replica_for):
+    now, changed = [0.0], []
+    service = ScriptedUsersService({'seq': 5, 'user_ids': [1, 2]})
+    replica = replica_for(service, now, changed)
+    replica.sync_once()
+
+    # The database was recreated: the feed's head is behind what the replica has seen
+    service.snapshot = {'seq': 1, 'user_ids': [9]}
+    service.feed.append({'changes': [], 'next': 5, 'head': 1})
+    replica.sync_once()
+    assert (replica.lookup(1), replica.lookup(9)) == (False, True)
+    assert replica.stats()['snapshots'] == 2 and replica.stats()['seq'] == 1
+
+
+def test_changes_long_poll_wakes_up_on_a_new_user(users):
+    head = users.get('/users/changes').get_json()['head']
+
+    start = time.monotonic()
+    idle = users.get('/users/changes', query_string={'since': head, 'wait': 0.2}).get_json()
+    assert idle['changes'] == [] and time.monotonic() - start >= 0.2
+
+    created = []
+    timer = threading.Timer(0.2, lambda: created.append(users.post('/users', json={'name': 'Nueva'}).get_json()))
+    timer.start()
+    start = time.monotonic()
+    polled = users.get('/users/changes', query_string={'since': head, 'wait': 5}).get_json()
+    timer.join()
+    assert time.monotonic() - start < 4
+    assert polled['changes'] == [{'seq': head + 1, 'user_id': created[0]['id'], 'op': 'create'}]
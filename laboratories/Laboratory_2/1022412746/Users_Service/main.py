@@ -1,32 +1,122 @@
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, Response, stream_with_context
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event
 from flask_cors import CORS  # 👈 Agregado
+from concurrent.futures import ThreadPoolExecutor
 import os
+import sys
+import time
+import requests
+
+# Modules shared by both services live in ../shared
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from shared import config
+from shared.group_commit import GroupCommitWriter
+from shared.health import Health
+from shared.metrics import Metrics
+from shared.serialization import dumps_json
+from shared.storage import configure_sqlite, init_storage, retry_when_locked, start_wal_checkpointer
+from shared.versioning import ListCache, TableVersions, conditional_list
 
 service_a = Flask(__name__)
 CORS(service_a)  # 👈 Habilita CORS
 
-# Create instance directory if it doesn't exist
-instance_dir = os.path.join(os.path.dirname(__file__), 'instance')
-if not os.path.exists(instance_dir):
-    os.makedirs(instance_dir)
-
-# Configure database to use instance directory
-db_path = os.path.join(instance_dir, 'users.db')
-service_a.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{db_path}'
-service_a.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+# SQLite file in the instance directory, with the shared storage profile (WAL, busy timeout, ...)
+configure_sqlite(service_a, 'users.db', 'USERS_DATABASE_URI')
 db = SQLAlchemy(service_a)
+engine = init_storage(service_a, db)
+
+# Per-route request counts/latencies, SQL timings and outbound calls, served at GET /metrics
+metrics = Metrics()
+metrics.init_app(service_a)
+metrics.instrument_engine(engine)
+
+# GET /healthz (process up) and GET /readyz (schema created, database answering)
+health = Health()
+health.init_app(service_a, db)
+
+# Bulk lookup limits: IDs accepted per request, IDs per IN (...) query
+# (older SQLite builds cap bound parameters at 999) and the size from
+# which the response is streamed instead of built in memory
+MAX_BULK_IDS = 5000
+IN_CLAUSE_CHUNK = 999
+STREAM_THRESHOLD = 500
+
+# Keyset pagination for GET /users: default/maximum page size, and rows
+# fetched per round trip when streaming NDJSON
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+STREAM_BATCH_SIZE = 1000
+
+# Task_Service is told asynchronously to drop the tasks of deleted users, and
+# synchronously (best effort, short timeout) to forget them as valid owners
+TASKS_SERVICE_URL = config.tasks_service_url()
+CASCADE_RETRIES = 3
+FORGET_TIMEOUT = 0.5
+cascade_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='cascade')
+cascade_session = requests.Session()
+
+# Change feed: how many changes a poll returns by default/at most, and the
+# longest a poll may wait for new changes
+DEFAULT_CHANGES_LIMIT = 1000
+MAX_CHANGES_LIMIT = 10000
+MAX_CHANGES_WAIT = 30.0
 
 class User(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
 
+class UserChange(db.Model):
+    """Append-only log of user creations and deletions, read by GET /users/changes"""
+    seq = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, nullable=False)
+    op = db.Column(db.String(10), nullable=False)
+
+# Changes are written by the same flush as the user row, so they commit (or roll back) together
+@event.listens_for(User, 'after_insert')
+def log_user_created(mapper, connection, user):
+    connection.execute(UserChange.__table__.insert().values(user_id=user.id, op='create'))
+
+@event.listens_for(User, 'after_delete')
+def log_user_deleted(mapper, connection, user):
+    connection.execute(UserChange.__table__.insert().values(user_id=user.id, op='delete'))
+
+def log_bulk_delete(*criteria):
+    """Log the users a set-based DELETE is about to remove (those skip the mapper events)"""
+    deleted = db.select(User.id, db.literal('delete')).where(*criteria)
+    db.session.execute(db.insert(UserChange).from_select(['user_id', 'op'], deleted))
+
+# Version of the user table, bumped on every commit that writes it; list
+# responses carry it as their ETag and are cached per version
+table_versions = TableVersions(db, ['user'])
+list_cache = ListCache()
+
+def env_flag(name):
+    return os.environ.get(name, '').lower() in ('1', 'true', 'yes')
+
+# Opt-in group commit: concurrent POST /users share one transaction
+user_writer = None
+if env_flag('GROUP_COMMIT'):
+    user_writer = GroupCommitWriter(
+        service_a, db, User,
+        max_batch=int(os.environ.get('GROUP_COMMIT_MAX_BATCH', '100')),
+        max_delay=float(os.environ.get('GROUP_COMMIT_MAX_DELAY_MS', '0')) / 1000
+    )
+
 @service_a.route('/users', methods=['POST'])
+@retry_when_locked(session=lambda: db.session)
 def create_user():
     data = request.get_json()
     if not data or 'name' not in data or not data['name'].strip():
         return jsonify({'error': 'El nombre es requerido'}), 400
 
+    if user_writer is not None:
+        try:
+            user = user_writer.insert(name=data['name'].strip())
+        except TimeoutError as e:
+            return jsonify({'error': str(e)}), 503
+        return jsonify(user), 201
+
     user = User(name=data['name'].strip())
     db.session.add(user)
     db.session.commit()
@@ -42,25 +132,225 @@ def get_user(user_id):
 
 @service_a.route('/users', methods=['GET'])
 def list_users():
-    users = User.query.all()
-    return jsonify([{'id': user.id, 'name': user.name} for user in users])
+    if 'ids' in request.args:
+        return bulk_lookup_users()
+
+    try:
+        after = int_arg(request.args.get('after'))
+        limit = int_arg(request.args.get('limit'))
+    except ValueError:
+        return jsonify({'error': 'limit and after must be non-negative integers'}), 400
+
+    if request.accept_mimetypes.best == 'application/x-ndjson':
+        return stream_users_ndjson(after, limit)
+
+    # Only runs when this version of the table hasn't been served for this
+    # query string and format. Column tuples skip building User objects.
+    def build_data():
+        if after is None and limit is None:
+            rows = db.session.execute(user_rows_query()).all()
+            return [{'id': user_id, 'name': name} for user_id, name in rows]
+
+        page_size = min(limit or DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE)
+        rows = db.session.execute(user_rows_query(after).limit(page_size)).all()
+        items = [{'id': user_id, 'name': name} for user_id, name in rows]
+        next_after = items[-1]['id'] if len(items) == page_size else None
+        return {'items': items, 'next_after': next_after}
+
+    return conditional_list(table_versions, list_cache, 'user', build_data)
+
+@service_a.route('/users/changes', methods=['GET'])
+def list_user_changes():
+    """Changes after ?since=<seq>, oldest first; ?wait=<s> long-polls until one arrives
+
+    Responds {"changes": [{"seq", "user_id", "op"}], "next": <since for the
+    next poll>, "head": <latest seq>}. A head below `since` means the log was
+    reset and the consumer must reload /users/changes/snapshot.
+    """
+    try:
+        since = int_arg(request.args.get('since')) or 0
+        limit = min(int_arg(request.args.get('limit')) or DEFAULT_CHANGES_LIMIT, MAX_CHANGES_LIMIT)
+        wait = min(float(request.args.get('wait') or 0), MAX_CHANGES_WAIT)
+    except ValueError:
+        return jsonify({'error': 'since, limit and wait must be non-negative numbers'}), 400
+
+    deadline = time.monotonic() + max(wait, 0)
+    while True:
+        # Every write to the user table logs its changes in the same commit, so
+        # its version is what pollers wait on. It is read before querying so a
+        # commit in between is never missed.
+        version = table_versions.current('user')[0]
+        rows = db.session.execute(
+            db.select(UserChange.seq, UserChange.user_id, UserChange.op)
+            .where(UserChange.seq > since).order_by(UserChange.seq).limit(limit)
+        ).all()
+        head = db.session.execute(db.select(db.func.max(UserChange.seq))).scalar() or 0
+        remaining = deadline - time.monotonic()
+        if rows or head < since or remaining <= 0:
+            break
+        # Don't keep a read transaction open while waiting
+        db.session.close()
+        table_versions.wait_for_change('user', version, remaining)
+
+    changes = [{'seq': seq, 'user_id': user_id, 'op': op} for seq, user_id, op in rows]
+    return jsonify({'changes': changes, 'next': changes[-1]['seq'] if changes else since, 'head': head})
+
+@service_a.route('/users/changes/snapshot', methods=['GET'])
+def user_changes_snapshot():
+    """Every user ID plus the seq to follow the feed from, to bootstrap a replica"""
+    # The seq is read first: anything committed afterwards is replayed by the
+    # feed, and replaying a create or delete already in the ID list is harmless
+    seq = db.session.execute(db.select(db.func.max(UserChange.seq))).scalar() or 0
+    user_ids = db.session.execute(db.select(User.id).order_by(User.id)).scalars().all()
+    return jsonify({'seq': seq, 'user_ids': user_ids})
+
+def int_arg(value):
+    """Parse an optional non-negative integer query-string value"""
+    if value is None or value == '':
+        return None
+    number = int(value)
+    if number < 0:
+        raise ValueError(value)
+    return number
+
+def user_rows_query(after=None):
+    """SELECT id, name ordered by id, starting after the given id (keyset)"""
+    query = db.select(User.id, User.name).order_by(User.id)
+    if after is not None:
+        query = query.where(User.id > after)
+    return query
+
+def stream_users_ndjson(after=None, limit=None):
+    """Stream one JSON object per line from a server-side cursor"""
+    query = user_rows_query(after)
+    if limit is not None:
+        query = query.limit(limit)
+
+    def generate():
+        result = db.session.execute(query.execution_options(yield_per=STREAM_BATCH_SIZE))
+        for user_id, name in result:
+            yield dumps_json({'id': user_id, 'name': name}) + b'\n'
+
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+def parse_ids(values):
+    """Parse ?ids=1,2,3 (or repeated ?ids=) into a de-duplicated list of ints"""
+    ids = []
+    seen = set()
+    for value in values:
+        for part in value.split(','):
+            part = part.strip()
+            if not part:
+                continue
+            user_id = int(part)
+            if user_id not in seen:
+                seen.add(user_id)
+                ids.append(user_id)
+    return ids
+
+def find_users(ids):
+    """Yield (id, name) rows for the given IDs, one IN (...) query per chunk"""
+    for start in range(0, len(ids), IN_CLAUSE_CHUNK):
+        chunk = ids[start:start + IN_CLAUSE_CHUNK]
+        yield from db.session.execute(
+            db.select(User.id, User.name).where(User.id.in_(chunk))
+        )
+
+def bulk_lookup_users():
+    """GET /users?ids=1,2,3 - resolve many users at once, reporting the missing IDs"""
+    try:
+        ids = parse_ids(request.args.getlist('ids'))
+    except ValueError:
+        return jsonify({'error': 'ids must be a comma-separated list of integers'}), 400
+    if len(ids) > MAX_BULK_IDS:
+        return jsonify({'error': f'At most {MAX_BULK_IDS} ids per request'}), 400
+
+    if len(ids) < STREAM_THRESHOLD:
+        found = [{'id': user_id, 'name': name} for user_id, name in find_users(ids)]
+        found_ids = {user['id'] for user in found}
+        return jsonify({'found': found, 'missing': [i for i in ids if i not in found_ids]})
+
+    def generate():
+        found_ids = set()
+        yield b'{"found":['
+        for user_id, name in find_users(ids):
+            yield (b',' if found_ids else b'') + dumps_json({'id': user_id, 'name': name})
+            found_ids.add(user_id)
+        yield b'],"missing":' + dumps_json([i for i in ids if i not in found_ids]) + b'}'
+
+    return Response(stream_with_context(generate()), mimetype='application/json')
 
 @service_a.route('/users/<int:user_id>', methods=['DELETE'])
+@retry_when_locked(session=lambda: db.session)
 def delete_user(user_id):
     user = User.query.get(user_id)
     if user:
         db.session.delete(user)
         db.session.commit()
-        return jsonify({'message': f'User {user_id} deleted successfully'}), 200
+        forget_deleted_users([user_id])
+        body = {'message': f'User {user_id} deleted successfully'}
+        if cascade_requested():
+            schedule_task_cascade([user_id])
+            body['cascade'] = 'scheduled'
+        return jsonify(body), 200
     return jsonify({'error': 'User not found'}), 404
 
+def cascade_requested():
+    """?cascade=true (or "cascade": true in the JSON body) also removes the users' tasks"""
+    if request.args.get('cascade', '').lower() in ('1', 'true', 'yes'):
+        return True
+    data = request.get_json(silent=True)
+    return isinstance(data, dict) and data.get('cascade') is True
+
+def forget_deleted_users(user_ids=None):
+    """Have Task_Service stop accepting these users (all of them when None) right away
+
+    Without this its verification cache would vouch for a deleted user until
+    the cached answer expires. Best effort: if Task_Service can't be reached
+    the delete still succeeds, and the replica's feed or the TTL catch up.
+    """
+    start = time.perf_counter()
+    try:
+        response = cascade_session.delete(f'{TASKS_SERVICE_URL}/tasks/user-cache', timeout=FORGET_TIMEOUT,
+                                          json={} if user_ids is None else {'user_ids': list(user_ids)})
+        metrics.observe_outbound('tasks_service', 'forget_users', time.perf_counter() - start, response.status_code)
+    except requests.RequestException as e:
+        metrics.observe_outbound('tasks_service', 'forget_users', time.perf_counter() - start, 'error')
+        print(f'Could not tell Task_Service to forget users {user_ids}: {e}')
+
+def schedule_task_cascade(user_ids):
+    """Delete the tasks of the given users in Task_Service without blocking the request"""
+    cascade_executor.submit(cascade_delete_tasks, list(user_ids))
+
+def cascade_delete_tasks(user_ids):
+    for attempt in range(CASCADE_RETRIES):
+        start = time.perf_counter()
+        try:
+            if len(user_ids) == 1:
+                response = cascade_session.delete(f'{TASKS_SERVICE_URL}/users/{user_ids[0]}/tasks', timeout=5)
+            else:
+                response = cascade_session.delete(f'{TASKS_SERVICE_URL}/tasks/bulk',
+                                                  json={'user_ids': user_ids}, timeout=5)
+            metrics.observe_outbound('tasks_service', 'cascade', time.perf_counter() - start, response.status_code)
+            if response.status_code == 200:
+                print(f"Cascade: {response.json().get('deleted')} tasks deleted for users {user_ids}")
+                return
+            error = f'status {response.status_code}'
+        except requests.RequestException as e:
+            metrics.observe_outbound('tasks_service', 'cascade', time.perf_counter() - start, 'error')
+            error = str(e)
+        time.sleep(0.5 * (2 ** attempt))
+    print(f'Cascade failed for users {user_ids}: {error}')
+
 @service_a.route('/users/cleanup', methods=['DELETE'])
 def cleanup_users():
     """Delete all users - for testing purposes only"""
     try:
+        log_bulk_delete()
         num_deleted = User.query.delete()
         db.session.commit()
-        return jsonify({'message': f'Deleted {num_deleted} users'}), 200
+        forget_deleted_users()
+        return jsonify({'message': f'Deleted {num_deleted} users', 'deleted': num_deleted}), 200
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
@@ -77,15 +367,22 @@ def cleanup_specific_users():
         if not isinstance(user_ids, list):
             return jsonify({'error': 'user_ids must be a list'}), 400
         
+        # Set-based DELETE ... WHERE id IN (...), one statement per chunk of IDs
+        user_ids = list(dict.fromkeys(user_ids))
         deleted_count = 0
-        for user_id in user_ids:
-            user = User.query.get(user_id)
-            if user:
-                db.session.delete(user)
-                deleted_count += 1
+        for start in range(0, len(user_ids), IN_CLAUSE_CHUNK):
+            chunk = user_ids[start:start + IN_CLAUSE_CHUNK]
+            log_bulk_delete(User.id.in_(chunk))
+            deleted_count += User.query.filter(User.id.in_(chunk)).delete(synchronize_session=False)
         
         db.session.commit()
-        return jsonify({'message': f'Deleted {deleted_count} specific users'}), 200
+        if user_ids:
+            forget_deleted_users(user_ids)
+        body = {'message': f'Deleted {deleted_count} specific users', 'deleted': deleted_count}
+        if user_ids and cascade_requested():
+            schedule_task_cascade(user_ids)
+            body['cascade'] = 'scheduled'
+        return jsonify(body), 200
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
@@ -93,4 +390,7 @@ def cleanup_specific_users():
 if __name__ == '__main__':
     with service_a.app_context():
         db.create_all()
-    service_a.run(port=5001)
+    health.mark_ready()
+    start_wal_checkpointer(service_a, db)
+    host, port = config.bind('users')
+    service_a.run(host=host, port=port)
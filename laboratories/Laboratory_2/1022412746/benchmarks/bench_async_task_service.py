@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Load test: POST /tasks on the Flask Task_Service vs. the asyncio one (async_main.py)
+Each server runs as a single process against a stand-in Users_Service (its
+own process) that answers every lookup after --latency-ms. Every request
+uses a new user_id, so every create waits on the remote check. A closed-loop
+asyncio client keeps `concurrency` requests in flight for --duration seconds
+and reports throughput, latency percentiles and the server's peak thread count.
+"""
+
+import argparse
+import asyncio
+import itertools
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import aiohttp
+import requests
+
+ROOT = Path(__file__).resolve().parent.parent
+BENCH_DIR = Path(__file__).resolve().parent
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def serve(variant, port):
+    """Child-process mode: run one Task_Service variant on 127.0.0.1:port"""
+    sys.path.insert(0, str(ROOT / 'Task_Service'))
+    if variant == 'flask':
+        import logging
+        from werkzeug.serving import make_server
+        import main as task_service
+        logging.getLogger('werkzeug').setLevel(logging.ERROR)
+        with task_service.service_b.app_context():
+            task_service.db.create_all()
+        make_server('127.0.0.1', port, task_service.service_b, threaded=True).serve_forever()
+    else:
+        import uvicorn
+        import async_main
+        uvicorn.run(async_main.service_b, host='127.0.0.1', port=port, log_level='warning', access_log=False)
+
+
+def start_process(args, env=None):
+    return subprocess.Popen([sys.executable, *args], env={**os.environ, **(env or {})},
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def wait_until_up(url, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            requests.get(url, timeout=1)
+            return
+        except requests.RequestException:
+            time.sleep(0.1)
+    raise RuntimeError(f'{url} did not come up')
+
+
+def thread_count(pid):
+    try:
+        with open(f'/proc/{pid}/status') as status:
+            for line in status:
+                if line.startswith('Threads:'):
+                    return int(line.split()[1])
+    except OSError:
+        return None
+
+
+async def load(base_url, concurrency, duration, user_ids):
+    latencies = []
+    errors = 0
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    async with aiohttp.ClientSession(base_url, connector=connector, timeout=aiohttp.ClientTimeout(total=30)) as client:
+        deadline = time.perf_counter() + duration
+
+        async def worker():
+            nonlocal errors
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                try:
+                    async with client.post('/tasks', json={'title': 'load', 'user_id': next(user_ids)}) as response:
+                        await response.read()
+                        ok = response.status == 201
+                except (aiohttp.ClientError, asyncio.TimeoutError):
+                    ok = False
+                latencies.append(time.perf_counter() - start)
+                errors += not ok
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        'rps': len(latencies) / elapsed,
+        'p50': latencies[len(latencies) // 2] * 1000,
+        'p99': latencies[min(int(len(latencies) * 0.99), len(latencies) - 1)] * 1000,
+        'errors': errors,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 10, 50, 200])
+    parser.add_argument('--latency-ms', type=float, default=50.0, help='latency injected in the stub')
+    parser.add_argument('--duration', type=float, default=5.0, help='seconds per measurement')
+    parser.add_argument('--variants', nargs='+', default=['flask', 'asgi'], choices=['flask', 'asgi'])
+    parser.add_argument('--serve', choices=['flask', 'asgi'], help=argparse.SUPPRESS)
+    parser.add_argument('--port', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.serve, args.port)
+        return
+
+    stub_port = free_port()
+    stub = start_process([str(BENCH_DIR / 'stub_users_service.py'), '--port', str(stub_port),
+                          '--latency-ms', str(args.latency_ms), '--known-users', str(10 ** 9)])
+    user_ids = itertools.count(1)
+    workdir = tempfile.mkdtemp(prefix='bench_async_')
+    print(f'Users_Service stub latency {args.latency_ms:.0f} ms, SQLite files in {workdir}')
+    print(f"{'server':>6} | {'clients':>7} | {'req/s':>7} | {'p50 ms':>7} | {'p99 ms':>7} | {'errors':>6} | {'threads':>7}")
+    try:
+        wait_until_up(f'http://127.0.0.1:{stub_port}/users/1')
+        for variant in args.variants:
+            port = free_port()
+            server = start_process([__file__, '--serve', variant, '--port', str(port)], env={
+                'USERS_SERVICE_URL': f'http://127.0.0.1:{stub_port}',
+                'USERS_SERVICE_POOL_SIZE': str(max(args.concurrency)),
+                'TASKS_DATABASE_URI': f"sqlite:///{os.path.join(workdir, f'{variant}.db')}",
+                # The stub has no change feed; every create must make the remote check
+                'USER_REPLICA': '0',
+            })
+            try:
+                wait_until_up(f'http://127.0.0.1:{port}/tasks?limit=1')
+                for concurrency in args.concurrency:
+                    peak = [0]
+                    stop = threading.Event()
+
+                    def sample():
+                        while not stop.wait(0.2):
+                            peak[0] = max(peak[0], thread_count(server.pid) or 0)
+
+                    sampler = threading.Thread(target=sample, daemon=True)
+                    sampler.start()
+                    result = asyncio.run(load(f'http://127.0.0.1:{port}', concurrency, args.duration, user_ids))
+                    stop.set()
+                    sampler.join()
+                    print(f"{variant:>6} | {concurrency:>7} | {result['rps']:>7.0f} | {result['p50']:>7.1f} | "
+                          f"{result['p99']:>7.1f} | {result['errors']:>6} | {peak[0] or '-':>7}")
+            finally:
+                server.terminate()
+                server.wait()
+    finally:
+        stub.terminate()
+        stub.wait()
+
+
+if __name__ == '__main__':
+    main()
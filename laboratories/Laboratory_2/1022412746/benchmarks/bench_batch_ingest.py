@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Benchmark: task ingest throughput, one POST /tasks per task vs. POST /tasks/batch
+Runs Task_Service in-process (Flask test client) on a throwaway SQLite file,
+with user checks answered by the stand-in Users_Service.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from stub_users_service import start_stub
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tasks', type=int, default=2000)
+    parser.add_argument('--batch-size', type=int, default=500)
+    parser.add_argument('--users', type=int, default=200, help='distinct user_ids referenced by the tasks')
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='bench_ingest_')
+    server, base_url = start_stub(known_users=args.users)
+    os.environ['USERS_SERVICE_URL'] = base_url
+    os.environ['TASKS_DATABASE_URI'] = f"sqlite:///{os.path.join(workdir, 'tasks.db')}"
+
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'Task_Service'))
+    import main as task_service
+
+    with task_service.service_b.app_context():
+        task_service.db.create_all()
+    client = task_service.service_b.test_client()
+    tasks = [{'title': f'task {i}', 'user_id': (i % args.users) + 1} for i in range(args.tasks)]
+
+    task_service.user_cache.invalidate()
+    start = time.perf_counter()
+    for task in tasks:
+        assert client.post('/tasks', json=task).status_code == 201
+    single = args.tasks / (time.perf_counter() - start)
+
+    task_service.user_cache.invalidate()
+    start = time.perf_counter()
+    for offset in range(0, args.tasks, args.batch_size):
+        response = client.post('/tasks/batch', json=tasks[offset:offset + args.batch_size])
+        assert response.status_code == 201 and not response.get_json()['errors']
+    batch = args.tasks / (time.perf_counter() - start)
+
+    print(f'{args.tasks} tasks, {args.users} users, SQLite file in {workdir}')
+    print(f"{'POST /tasks':<28} {single:>10.0f} tasks/s")
+    print(f"{f'POST /tasks/batch ({args.batch_size})':<28} {batch:>10.0f} tasks/s   {batch / single:.1f}x")
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Benchmark: bytes on the wire and time to first byte of loading the page
+first visit:  GET / plus every stylesheet and script it references, with
+              an empty cache
+repeat visit: the same through a browser-like HTTP cache; responses that
+              are still fresh (max-age, immutable) aren't requested again,
+              the rest are revalidated with If-None-Match/If-Modified-Since
+Requests send `Accept-Encoding: br, gzip` (br only if the brotli package is
+installed), and sizes are what the server sent: headers plus the undecoded
+body. Runs against --url, or against a private stack started with the
+orchestrator on free ports.
+"""
+
+import argparse
+import gzip
+import http.client
+import re
+import socket
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from urllib.parse import urljoin, urlsplit
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+ASSET_PATTERN = re.compile(r'<(?:link[^>]+href|script[^>]+src)="([^"]+)"')
+ACCEPT_ENCODING = 'br, gzip' if brotli is not None else 'gzip'
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+class BrowserCache:
+    """Just enough of an HTTP cache: freshness from Cache-Control, validators for revalidation"""
+
+    def __init__(self):
+        self.entries = {}
+
+    def lookup(self, url):
+        """('fresh', None), ('revalidate', headers) or ('miss', None)"""
+        entry = self.entries.get(url)
+        if entry is None:
+            return 'miss', None
+        control = entry['cache-control']
+        max_age = re.search(r'max-age=(\d+)', control)
+        if 'no-cache' not in control and 'no-store' not in control and (
+                'immutable' in control or (max_age and time.time() - entry['stored'] < int(max_age.group(1)))):
+            return 'fresh', None
+        headers = {}
+        if entry['etag']:
+            headers['If-None-Match'] = entry['etag']
+        if entry['last-modified']:
+            headers['If-Modified-Since'] = entry['last-modified']
+        return ('revalidate', headers) if headers else ('miss', None)
+
+    def store(self, url, response, body):
+        if 'no-store' in (response.getheader('Cache-Control') or ''):
+            return
+        self.entries[url] = {
+            'cache-control': response.getheader('Cache-Control') or '',
+            'etag': response.getheader('ETag'),
+            'last-modified': response.getheader('Last-Modified'),
+            'stored': time.time(),
+            'body': body,
+        }
+
+
+def fetch(url, cache):
+    """One request; returns (status or 'cache', wire bytes, ttfb seconds, decoded body)"""
+    state, conditional = cache.lookup(url)
+    if state == 'fresh':
+        return 'cache', 0, 0.0, cache.entries[url]['body']
+    parts = urlsplit(url)
+    connection = http.client.HTTPConnection(parts.hostname, parts.port, timeout=10)
+    try:
+        start = time.perf_counter()
+        connection.request('GET', parts.path or '/', headers={'Accept-Encoding': ACCEPT_ENCODING, **(conditional or {})})
+        response = connection.getresponse()
+        ttfb = time.perf_counter() - start
+        body = response.read()
+    finally:
+        connection.close()
+    size = len(body) + len(f'HTTP/1.1 {response.status} {response.reason}\r\n') + 2 + sum(
+        len(name) + len(value) + 4 for name, value in response.getheaders())
+    if response.status == 304:
+        cache.entries[url]['stored'] = time.time()
+        return response.status, size, ttfb, cache.entries[url]['body']
+    encoding = response.getheader('Content-Encoding')
+    if encoding == 'gzip':
+        body = gzip.decompress(body)
+    elif encoding == 'br':
+        body = brotli.decompress(body)
+    cache.store(url, response, body)
+    return response.status, size, ttfb, body
+
+
+def load_page(base_url, cache):
+    """Rows of (url, status, wire bytes, ttfb) for the page and its assets"""
+    page_url = base_url + '/'
+    status, size, ttfb, body = fetch(page_url, cache)
+    rows = [(page_url, status, size, ttfb)]
+    for asset in ASSET_PATTERN.findall(body.decode('utf-8')):
+        url = urljoin(page_url, asset)
+        if urlsplit(url).netloc == urlsplit(page_url).netloc:
+            status, size, ttfb, _ = fetch(url, cache)
+            rows.append((url, status, size, ttfb))
+    return rows
+
+
+def measure(base_url, repeat):
+    visits = {'first visit': [], 'repeat visit': []}
+    for _ in range(repeat):
+        cache = BrowserCache()
+        visits['first visit'].append(load_page(base_url, cache))
+        visits['repeat visit'].append(load_page(base_url, cache))
+    return visits
+
+
+def report(base_url, visits):
+    print(f'{base_url}')
+    print(f"  {'visit':<13} | {'resource':<28} | {'status':>6} | {'bytes':>7} | {'ttfb p50 ms':>11}")
+    for visit, runs in visits.items():
+        for index, (url, status, size, _) in enumerate(runs[-1]):
+            ttfb = statistics.median(run[index][3] for run in runs) * 1000
+            print(f'  {visit:<13} | {urlsplit(url).path[-28:]:<28} | {status:>6} | {size:>7} | {ttfb:>11.2f}')
+        total = sum(row[2] for row in runs[-1])
+        requests_made = sum(row[1] != 'cache' for row in runs[-1])
+        print(f"  {visit:<13} | {'total':<28} | {requests_made:>4} rq | {total:>7} |")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', help='a running Front-End (default: start a private stack)')
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    if args.url:
+        report(args.url.rstrip('/'), measure(args.url.rstrip('/'), args.repeat))
+        return
+
+    from orchestrator import StackOrchestrator
+    workdir = Path(tempfile.mkdtemp(prefix='bench_frontend_page_'))
+    ports = {name: free_port() for name in ('users', 'tasks', 'frontend')}
+    env = {
+        'USERS_PORT': str(ports['users']), 'TASKS_PORT': str(ports['tasks']),
+        'FRONTEND_PORT': str(ports['frontend']),
+        'USERS_SERVICE_URL': f"http://127.0.0.1:{ports['users']}",
+        'TASKS_SERVICE_URL': f"http://127.0.0.1:{ports['tasks']}",
+        'FRONTEND_URL': f"http://127.0.0.1:{ports['frontend']}",
+        'USERS_DATABASE_URI': f"sqlite:///{workdir / 'users.db'}",
+        'TASKS_DATABASE_URI': f"sqlite:///{workdir / 'tasks.db'}",
+    }
+    with StackOrchestrator(env=env, stream_logs=False, log_dir=workdir) as stack:
+        report(stack.url('frontend'), measure(stack.url('frontend'), args.repeat))
+
+
+if __name__ == '__main__':
+    main()
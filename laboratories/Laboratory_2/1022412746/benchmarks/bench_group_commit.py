@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Benchmark: POST /users inserts/sec at 1, 8 and 64 concurrent clients,
+committing per request vs. through the group-commit writer
+Users_Service runs in-process (one Flask test client per client thread) on a
+SQLite file, so every direct commit pays its own journal sync.
+"""
+
+import argparse
+import io
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import redirect_stdout
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def run(app, total, concurrency):
+    per_client = max(total // concurrency, 1)
+
+    def client_loop(n):
+        client = app.test_client()
+        for i in range(n):
+            assert client.post('/users', json={'name': f'bench {i}'}).status_code == 201
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(client_loop, [per_client] * concurrency))
+    return per_client * concurrency / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--inserts', type=int, default=1280)
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 8, 64])
+    parser.add_argument('--max-batch', type=int, default=100)
+    parser.add_argument('--max-delay-ms', type=float, default=0.0)
+    parser.add_argument('--dir', default=None, help='directory for the SQLite file (default: a temp dir)')
+    args = parser.parse_args()
+
+    workdir = args.dir or tempfile.mkdtemp(prefix='bench_group_commit_')
+    os.environ['USERS_DATABASE_URI'] = f"sqlite:///{os.path.join(workdir, 'users.db')}"
+    sys.path.insert(0, str(ROOT / 'Users_Service'))
+    import main as users_service
+    from shared.group_commit import GroupCommitWriter
+
+    app = users_service.service_a
+    with app.app_context():
+        users_service.db.create_all()
+
+    print(f'SQLite file in {workdir}')
+    print(f"{'clients':>7} | {'commit/request':>14} | {'group commit':>12} | {'avg batch':>9}")
+    with redirect_stdout(io.StringIO()) as sink:
+        for concurrency in args.concurrency:
+            users_service.user_writer = None
+            direct = run(app, args.inserts, concurrency)
+
+            writer = GroupCommitWriter(app, users_service.db, users_service.User,
+                                       max_batch=args.max_batch, max_delay=args.max_delay_ms / 1000)
+            users_service.user_writer = writer
+            grouped = run(app, args.inserts, concurrency)
+            writer.close()
+
+            sys.__stdout__.write(f"{concurrency:>7} | {direct:>12.0f}/s | {grouped:>10.0f}/s | "
+                                 f"{writer.stats()['avg_batch']:>9}\n")
+            sink.seek(0)
+            sink.truncate(0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Benchmark: cost of the request/SQL instrumentation (shared/metrics.py)
+Users_Service runs in-process on a temporary SQLite file and serves the same
+requests with metrics on and off (Metrics.enabled), alternating many short
+rounds so drift affects both sides equally, and keeps each side's fastest
+round (the one least disturbed by the rest of the machine). Also reports
+the raw cost of one observation and of rendering /metrics.
+"""
+
+import argparse
+import io
+import os
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def per_request_us(client, method, path, requests_per_round, **kwargs):
+    call = getattr(client, method)
+    start = time.perf_counter()
+    for _ in range(requests_per_round):
+        call(path, **kwargs)
+    return (time.perf_counter() - start) / requests_per_round * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=200, help='requests per round')
+    parser.add_argument('--rounds', type=int, default=25)
+    parser.add_argument('--dir', default=None, help='directory for the SQLite file (default: a temp dir)')
+    args = parser.parse_args()
+
+    workdir = args.dir or tempfile.mkdtemp(prefix='bench_metrics_')
+    os.environ['USERS_DATABASE_URI'] = f"sqlite:///{os.path.join(workdir, 'users.db')}"
+    sys.path.insert(0, str(ROOT / 'Users_Service'))
+    import main as users_service
+    from shared.metrics import Metrics
+
+    app = users_service.service_a
+    metrics = users_service.metrics
+    with app.app_context():
+        users_service.db.create_all()
+    client = app.test_client()
+    with redirect_stdout(io.StringIO()):
+        user_id = client.post('/users', json={'name': 'bench'}).get_json()['id']
+
+    cases = [
+        ('GET /users/<id>', 'get', f'/users/{user_id}', {}),
+        ('GET /users?limit=50', 'get', '/users?limit=50', {}),
+        ('POST /users', 'post', '/users', {'json': {'name': 'bench'}}),
+    ]
+    print(f'SQLite file in {workdir}')
+    print(f"{'request':<20} | {'off us/req':>10} | {'on us/req':>10} | {'overhead':>14}")
+    with redirect_stdout(io.StringIO()) as sink:
+        for name, method, path, kwargs in cases:
+            timings = {True: [], False: []}
+            for round_number in range(args.rounds):
+                # Alternate which side goes first, so neither always runs on a warmer cache
+                for enabled in ((False, True) if round_number % 2 else (True, False)):
+                    metrics.enabled = enabled
+                    timings[enabled].append(per_request_us(client, method, path, args.requests, **kwargs))
+                sink.truncate(0)
+            off = min(timings[False])
+            on = min(timings[True])
+            sys.__stdout__.write(f'{name:<20} | {off:>10.1f} | {on:>10.1f} | '
+                                 f'{on - off:>+6.1f} us {100 * (on - off) / off:>+5.1f}%\n')
+    metrics.enabled = True
+
+    # The hooks themselves, called directly: far less noisy than the end-to-end
+    # difference on a busy machine
+    bare = Metrics()
+    iterations = 100000
+    response = app.response_class('{}')
+    with app.test_request_context(f'/users/{user_id}'):
+        from flask import request
+        request.url_rule = app.url_map.bind('localhost').match(f'/users/{user_id}', return_rule=True)[0]
+        start = time.perf_counter()
+        for _ in range(iterations):
+            bare._start_request()
+            bare._end_request(response)
+        request_us = (time.perf_counter() - start) / iterations * 1e6
+
+    class Connection:
+        info = {}
+    start = time.perf_counter()
+    for _ in range(iterations):
+        bare._start_query(Connection, None, 'SELECT user.id FROM user', (), None, False)
+        bare._end_query(Connection, None, 'SELECT user.id FROM user', (), None, False)
+    query_us = (time.perf_counter() - start) / iterations * 1e6
+
+    start = time.perf_counter()
+    body = metrics.render()
+    render_ms = (time.perf_counter() - start) * 1000
+    print(f'hooks per request: {request_us:.2f} us | per SQL statement: {query_us:.2f} us | '
+          f'render /metrics: {render_ms:.2f} ms ({len(body.splitlines())} lines)')
+
+
+if __name__ == '__main__':
+    main()
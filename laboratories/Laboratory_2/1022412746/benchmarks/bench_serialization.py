@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: rows/sec for each step of a GET /tasks list response
+fetch:  ORM Task objects (the old Task.query.all()) vs. column tuples
+encode: Flask's json provider (what jsonify used), orjson and MessagePack,
+        each also with gzip and deflate, with the resulting body size
+Task_Service's model runs against a temporary SQLite file.
+"""
+
+import argparse
+import gzip
+import os
+import sys
+import tempfile
+import time
+import zlib
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def best_time(func, repeat):
+    """Fastest of `repeat` runs, in seconds, and the last result"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--dir', default=None, help='directory for the SQLite file (default: a temp dir)')
+    args = parser.parse_args()
+
+    workdir = args.dir or tempfile.mkdtemp(prefix='bench_serialization_')
+    os.environ['TASKS_DATABASE_URI'] = f"sqlite:///{os.path.join(workdir, 'tasks.db')}"
+    sys.path.insert(0, str(ROOT / 'Task_Service'))
+    import main as task_service
+    from shared import serialization
+    from shared.serialization import COMPRESS_LEVEL, dumps_json
+
+    app, db, Task = task_service.service_b, task_service.db, task_service.Task
+    flask_dumps = app.json.dumps
+
+    encoders = [('flask json', lambda data: flask_dumps(data).encode()), ('orjson', dumps_json)]
+    if serialization.msgpack is not None:
+        encoders.append(('msgpack', serialization.msgpack.packb))
+    if serialization.orjson is None:
+        encoders[1] = ('json (no orjson)', dumps_json)
+
+    print(f'SQLite file in {workdir}')
+    with app.app_context():
+        db.create_all()
+        for rows in args.rows:
+            Task.query.delete()
+            db.session.execute(db.insert(Task), [
+                {'title': f'Tarea de prueba número {i}', 'user_id': i % 500 + 1} for i in range(rows)
+            ])
+            db.session.commit()
+
+            def fetch_orm():
+                db.session.expunge_all()
+                return [{'id': t.id, 'title': t.title, 'user_id': t.user_id} for t in Task.query.all()]
+
+            def fetch_tuples():
+                result = db.session.execute(task_service.task_rows_query()).all()
+                return [{'id': task_id, 'title': title, 'user_id': owner} for task_id, title, owner in result]
+
+            print(f'\n{rows} rows')
+            print(f"  {'fetch':<24} | {'rows/s':>10}")
+            for name, fetch in (('ORM objects', fetch_orm), ('column tuples', fetch_tuples)):
+                seconds, data = best_time(fetch, args.repeat)
+                print(f'  {name:<24} | {rows / seconds:>10.0f}')
+
+            print(f"  {'encode':<24} | {'rows/s':>10} | {'bytes':>10}")
+            for name, encoder in encoders:
+                seconds, body = best_time(lambda: encoder(data), args.repeat)
+                print(f'  {name:<24} | {rows / seconds:>10.0f} | {len(body):>10}')
+                for coding, compress in (('gzip', lambda b: gzip.compress(b, compresslevel=COMPRESS_LEVEL, mtime=0)),
+                                         ('deflate', lambda b: zlib.compress(b, COMPRESS_LEVEL))):
+                    seconds, compressed = best_time(lambda: compress(encoder(data)), args.repeat)
+                    print(f'  {name + " + " + coding:<24} | {rows / seconds:>10.0f} | {len(compressed):>10}')
+
+
+if __name__ == '__main__':
+    main()
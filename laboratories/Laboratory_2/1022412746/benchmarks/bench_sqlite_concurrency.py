@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Benchmark: are readers blocked by writers?
+One writer process keeps running large insert transactions (a batch import)
+while reader processes page through the table. Runs once with
+SQLite's defaults (rollback journal) and once with the shared storage
+profile from shared/storage.py, reporting reader latency and lock errors.
+"""
+
+import argparse
+import multiprocessing
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from shared.storage import PRAGMAS, apply_pragmas
+
+DEFAULT_PROFILE = (('journal_mode', 'DELETE'), ('synchronous', 'FULL'))
+
+
+def percentile(samples, fraction):
+    return samples[min(int(len(samples) * fraction), len(samples) - 1)] if samples else float('nan')
+
+
+def writer(path, pragmas, stop, rows_per_txn, hold, results):
+    conn = sqlite3.connect(path, timeout=5, isolation_level=None)
+    apply_pragmas(conn, pragmas)
+    written = 0
+    while not stop.is_set():
+        conn.execute('BEGIN IMMEDIATE')
+        conn.executemany('INSERT INTO task (title, user_id) VALUES (?, ?)',
+                         ((f'w {i}', i % 100) for i in range(rows_per_txn)))
+        time.sleep(hold)  # the application doing work inside the transaction
+        conn.execute('COMMIT')
+        written += rows_per_txn
+    conn.close()
+    results.put(('writer', written))
+
+
+def reader(path, pragmas, stop, results):
+    conn = sqlite3.connect(path, timeout=5)
+    apply_pragmas(conn, pragmas)
+    latencies = []
+    after = 0
+    while not stop.is_set():
+        start = time.perf_counter()
+        rows = conn.execute('SELECT id, title, user_id FROM task WHERE id > ? ORDER BY id LIMIT 100',
+                            (after,)).fetchall()
+        latencies.append((time.perf_counter() - start) * 1000)
+        after = rows[-1][0] if len(rows) == 100 else 0
+    conn.close()
+    results.put(('reader', latencies))
+
+
+def run_profile(path, pragmas, readers, duration, rows_per_txn, hold, slow_ms):
+    setup = sqlite3.connect(path)
+    apply_pragmas(setup, pragmas)
+    setup.execute('CREATE TABLE IF NOT EXISTS task (id INTEGER PRIMARY KEY, title VARCHAR(100) NOT NULL, '
+                  'user_id INTEGER NOT NULL)')
+    setup.executemany('INSERT INTO task (title, user_id) VALUES (?, ?)', ((f'seed {i}', i % 100) for i in range(20000)))
+    setup.commit()
+    setup.close()
+
+    stop = multiprocessing.Event()
+    results = multiprocessing.Queue()
+    processes = [multiprocessing.Process(target=writer, args=(path, pragmas, stop, rows_per_txn, hold, results))]
+    processes += [multiprocessing.Process(target=reader, args=(path, pragmas, stop, results)) for _ in range(readers)]
+    for process in processes:
+        process.start()
+    time.sleep(duration)
+    stop.set()
+
+    latencies = []
+    written = 0
+    for _ in processes:
+        kind, value = results.get()
+        if kind == 'writer':
+            written = value
+        else:
+            latencies.extend(value)
+    for process in processes:
+        process.join()
+
+    latencies.sort()
+    return {
+        'reads': len(latencies),
+        'p50': percentile(latencies, 0.50),
+        'p99': percentile(latencies, 0.99),
+        'max': latencies[-1],
+        'slow_reads': sum(1 for latency in latencies if latency > slow_ms),
+        'rows_written': written,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--readers', type=int, default=2)
+    parser.add_argument('--duration', type=float, default=3.0)
+    parser.add_argument('--rows-per-txn', type=int, default=100000)
+    parser.add_argument('--hold-ms', type=float, default=50.0)
+    parser.add_argument('--slow-ms', type=float, default=25.0, help='reads slower than this count as blocked')
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='bench_sqlite_')
+    print(f'{args.readers} readers, 1 writer, {args.duration}s per profile, files in {workdir}')
+    print(f"{'profile':<16} | {'reads':>7} | {'p50 ms':>7} | {'p99 ms':>7} | {'max ms':>7} | "
+          f"{'blocked reads':>13} | {'rows written':>12}")
+    for name, pragmas in (('default', DEFAULT_PROFILE), ('shared/storage', PRAGMAS)):
+        result = run_profile(os.path.join(workdir, f'{name.replace("/", "_")}.db'), pragmas, args.readers,
+                             args.duration, args.rows_per_txn, args.hold_ms / 1000, args.slow_ms)
+        print(f"{name:<16} | {result['reads']:>7} | {result['p50']:>7.3f} | {result['p99']:>7.3f} | "
+              f"{result['max']:>7.2f} | {result['slow_reads']:>13} | {result['rows_written']:>12}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-user task lookup latency as the task table grows
+Times the query behind GET /tasks?user_id= (and GET /users/<id>/tasks) on a
+SQLite file with the Task_Service schema, with and without ix_task_user_id.
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import tempfile
+import time
+
+QUERY = 'SELECT id, title, user_id FROM task WHERE user_id = ? ORDER BY id'
+
+
+def fill(conn, size, users):
+    conn.execute('DELETE FROM task')
+    rows = ((f'task {i}', random.randint(1, users)) for i in range(size))
+    conn.executemany('INSERT INTO task (title, user_id) VALUES (?, ?)', rows)
+    conn.commit()
+
+
+def time_lookups(conn, users, lookups):
+    """Median and p95 latency (ms) of per-user lookups"""
+    samples = []
+    for _ in range(lookups):
+        user_id = random.randint(1, users)
+        start = time.perf_counter()
+        conn.execute(QUERY, (user_id,)).fetchall()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return samples[len(samples) // 2], samples[int(len(samples) * 0.95) - 1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--tasks-per-user', type=int, default=20,
+                        help='the user count grows with the table so each lookup returns about this many rows')
+    parser.add_argument('--lookups', type=int, default=200)
+    args = parser.parse_args()
+
+    random.seed(42)
+    path = os.path.join(tempfile.mkdtemp(prefix='bench_lookup_'), 'tasks.db')
+    conn = sqlite3.connect(path)
+    conn.execute('CREATE TABLE task (id INTEGER PRIMARY KEY, title VARCHAR(100) NOT NULL, user_id INTEGER NOT NULL)')
+
+    print(f"{'rows':>10} | {'no index p50/p95 ms':>20} | {'indexed p50/p95 ms':>19}")
+    for size in sorted(args.sizes):
+        users = max(size // args.tasks_per_user, 1)
+        conn.execute('DROP INDEX IF EXISTS ix_task_user_id')
+        fill(conn, size, users)
+        scan = time_lookups(conn, users, max(args.lookups // 10, 10))
+        conn.execute('CREATE INDEX ix_task_user_id ON task (user_id)')
+        indexed = time_lookups(conn, users, args.lookups)
+        print(f'{size:>10} | {scan[0]:>9.3f} / {scan[1]:>8.3f} | {indexed[0]:>8.3f} / {indexed[1]:>8.3f}')
+
+    conn.close()
+
+
+if __name__ == '__main__':
+    main()
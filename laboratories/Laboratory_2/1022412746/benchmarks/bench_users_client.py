@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Benchmark: POST /tasks throughput with and without the pooled Users_Service client
+Task_Service runs in this process (threaded Werkzeug server, temporary SQLite
+file) against the stand-in Users_Service. Every task names a different user,
+so the verification cache never answers and each POST makes its remote check:
+
+requests.get: the client's session is swapped for per-call requests.get, a
+              new TCP connection for every check (as create_task used to do)
+pooled:       the shared UsersServiceClient, keep-alive connections from a
+              bounded pool
+
+Reports tasks/sec per --concurrency. Every POST also commits to SQLite,
+which bounds both columns: the difference is what a new connection per
+check costs on top of a whole task creation.
+"""
+
+import argparse
+import itertools
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import requests
+from werkzeug.serving import make_server
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from stub_users_service import start_stub
+from synthetic_tasks import load_service
+
+
+class UnpooledSession:
+    """The old call path: module-level requests.get, no connection reuse"""
+
+    def get(self, url, **kwargs):
+        return requests.get(url, **kwargs)
+
+
+def run(tasks_url, total, concurrency, user_ids):
+    """POST `total` tasks from `concurrency` threads; returns tasks/sec"""
+    local = threading.local()
+
+    def post(_):
+        if not hasattr(local, 'session'):
+            local.session = requests.Session()
+        response = local.session.post(f'{tasks_url}/tasks', json={'title': 'bench', 'user_id': next(user_ids)})
+        response.raise_for_status()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(post, range(total)))
+    return total / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 8])
+    parser.add_argument('--latency-ms', type=float, default=0.0, help='latency injected in the stub')
+    args = parser.parse_args()
+
+    runs = len(args.concurrency) * 2 * args.requests
+    stub, users_url = start_stub(known_users=runs + 1, latency=args.latency_ms / 1000)
+    workdir = Path(tempfile.mkdtemp(prefix='bench_users_client_'))
+    os.environ.update({'USERS_SERVICE_URL': users_url,
+                       'TASKS_DATABASE_URI': f"sqlite:///{workdir / 'tasks.db'}",
+                       'USERS_SERVICE_POOL_SIZE': str(max(args.concurrency))})
+    tasks_service = load_service('bench_tasks_service', 'Task_Service')
+    app = tasks_service.service_b
+    with app.app_context():
+        tasks_service.db.create_all()
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
+    server = make_server('127.0.0.1', 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    tasks_url = f'http://127.0.0.1:{server.server_port}'
+
+    client = tasks_service.users_client
+    pooled_session = client.session
+    user_ids = itertools.count(1)
+    print(f"{'concurrency':>11} | {'requests.get tasks/s':>20} | {'pooled tasks/s':>14} | {'speedup':>7}")
+    for concurrency in args.concurrency:
+        client.session = UnpooledSession()
+        baseline = run(tasks_url, args.requests, concurrency, user_ids)
+        client.session = pooled_session
+        improved = run(tasks_url, args.requests, concurrency, user_ids)
+        print(f'{concurrency:>11} | {baseline:>20.0f} | {improved:>14.0f} | {improved / baseline:>6.2f}x')
+
+    server.shutdown()
+    stub.shutdown()
+
+
+if __name__ == '__main__':
+    main()
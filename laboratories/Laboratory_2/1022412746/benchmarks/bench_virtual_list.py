@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Benchmark: the virtualized task list from 1k to 1M tasks
+For every --sizes N a private stack (temporary SQLite files, free ports) is
+seeded with N synthetic tasks (synthetic_tasks.py) and measured:
+
+api:     GET /tasks/page-index (first build, then a 304 revalidation), the
+         page's first load through the Front-End (GET /api/tasks/index:
+         index plus first page) and one GET /api/tasks page at the start,
+         middle and end of the list
+browser: headless Chrome through Selenium (skipped if it can't start):
+         page load until #tasks is data-state="ready", then jumps to the
+         middle and the end timing render() itself, the wait until the rows
+         are loaded, and the number of <li> in the DOM
+
+Render time and DOM size should stay flat: only the rows in view are drawn.
+
+    python benchmarks/bench_virtual_list.py
+    python benchmarks/bench_virtual_list.py --sizes 1000 1000000 --no-browser
+"""
+
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import requests
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from orchestrator import StackOrchestrator
+
+# Runs in the page: jump, draw synchronously, then wait for the rows to arrive
+JUMP_SCRIPT = '''
+const [fraction, done] = arguments;
+const viewport = document.getElementById('task-viewport');
+const list = document.getElementById('tasks');
+const start = performance.now();
+viewport.scrollTop = (viewport.scrollHeight - viewport.clientHeight) * fraction;
+render();
+const renderMs = performance.now() - start;
+(function poll() {
+  if (list.dataset.state === 'ready') {
+    done({render: renderMs, ready: performance.now() - start, rows: list.children.length});
+  } else {
+    setTimeout(poll, 2);
+  }
+})();
+'''
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def timed(func, repeat=1):
+    """Median milliseconds of `repeat` calls"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+
+def measure_api(tasks_url, frontend_url, repeat):
+    session = requests.Session()
+    result = {}
+    start = time.perf_counter()
+    response = session.get(f'{tasks_url}/tasks/page-index')
+    result['index'] = (time.perf_counter() - start) * 1000
+    index = response.json()
+    etag = response.headers['ETag']
+    result['index_304'] = timed(lambda: session.get(f'{tasks_url}/tasks/page-index',
+                                                    headers={'If-None-Match': etag}), repeat)
+    result['first_load'] = timed(lambda: session.get(f'{frontend_url}/api/tasks/index').raise_for_status(),
+                                 repeat)
+    anchors = index['anchors']
+    for name, page in (('page_start', 0), ('page_middle', len(anchors) // 2), ('page_end', len(anchors) - 1)):
+        result[name] = timed(lambda: session.get(f'{frontend_url}/api/tasks',
+                                                 params={'after': anchors[page] - 1}).raise_for_status(), repeat)
+    return result
+
+
+def start_browser():
+    try:
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options
+        options = Options()
+        options.add_argument('--headless=new')
+        options.add_argument('--window-size=1280,900')
+        return webdriver.Chrome(options=options)
+    except Exception as e:
+        print(f'⚠️  Browser timings skipped: {str(e).splitlines()[0]}')
+        return None
+
+
+def measure_browser(driver, frontend_url, timeout=60):
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    driver.set_script_timeout(timeout)
+    driver.get(frontend_url)
+    WebDriverWait(driver, timeout).until(
+        EC.presence_of_element_located((By.CSS_SELECTOR, '#tasks[data-state="ready"]')))
+    result = {'load': driver.execute_script('return performance.now()')}
+    for name, fraction in (('middle', 0.5), ('end', 1.0)):
+        jump = driver.execute_async_script(JUMP_SCRIPT, fraction)
+        result[f'{name}_render'] = jump['render']
+        result[f'{name}_ready'] = jump['ready']
+        result[f'{name}_rows'] = jump['rows']
+    return result
+
+
+def run_size(size, users, args, driver):
+    workdir = Path(tempfile.mkdtemp(prefix=f'bench_virtual_list_{size}_'))
+    ports = {name: free_port() for name in ('users', 'tasks', 'frontend')}
+    env = {
+        **os.environ,
+        'USERS_PORT': str(ports['users']), 'TASKS_PORT': str(ports['tasks']),
+        'FRONTEND_PORT': str(ports['frontend']),
+        'USERS_SERVICE_URL': f"http://127.0.0.1:{ports['users']}",
+        'TASKS_SERVICE_URL': f"http://127.0.0.1:{ports['tasks']}",
+        'FRONTEND_URL': f"http://127.0.0.1:{ports['frontend']}",
+        'USERS_DATABASE_URI': f"sqlite:///{workdir / 'users.db'}",
+        'TASKS_DATABASE_URI': f"sqlite:///{workdir / 'tasks.db'}",
+    }
+    env.pop('STACK_CONFIG', None)
+    subprocess.run([sys.executable, str(ROOT / 'benchmarks' / 'synthetic_tasks.py'),
+                    '--tasks', str(size), '--users', str(users)], env=env, check=True)
+
+    with StackOrchestrator(env=env, stream_logs=False, log_dir=workdir) as stack:
+        result = measure_api(stack.url('tasks'), stack.url('frontend'), args.repeat)
+        if driver is not None:
+            result.update(measure_browser(driver, stack.url('frontend')))
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000, 1000000])
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=10)
+    parser.add_argument('--no-browser', action='store_true', help='only time the API')
+    args = parser.parse_args()
+
+    driver = None if args.no_browser else start_browser()
+    results = {}
+    try:
+        for size in args.sizes:
+            results[size] = run_size(size, min(args.users, size), args, driver)
+    finally:
+        if driver is not None:
+            driver.quit()
+
+    print(f"\n{'tasks':>8} | {'index ms':>8} | {'304 ms':>6} | {'first ms':>8} | {'page ms (start/mid/end)':>23}", end='')
+    if driver is not None:
+        print(f" | {'load ms':>7} | {'render ms (mid/end)':>19} | {'ready ms (mid/end)':>18} | {'<li>':>7}", end='')
+    print()
+    for size, r in results.items():
+        pages = f"{r['page_start']:.1f}/{r['page_middle']:.1f}/{r['page_end']:.1f}"
+        print(f"{size:>8} | {r['index']:>8.1f} | {r['index_304']:>6.1f} | {r['first_load']:>8.1f} | {pages:>23}", end='')
+        if 'load' in r:
+            render = f"{r['middle_render']:.2f}/{r['end_render']:.2f}"
+            ready = f"{r['middle_ready']:.1f}/{r['end_ready']:.1f}"
+            print(f" | {r['load']:>7.0f} | {render:>19} | {ready:>18} | {r['middle_rows']:>3}/{r['end_rows']:<3}", end='')
+        print()
+
+
+if __name__ == '__main__':
+    main()
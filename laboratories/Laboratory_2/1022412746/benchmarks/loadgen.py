@@ -0,0 +1,506 @@
+#!/usr/bin/env python3
+"""
+Load generator for the Users_Service + Task_Service stack
+Drives a weighted mix of operations (create_user, get_user, list_users,
+create_task, list_tasks, delete_task) against running services, or against
+a private pair started with --spawn (temporary SQLite files, free ports).
+
+closed loop (default): --concurrency clients, each sends its next request
+    when the previous one answers
+open loop: --rate requests/s arrive on schedule (constant or --arrival
+    poisson) whether or not earlier ones have answered; latency counts from
+    the scheduled time, so a stalled server isn't hidden by a stalled client
+
+Per operation it reports throughput, error rate and latency percentiles
+from a log-linear histogram (HdrHistogram-style, <1% relative error).
+--output writes the run as JSON; --baseline compares it with an earlier
+run and exits with status 1 on a regression. --compare OLD NEW compares
+two saved runs without generating load.
+
+    python benchmarks/loadgen.py --spawn --concurrency 16 --duration 20 --output run.json
+    python benchmarks/loadgen.py --rate 200 --mix create_task=3,list_tasks=6,delete_task=1
+    python benchmarks/loadgen.py --compare base.json run.json --tolerance 0.15
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+DEFAULT_MIX = 'create_user=1,get_user=2,list_users=1,create_task=4,list_tasks=4,delete_task=1'
+PERCENTILES = (50, 90, 99, 99.9)
+
+
+class LatencyHistogram:
+    """Log-linear histogram of latencies in microseconds
+
+    Values are bucketed by their top SUB_BUCKET_BITS bits, as HdrHistogram
+    does, so every bucket is narrower than 1/128 of its value (< 1% error)
+    at any magnitude, and histograms from different runs can be merged.
+    """
+
+    SUB_BUCKET_BITS = 8
+
+    def __init__(self):
+        self.counts = {}
+        self.total = 0
+        self.sum = 0
+        self.min = None
+        self.max = 0
+
+    def record(self, seconds):
+        value = max(int(seconds * 1_000_000), 0)
+        shift = max(value.bit_length() - self.SUB_BUCKET_BITS, 0)
+        bucket = (value >> shift) << shift
+        self.counts[bucket] = self.counts.get(bucket, 0) + 1
+        self.total += 1
+        self.sum += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = max(self.max, value)
+
+    def merge(self, other):
+        for bucket, count in other.counts.items():
+            self.counts[bucket] = self.counts.get(bucket, 0) + count
+        self.total += other.total
+        self.sum += other.sum
+        if other.min is not None:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def percentile(self, p):
+        """Highest value (µs) equivalent to the p-th percentile's bucket"""
+        if not self.total:
+            return 0
+        rank = max(1, -(-self.total * p // 100))
+        seen = 0
+        for bucket in sorted(self.counts):
+            seen += self.counts[bucket]
+            if seen >= rank:
+                shift = max(bucket.bit_length() - self.SUB_BUCKET_BITS, 0)
+                return min(bucket + (1 << shift) - 1, self.max)
+        return self.max
+
+    def summary(self):
+        """Latency figures in milliseconds"""
+        result = {f'p{p:g}': self.percentile(p) / 1000 for p in PERCENTILES}
+        result.update({
+            'min': (self.min or 0) / 1000,
+            'mean': self.sum / self.total / 1000 if self.total else 0,
+            'max': self.max / 1000,
+        })
+        return result
+
+    def to_json(self):
+        return sorted(self.counts.items())
+
+
+class Stats:
+    def __init__(self):
+        self.latency = LatencyHistogram()
+        self.errors = 0
+        self.statuses = {}
+        self.skipped = 0
+
+    def record(self, seconds, status, ok):
+        self.latency.record(seconds)
+        self.statuses[str(status)] = self.statuses.get(str(status), 0) + 1
+        self.errors += not ok
+
+
+class Workload:
+    """The operations and the IDs they share
+
+    create_* operations feed the pools that get_user, create_task and
+    delete_task draw from; delete_task pops its ID so no task is deleted twice.
+    """
+
+    def __init__(self, session, users_url, tasks_url, page_size):
+        self.session = session
+        self.users_url = users_url.rstrip('/')
+        self.tasks_url = tasks_url.rstrip('/')
+        self.page_size = page_size
+        self.user_ids = []
+        self.task_ids = []
+        self.names = itertools.count(1)
+
+    async def _send(self, method, url, expected, **kwargs):
+        async with self.session.request(method, url, **kwargs) as response:
+            body = await response.read()
+            status = response.status
+        return status, status == expected, body
+
+    async def create_user(self):
+        status, ok, body = await self._send('POST', f'{self.users_url}/users', 201,
+                                            json={'name': f'Carga {next(self.names)}'})
+        if ok:
+            self.user_ids.append(json.loads(body)['id'])
+        return status, ok
+
+    async def get_user(self):
+        if not self.user_ids:
+            return None
+        status, ok, _ = await self._send('GET', f'{self.users_url}/users/{random.choice(self.user_ids)}', 200)
+        return status, ok
+
+    async def list_users(self):
+        status, ok, _ = await self._send('GET', f'{self.users_url}/users?limit={self.page_size}', 200)
+        return status, ok
+
+    async def create_task(self):
+        if not self.user_ids:
+            return None
+        status, ok, body = await self._send('POST', f'{self.tasks_url}/tasks', 201, json={
+            'title': f'Tarea de carga {next(self.names)}',
+            'user_id': random.choice(self.user_ids),
+        })
+        if ok:
+            self.task_ids.append(json.loads(body)['id'])
+        return status, ok
+
+    async def list_tasks(self):
+        status, ok, _ = await self._send('GET', f'{self.tasks_url}/tasks?limit={self.page_size}', 200)
+        return status, ok
+
+    async def delete_task(self):
+        if not self.task_ids:
+            return None
+        task_id = self.task_ids.pop(random.randrange(len(self.task_ids)))
+        status, ok, _ = await self._send('DELETE', f'{self.tasks_url}/tasks/{task_id}', 200)
+        return status, ok
+
+
+OPERATIONS = ('create_user', 'get_user', 'list_users', 'create_task', 'list_tasks', 'delete_task')
+
+
+def parse_mix(text):
+    """'create_task=4,list_tasks=6' -> {'create_task': 4.0, 'list_tasks': 6.0}"""
+    mix = {}
+    for part in filter(None, (p.strip() for p in text.split(','))):
+        name, _, weight = part.partition('=')
+        if name not in OPERATIONS:
+            raise argparse.ArgumentTypeError(f'unknown operation {name!r} (choose from {", ".join(OPERATIONS)})')
+        mix[name] = float(weight or 1)
+    if not mix or sum(mix.values()) <= 0:
+        raise argparse.ArgumentTypeError('the mix needs at least one operation with a positive weight')
+    return mix
+
+
+class Run:
+    """One measured run: picks operations from the mix and records their outcome"""
+
+    def __init__(self, workload, mix):
+        self.workload = workload
+        self.names = list(mix)
+        self.weights = list(mix.values())
+        self.stats = {name: Stats() for name in self.names}
+        self.recording = False
+        self.dropped = 0
+
+    async def execute(self, scheduled=None):
+        name = random.choices(self.names, self.weights)[0]
+        start = time.perf_counter() if scheduled is None else scheduled
+        try:
+            outcome = await getattr(self.workload, name)()
+        except Exception as e:
+            outcome = (type(e).__name__, False)
+        if not self.recording:
+            return
+        if outcome is None:
+            self.stats[name].skipped += 1
+            return
+        self.stats[name].record(time.perf_counter() - start, *outcome)
+
+    async def closed_loop(self, concurrency, deadline, think_time):
+        async def client():
+            while time.perf_counter() < deadline:
+                await self.execute()
+                if think_time:
+                    await asyncio.sleep(think_time)
+
+        await asyncio.gather(*(client() for _ in range(concurrency)))
+
+    async def open_loop(self, rate, deadline, poisson, max_inflight):
+        inflight = set()
+        next_at = time.perf_counter()
+        while next_at < deadline:
+            delay = next_at - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if len(inflight) >= max_inflight:
+                # The server has fallen this far behind; shedding keeps the client bounded
+                self.dropped += self.recording
+            else:
+                task = asyncio.ensure_future(self.execute(scheduled=next_at))
+                inflight.add(task)
+                task.add_done_callback(inflight.discard)
+            next_at += random.expovariate(rate) if poisson else 1 / rate
+        if inflight:
+            await asyncio.gather(*inflight)
+
+
+async def generate_load(args):
+    import aiohttp
+
+    connector = aiohttp.TCPConnector(limit=args.connections or 0)
+    timeout = aiohttp.ClientTimeout(total=args.timeout)
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        workload = Workload(session, args.users_url, args.tasks_url, args.page_size)
+
+        # Seed users and tasks so reads and deletes have something to work on
+        for _ in range(args.seed_users):
+            await workload.create_user()
+        for _ in range(args.seed_tasks):
+            await workload.create_task()
+
+        run = Run(workload, args.mix)
+        phases = [(False, args.warmup), (True, args.duration)] if args.warmup > 0 else [(True, args.duration)]
+        elapsed = 0.0
+        for recording, seconds in phases:
+            run.recording = recording
+            start = time.perf_counter()
+            deadline = start + seconds
+            if args.rate:
+                await run.open_loop(args.rate, deadline, args.arrival == 'poisson', args.max_inflight)
+            else:
+                await run.closed_loop(args.concurrency, deadline, args.think_time_ms / 1000)
+            elapsed = time.perf_counter() - start
+        return run, elapsed
+
+
+def build_result(args, run, elapsed):
+    endpoints = {}
+    overall = Stats()
+    for name, stats in run.stats.items():
+        overall.latency.merge(stats.latency)
+        overall.errors += stats.errors
+        count = stats.latency.total
+        endpoints[name] = {
+            'count': count,
+            'errors': stats.errors,
+            'error_rate': stats.errors / count if count else 0.0,
+            'skipped': stats.skipped,
+            'throughput': count / elapsed,
+            'statuses': stats.statuses,
+            'latency_ms': stats.latency.summary(),
+            'histogram_us': stats.latency.to_json(),
+        }
+    total = overall.latency.total
+    return {
+        'started_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'config': {
+            'mode': 'open' if args.rate else 'closed',
+            'rate': args.rate,
+            'arrival': args.arrival if args.rate else None,
+            'concurrency': None if args.rate else args.concurrency,
+            'duration': args.duration,
+            'warmup': args.warmup,
+            'mix': args.mix,
+            'users_url': args.users_url,
+            'tasks_url': args.tasks_url,
+            'spawned': args.spawn,
+        },
+        'host': {'python': platform.python_version(), 'platform': platform.platform(), 'cpus': os.cpu_count()},
+        'elapsed': elapsed,
+        'totals': {
+            'count': total,
+            'errors': overall.errors,
+            'error_rate': overall.errors / total if total else 0.0,
+            'dropped': run.dropped,
+            'throughput': total / elapsed,
+            'latency_ms': overall.latency.summary(),
+        },
+        'endpoints': endpoints,
+    }
+
+
+def print_result(result):
+    header = f"{'operation':<12} | {'req/s':>8} | {'errors':>7} |" + ''.join(f' {f"p{p:g} ms":>9} |' for p in PERCENTILES)
+    print(header + f" {'max ms':>9}")
+    print('-' * len(header + ' max ms   '))
+    rows = list(result['endpoints'].items()) + [('total', result['totals'])]
+    for name, data in rows:
+        latency = data['latency_ms']
+        print(f"{name:<12} | {data['throughput']:>8.1f} | {data['error_rate']:>6.1%} |"
+              + ''.join(f" {latency[f'p{p:g}']:>9.2f} |" for p in PERCENTILES)
+              + f" {latency['max']:>9.2f}")
+    if result['totals']['dropped']:
+        print(f"{result['totals']['dropped']} arrivals dropped (more than --max-inflight outstanding)")
+
+
+def compare_results(old, new, tolerance):
+    """Print per-operation deltas; return the regressions found
+
+    A regression is throughput down, or p50/p99 up, by more than `tolerance`
+    (a fraction), or the error rate up by more than one percentage point.
+    Open-loop throughput is the configured rate, so it only counts when
+    both runs are closed-loop.
+    """
+    regressions = []
+    # Spawned stacks get new ports every run, so the URLs aren't worth a note
+    changed = sorted(k for k in {**old['config'], **new['config']}
+                     if old['config'].get(k) != new['config'].get(k) and not k.endswith('_url'))
+    if changed:
+        print(f"Note: the runs differ in {', '.join(changed)}")
+    compare_throughput = old['config']['mode'] == new['config']['mode'] == 'closed'
+    print(f"{'operation':<12} | {'req/s':>17} | {'p50 ms':>17} | {'p99 ms':>17} | {'errors':>13}")
+    pairs = [(name, old['endpoints'].get(name), data) for name, data in new['endpoints'].items()]
+    for name, before, after in pairs + [('total', old['totals'], new['totals'])]:
+        if before is None or not before['count'] or not after['count']:
+            continue
+        cells = []
+        for label, key, higher_is_worse in (('req/s', None, False), ('p50', 'p50', True), ('p99', 'p99', True)):
+            a = before['throughput'] if key is None else before['latency_ms'][key]
+            b = after['throughput'] if key is None else after['latency_ms'][key]
+            change = (b - a) / a if a else 0.0
+            if higher_is_worse:
+                worse = change > tolerance
+            else:
+                worse = compare_throughput and change < -tolerance
+            if worse:
+                regressions.append(f'{name} {label}: {a:.2f} -> {b:.2f} ({change:+.0%})')
+            cells.append(f"{b:>8.2f} {change:>+7.0%}{'!' if worse else ' '}")
+        error_change = after['error_rate'] - before['error_rate']
+        if error_change > 0.01:
+            regressions.append(f"{name} errors: {before['error_rate']:.1%} -> {after['error_rate']:.1%}")
+        print(f"{name:<12} | {' | '.join(cells)} | {after['error_rate']:>6.1%} ({error_change:+.1%})")
+    for regression in regressions:
+        print(f'REGRESSION {regression}')
+    return regressions
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def serve(service, port):
+    """Child-process mode: run Users_Service or Task_Service on 127.0.0.1:port"""
+    import logging
+    from werkzeug.serving import make_server
+
+    sys.path.insert(0, str(ROOT / ('Users_Service' if service == 'users' else 'Task_Service')))
+    import main
+    from shared.storage import start_wal_checkpointer
+
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
+    app = main.service_a if service == 'users' else main.service_b
+    with app.app_context():
+        main.db.create_all()
+    start_wal_checkpointer(app, main.db)
+    if service == 'tasks' and os.environ.get('USER_REPLICA', '1') != '0':
+        main.user_replica.start()
+    make_server('127.0.0.1', port, app, threaded=True).serve_forever()
+
+
+def spawn_stack():
+    """Start both services on free ports with temporary databases; returns (processes, users URL, tasks URL)"""
+    import requests
+
+    workdir = tempfile.mkdtemp(prefix='loadgen_')
+    users_port, tasks_port = free_port(), free_port()
+    users_url, tasks_url = f'http://127.0.0.1:{users_port}', f'http://127.0.0.1:{tasks_port}'
+    env = {
+        **os.environ,
+        'USERS_SERVICE_URL': users_url,
+        'TASKS_SERVICE_URL': tasks_url,
+        'USERS_DATABASE_URI': f"sqlite:///{os.path.join(workdir, 'users.db')}",
+        'TASKS_DATABASE_URI': f"sqlite:///{os.path.join(workdir, 'tasks.db')}",
+    }
+    processes = [
+        subprocess.Popen([sys.executable, __file__, '--serve', service, '--port', str(port)], env=env,
+                         stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        for service, port in (('users', users_port), ('tasks', tasks_port))
+    ]
+    deadline = time.monotonic() + 30
+    for url in (f'{users_url}/users?limit=1', f'{tasks_url}/tasks?limit=1'):
+        while True:
+            try:
+                requests.get(url, timeout=1)
+                break
+            except requests.RequestException:
+                if time.monotonic() > deadline:
+                    for process in processes:
+                        process.terminate()
+                    raise RuntimeError(f'{url} did not come up')
+                time.sleep(0.1)
+    print(f'Spawned Users_Service at {users_url} and Task_Service at {tasks_url} (SQLite files in {workdir})')
+    return processes, users_url, tasks_url
+
+
+def load_json(path):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users-url', default=os.environ.get('USERS_SERVICE_URL', 'http://localhost:5001'))
+    parser.add_argument('--tasks-url', default=os.environ.get('TASKS_SERVICE_URL', 'http://localhost:5002'))
+    parser.add_argument('--spawn', action='store_true', help='start a private Users_Service + Task_Service pair')
+    parser.add_argument('--mix', type=parse_mix, default=parse_mix(DEFAULT_MIX),
+                        help=f'operation=weight,... (default {DEFAULT_MIX})')
+    parser.add_argument('--concurrency', type=int, default=8, help='closed loop: concurrent clients')
+    parser.add_argument('--think-time-ms', type=float, default=0.0, help='closed loop: pause between requests')
+    parser.add_argument('--rate', type=float, default=None, help='open loop: arrivals per second')
+    parser.add_argument('--arrival', choices=['constant', 'poisson'], default='poisson')
+    parser.add_argument('--max-inflight', type=int, default=1000, help='open loop: outstanding requests before shedding')
+    parser.add_argument('--duration', type=float, default=10.0, help='measured seconds')
+    parser.add_argument('--warmup', type=float, default=2.0, help='unmeasured seconds before the run')
+    parser.add_argument('--seed-users', type=int, default=20)
+    parser.add_argument('--seed-tasks', type=int, default=100)
+    parser.add_argument('--page-size', type=int, default=100, help='limit= for list operations')
+    parser.add_argument('--connections', type=int, default=None, help='HTTP connection limit (default: unlimited)')
+    parser.add_argument('--timeout', type=float, default=30.0, help='per-request timeout in seconds')
+    parser.add_argument('--output', help='write the run as JSON to this file')
+    parser.add_argument('--baseline', help='compare the run with this result file')
+    parser.add_argument('--compare', nargs=2, metavar=('OLD', 'NEW'), help='compare two result files and exit')
+    parser.add_argument('--tolerance', type=float, default=0.10, help='relative change counted as a regression')
+    parser.add_argument('--serve', choices=['users', 'tasks'], help=argparse.SUPPRESS)
+    parser.add_argument('--port', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.serve, args.port)
+        return 0
+    if args.compare:
+        return 1 if compare_results(load_json(args.compare[0]), load_json(args.compare[1]), args.tolerance) else 0
+
+    processes = []
+    if args.spawn:
+        processes, args.users_url, args.tasks_url = spawn_stack()
+    try:
+        mode = f'open loop, {args.rate:g} req/s ({args.arrival})' if args.rate else f'closed loop, {args.concurrency} clients'
+        print(f'{mode}, {args.duration:g}s after {args.warmup:g}s warm-up')
+        run, elapsed = asyncio.run(generate_load(args))
+    finally:
+        for process in processes:
+            process.terminate()
+            process.wait()
+
+    result = build_result(args, run, elapsed)
+    print_result(result)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2)
+        print(f'Results written to {args.output}')
+    if args.baseline:
+        print(f'\nCompared with {args.baseline}:')
+        return 1 if compare_results(load_json(args.baseline), result, args.tolerance) else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,72 @@
+"""
+Stand-in Users_Service used by the benchmarks
+Answers GET /users/<id> and GET /users?ids=... like the real service without touching a database
+"""
+
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+USER_PATH = re.compile(r'^/users/(\d+)$')
+
+
+class StubUsersHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # keep-alive, like the Werkzeug/Gunicorn servers
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        server = self.server
+        if server.latency:
+            time.sleep(server.latency)
+        url = urlsplit(self.path)
+        if url.path == '/users' and url.query:
+            ids = [int(i) for value in parse_qs(url.query).get('ids', []) for i in value.split(',') if i]
+            found = [i for i in ids if 1 <= i <= server.known_users]
+            missing = [i for i in ids if not 1 <= i <= server.known_users]
+            self._send(200, {'found': [{'id': i, 'name': f'user-{i}'} for i in found], 'missing': missing})
+            return
+        match = USER_PATH.match(url.path)
+        if match and 1 <= int(match.group(1)) <= server.known_users:
+            user_id = int(match.group(1))
+            self._send(200, {'id': user_id, 'name': f'user-{user_id}'})
+        else:
+            self._send(404, {'error': 'User not found'})
+
+    def _send(self, status, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_stub(known_users=1000, latency=0.0, host='127.0.0.1', port=0):
+    """Start the stub in a daemon thread and return (server, base_url)"""
+    server = ThreadingHTTPServer((host, port), StubUsersHandler)
+    server.daemon_threads = True
+    server.known_users = known_users
+    server.latency = latency
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f'http://{host}:{server.server_address[1]}'
+
+
+if __name__ == '__main__':
+    import argparse
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--port', type=int, default=0)
+    parser.add_argument('--latency-ms', type=float, default=0.0)
+    parser.add_argument('--known-users', type=int, default=1000, help='users 1..N exist')
+    args = parser.parse_args()
+    server, url = start_stub(known_users=args.known_users, latency=args.latency_ms / 1000, port=args.port)
+    print(f'Stub Users_Service listening on {url}', flush=True)
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
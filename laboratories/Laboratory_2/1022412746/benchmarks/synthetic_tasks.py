@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Synthetic dataset: --users users and --tasks tasks written straight into the
+services' SQLite files (USERS_DATABASE_URI/TASKS_DATABASE_URI, by default
+instance/users.db and instance/tasks.db) with multi-row INSERTs, which takes
+seconds for a million tasks where the HTTP API would take minutes.
+
+Titles are reproducible for a given --seed and owners are spread uniformly
+over the users. Existing users, tasks and change logs are replaced unless
+--append is given. Run it with the services stopped: their list caches and
+change feeds only see writes made through them.
+
+    python benchmarks/synthetic_tasks.py --tasks 1000000 --users 1000
+"""
+
+import argparse
+import importlib.util
+import random
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+VERBS = ['Terminar', 'Revisar', 'Preparar', 'Enviar', 'Corregir', 'Documentar', 'Probar', 'Desplegar']
+NOUNS = ['laboratorio', 'informe', 'presentación', 'pruebas', 'API', 'base de datos', 'frontend', 'reporte PDF']
+
+INSERT_BATCH = 10000
+
+
+def load_service(name, directory):
+    """Import <directory>/main.py as module `name` (both services call their module main)"""
+    service_dir = str(ROOT / directory)
+    if service_dir not in sys.path:
+        sys.path.insert(0, service_dir)
+    spec = importlib.util.spec_from_file_location(name, str(ROOT / directory / 'main.py'))
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def title(rng, number):
+    return f'{rng.choice(VERBS)} {rng.choice(NOUNS)} #{number}'
+
+
+def seed(tasks, users, seed=0, append=False):
+    """Write the dataset; returns the IDs of the first and last user"""
+    if users < 1:
+        raise ValueError('at least one user is needed to own the tasks')
+    rng = random.Random(seed)
+    users_service = load_service('synthetic_users_service', 'Users_Service')
+    tasks_service = load_service('synthetic_tasks_service', 'Task_Service')
+
+    with users_service.service_a.app_context():
+        db, User = users_service.db, users_service.User
+        db.create_all()
+        if not append:
+            db.session.execute(db.delete(users_service.UserChange))
+            db.session.execute(db.delete(User))
+        first_user = (db.session.execute(db.select(db.func.max(User.id))).scalar() or 0) + 1
+        connection = db.session.connection()
+        for start in range(0, users, INSERT_BATCH):
+            connection.execute(User.__table__.insert(), [
+                {'id': first_user + i, 'name': f'Usuario {first_user + i}'}
+                for i in range(start, min(start + INSERT_BATCH, users))
+            ])
+        db.session.commit()
+
+    with tasks_service.service_b.app_context():
+        db, Task = tasks_service.db, tasks_service.Task
+        db.create_all()
+        tasks_service.ensure_indexes()
+        if not append:
+            db.session.execute(db.delete(tasks_service.TaskChange))
+            db.session.execute(db.delete(Task))
+        first_task = (db.session.execute(db.select(db.func.max(Task.id))).scalar() or 0) + 1
+        connection = db.session.connection()
+        for start in range(0, tasks, INSERT_BATCH):
+            connection.execute(Task.__table__.insert(), [
+                {'title': title(rng, first_task + i), 'user_id': first_user + rng.randrange(users)}
+                for i in range(start, min(start + INSERT_BATCH, tasks))
+            ])
+        db.session.commit()
+
+    return first_user, first_user + users - 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tasks', type=int, default=100000)
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--append', action='store_true', help='keep the existing rows')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    first_user, last_user = seed(args.tasks, args.users, args.seed, args.append)
+    print(f'✅ {args.users} users (IDs {first_user}-{last_user}) and {args.tasks} tasks '
+          f'written in {time.perf_counter() - start:.1f}s')
+
+
+if __name__ == '__main__':
+    main()
@@ -44,11 +44,12 @@ def init_tasks_db():
     os.chdir(tasks_dir)
     
     # Import and configure the Flask app
-    from main import service_b, db
+    from main import service_b, db, ensure_indexes
     
     # Create database tables
     with service_b.app_context():
         db.create_all()
+        ensure_indexes()
         print("✅ Tasks database created successfully!")
         
         # Check if database file exists
@@ -7,10 +7,10 @@ This script ensures that the database structure is properly set up
 import os
 import sys
 import sqlite3
-import subprocess
-import time
 from pathlib import Path
 
+from orchestrator import StackNotReady, StackOrchestrator
+
 def create_database_structure():
     """Create database structure for both services"""
     print("🔧 Initializing database structure...")
@@ -47,59 +47,21 @@ def initialize_databases_by_starting_services():
     
     base_dir = Path(__file__).parent
     
-    # Initialize Users Service Database
-    print("🔧 Starting Users Service to create database...")
-    try:
-        users_process = subprocess.Popen(
-            [sys.executable, "main.py"],
-            cwd=base_dir / "Users_Service",
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE
-        )
-        
-        # Wait for the service to start and create the database
-        time.sleep(3)
-        
-        # Terminate the process
-        users_process.terminate()
-        users_process.wait(timeout=5)
-        
-        # Check if database was created
-        users_db_path = base_dir / "Users_Service" / "instance" / "users.db"
-        if users_db_path.exists():
-            print("✅ Users database created successfully!")
-        else:
-            print("⚠️  Users database not found!")
-            
-    except Exception as e:
-        print(f"❌ Error initializing Users database: {e}")
-    
-    # Initialize Tasks Service Database
-    print("🔧 Starting Tasks Service to create database...")
+    # Each service reports ready on /readyz once db.create_all() has run,
+    # so it is stopped as soon as its database exists
+    print("🔧 Starting Users Service and Tasks Service to create the databases...")
     try:
-        tasks_process = subprocess.Popen(
-            [sys.executable, "main.py"],
-            cwd=base_dir / "Task_Service",
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE
-        )
-        
-        # Wait for the service to start and create the database
-        time.sleep(3)
-        
-        # Terminate the process
-        tasks_process.terminate()
-        tasks_process.wait(timeout=5)
-        
-        # Check if database was created
-        tasks_db_path = base_dir / "Task_Service" / "instance" / "tasks.db"
-        if tasks_db_path.exists():
-            print("✅ Tasks database created successfully!")
+        with StackOrchestrator(services=['users', 'tasks'], stream_logs=False):
+            pass
+    except StackNotReady as e:
+        print(f"❌ Error initializing databases: {e}")
+    
+    for name, db_path in (("Users", base_dir / "Users_Service" / "instance" / "users.db"),
+                          ("Tasks", base_dir / "Task_Service" / "instance" / "tasks.db")):
+        if db_path.exists():
+            print(f"✅ {name} database created successfully!")
         else:
-            print("⚠️  Tasks database not found!")
-            
-    except Exception as e:
-        print(f"❌ Error initializing Tasks database: {e}")
+            print(f"⚠️  {name} database not found!")
 
 def create_databases_manually():
     """Create databases manually using SQLite"""
@@ -120,6 +82,13 @@ def create_databases_manually():
                 name VARCHAR(100) NOT NULL
             )
         ''')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS user_change (
+                seq INTEGER PRIMARY KEY,
+                user_id INTEGER NOT NULL,
+                op VARCHAR(10) NOT NULL
+            )
+        ''')
         
         conn.commit()
         conn.close()
@@ -142,6 +111,7 @@ def create_databases_manually():
                 user_id INTEGER NOT NULL
             )
         ''')
+        cursor.execute('CREATE INDEX IF NOT EXISTS ix_task_user_id ON task (user_id)')
         
         conn.commit()
         conn.close()
@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Stack Orchestrator
+Starts Users_Service, Task_Service and the Front-End in dependency order,
+waits for each one's GET /readyz (polling with backoff) before starting the
+next, streams their output with a [service] prefix and stops them gracefully
+(SIGINT, then SIGTERM, then SIGKILL), in reverse order.
+
+The time from the first process start to the last service ready is the
+stack's cold start; every run appends it to test_reports/cold_start.jsonl
+and prints it next to the median of the previous runs.
+
+    python orchestrator.py                      (start everything, Ctrl+C to stop)
+    python orchestrator.py --services users tasks
+
+    with StackOrchestrator() as stack:          (from Python)
+        ...                                     (everything is ready here)
+"""
+
+import argparse
+import json
+import os
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+
+import requests
+
+from shared import config
+
+BASE_DIR = Path(__file__).resolve().parent
+COLD_START_LOG = BASE_DIR / 'test_reports' / 'cold_start.jsonl'
+
+# name: (directory, services it needs ready first)
+SERVICES = {
+    'users': ('Users_Service', ()),
+    'tasks': ('Task_Service', ('users',)),
+    'frontend': ('Front-End', ('users', 'tasks')),
+}
+SERVICE_URLS = {
+    'users': config.users_service_url,
+    'tasks': config.tasks_service_url,
+    'frontend': config.frontend_url,
+}
+
+
+class StackNotReady(Exception):
+    """A service exited or did not become ready in time"""
+
+
+class PortInUse(StackNotReady):
+    """A service's port was taken, before the launch or before the service could bind it"""
+
+
+def start_order(names):
+    """`names` plus everything they depend on, dependencies first"""
+    order = []
+
+    def visit(name):
+        if name not in order:
+            for dependency in SERVICES[name][1]:
+                visit(dependency)
+            order.append(name)
+
+    for name in names:
+        visit(name)
+    return order
+
+
+def wait_until_ready(url, timeout=30.0, process=None, initial_delay=0.02, max_delay=0.25):
+    """Poll GET <url>/readyz with exponential backoff until it answers 200
+
+    Raises StackNotReady if `process` exits first or `timeout` passes.
+    """
+    deadline = time.monotonic() + timeout
+    delay = initial_delay
+    while True:
+        try:
+            if requests.get(f'{url}/readyz', timeout=1).status_code == 200:
+                return
+        except requests.RequestException:
+            pass
+        if process is not None and process.poll() is not None:
+            raise StackNotReady(f'{url}: the process exited with status {process.returncode}')
+        if time.monotonic() + delay > deadline:
+            raise StackNotReady(f'{url} was not ready after {timeout:.0f}s')
+        time.sleep(delay)
+        delay = min(delay * 1.5, max_delay)
+
+
+def ensure_port_free(host, port):
+    """Refuse to start on a taken port: /readyz would be answered by whatever holds it"""
+    with socket.socket() as sock:
+        if os.name != 'nt':
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        try:
+            sock.bind((host, port))
+        except OSError:
+            raise PortInUse(f'{host}:{port} is already in use (is another stack running?)') from None
+
+
+class StackOrchestrator:
+    def __init__(self, services=('users', 'tasks', 'frontend'), env=None, stream_logs=True,
+                 log_dir=None, ready_timeout=30.0, stop_timeout=5.0, base_dir=BASE_DIR):
+        self.order = start_order(services)
+        self.env = {**os.environ, 'PYTHONUNBUFFERED': '1', **(env or {})}
+        self.stream_logs = stream_logs
+        self.log_dir = Path(log_dir) if log_dir else None
+        self.ready_timeout = ready_timeout
+        self.stop_timeout = stop_timeout
+        self.base_dir = Path(base_dir)
+        self.processes = {}
+        self.ready_seconds = {}
+        self.cold_start = None
+        self._log_threads = []
+        self._output_tails = {}
+
+    def url(self, name):
+        """URL of a service as the stack's environment configures it"""
+        return SERVICE_URLS[name](self.env)
+
+    def start(self):
+        """Start every service and return once all are ready (the cold start, in seconds)"""
+        start = time.perf_counter()
+        try:
+            for name in self.order:
+                directory = self.base_dir / SERVICES[name][0]
+                ensure_port_free(*config.bind(name, self.env))
+                # Its own process group, so Ctrl+C in this terminal reaches only the orchestrator
+                process = subprocess.Popen(
+                    [sys.executable, 'main.py'], cwd=directory, env=self.env,
+                    stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, bufsize=1,
+                    **({'creationflags': subprocess.CREATE_NEW_PROCESS_GROUP} if os.name == 'nt'
+                       else {'start_new_session': True})
+                )
+                self.processes[name] = process
+                log_thread = self._follow_output(name, process)
+                try:
+                    wait_until_ready(self.url(name), self.ready_timeout, process)
+                except StackNotReady:
+                    if process.poll() is not None:
+                        # The port can be taken between the check above and the bind
+                        log_thread.join(timeout=1)
+                        if any('address already in use' in line.lower() for line in self._output_tails[name]):
+                            raise PortInUse(f'{self.url(name)}: the port was taken before {name} could bind it') \
+                                from None
+                    raise
+                self.ready_seconds[name] = round(time.perf_counter() - start, 3)
+                print(f'✅ {name} ready ({self.url(name)}) after {self.ready_seconds[name]:.2f}s')
+        except BaseException:
+            self.stop()
+            raise
+        self.cold_start = round(time.perf_counter() - start, 3)
+        return self.cold_start
+
+    def _follow_output(self, name, process):
+        log = open(self.log_dir / f'{name}.log', 'w', encoding='utf-8') if self.log_dir else None
+        tail = self._output_tails[name] = deque(maxlen=20)
+
+        def pump():
+            with process.stdout:
+                for line in process.stdout:
+                    tail.append(line)
+                    if self.stream_logs:
+                        sys.stdout.write(f'[{name}] {line}')
+                    if log:
+                        log.write(line)
+            if log:
+                log.close()
+
+        thread = threading.Thread(target=pump, name=f'log-{name}', daemon=True)
+        thread.start()
+        self._log_threads.append(thread)
+        return thread
+
+    def stop(self):
+        """Stop the services in reverse order: interrupt, then terminate, then kill"""
+        for name in reversed(list(self.processes)):
+            process = self.processes[name]
+            if process.poll() is None:
+                process.send_signal(signal.CTRL_BREAK_EVENT if os.name == 'nt' else signal.SIGINT)
+                for stop in (process.terminate, process.kill):
+                    try:
+                        process.wait(timeout=self.stop_timeout)
+                        break
+                    except subprocess.TimeoutExpired:
+                        stop()
+                process.wait()
+        for thread in self._log_threads:
+            thread.join(timeout=1)
+        self.processes.clear()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def record_cold_start(stack, path=COLD_START_LOG):
+    """Append the run to the cold-start history; return the median of the earlier runs"""
+    path.parent.mkdir(exist_ok=True)
+    services = ','.join(stack.order)
+    previous = []
+    if path.exists():
+        with open(path, encoding='utf-8') as f:
+            previous = [entry['cold_start'] for entry in map(json.loads, filter(str.strip, f))
+                        if entry.get('services') == services]
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(json.dumps({
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'services': services,
+            'cold_start': stack.cold_start,
+            'ready_after': stack.ready_seconds,
+        }) + '\n')
+    return statistics.median(previous[-20:]) if previous else None
+
+
+def report_cold_start(stack):
+    median = record_cold_start(stack)
+    baseline = f' (median of previous runs: {median:.2f}s)' if median is not None else ''
+    print(f'⏱️  Stack cold start: {stack.cold_start:.2f}s{baseline}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--services', nargs='+', choices=list(SERVICES), default=list(SERVICES))
+    parser.add_argument('--quiet', action='store_true', help="don't stream the services' output")
+    parser.add_argument('--log-dir', help="also write each service's output to <log-dir>/<service>.log")
+    parser.add_argument('--ready-timeout', type=float, default=30.0)
+    args = parser.parse_args()
+
+    if args.log_dir:
+        os.makedirs(args.log_dir, exist_ok=True)
+    stack = StackOrchestrator(args.services, stream_logs=not args.quiet, log_dir=args.log_dir,
+                              ready_timeout=args.ready_timeout)
+    try:
+        stack.start()
+    except StackNotReady as e:
+        print(f'❌ {e}')
+        return 1
+    report_cold_start(stack)
+    print('Press Ctrl+C to stop the stack')
+    try:
+        while all(process.poll() is None for process in stack.processes.values()):
+            time.sleep(0.5)
+        print('❌ A service exited')
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print('🛑 Stopping services...')
+        stack.stop()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -4,52 +4,29 @@ Quick Start Script
 This script helps you get the project running quickly
 """
 
-import os
 import sys
-import time
 import subprocess
 from pathlib import Path
 
+from orchestrator import StackOrchestrator, report_cold_start, wait_until_ready
+from shared import config
+
 def start_services():
-    """Start all microservices"""
+    """Start all microservices, each one once the services it depends on are ready"""
     print("🚀 Starting all microservices...")
+    print(f"🟢 Users Service on port {config.bind('users')[1]}, Task Service on port {config.bind('tasks')[1]}, "
+          f"Frontend on port {config.bind('frontend')[1]}")
     
-    base_dir = Path(__file__).parent
-    
-    # Start Users Service
-    print("🟢 Starting Users Service on port 5001...")
-    users_process = subprocess.Popen(
-        [sys.executable, "main.py"],
-        cwd=base_dir / "Users_Service",
-        creationflags=subprocess.CREATE_NEW_CONSOLE if os.name == 'nt' else 0
-    )
-    
-    time.sleep(2)
-    
-    # Start Task Service
-    print("🟢 Starting Task Service on port 5002...")
-    tasks_process = subprocess.Popen(
-        [sys.executable, "main.py"],
-        cwd=base_dir / "Task_Service",
-        creationflags=subprocess.CREATE_NEW_CONSOLE if os.name == 'nt' else 0
-    )
-    
-    time.sleep(2)
-    
-    # Start Frontend
-    print("🟢 Starting Frontend on port 5000...")
-    frontend_process = subprocess.Popen(
-        [sys.executable, "main.py"],
-        cwd=base_dir / "Front-End",
-        creationflags=subprocess.CREATE_NEW_CONSOLE if os.name == 'nt' else 0
-    )
+    stack = StackOrchestrator()
+    stack.start()
+    report_cold_start(stack)
     
     print("\n✅ All services started!")
-    print("🌐 Frontend: http://localhost:5000")
-    print("👥 Users API: http://localhost:5001/users")
-    print("📝 Tasks API: http://localhost:5002/tasks")
+    print(f"🌐 Frontend: {config.frontend_url()}")
+    print(f"👥 Users API: {config.users_service_url()}/users")
+    print(f"📝 Tasks API: {config.tasks_service_url()}/tasks")
     
-    return users_process, tasks_process, frontend_process
+    return stack
 
 def run_tests():
     """Run all tests"""
@@ -59,7 +36,8 @@ def run_tests():
     
     # Wait for services to be ready
     print("⏳ Waiting for services to be ready...")
-    time.sleep(5)
+    for url in (config.users_service_url(), config.tasks_service_url(), config.frontend_url()):
+        wait_until_ready(url)
     
     # Run backend tests
     print("🔧 Running Backend Integration Tests...")
@@ -77,8 +55,6 @@ def run_tests():
         print(result.stdout)
         print(result.stderr)
     
-    time.sleep(2)
-    
     # Run frontend tests
     print("🌐 Running Frontend E2E Tests...")
     result = subprocess.run(
@@ -103,12 +79,14 @@ def main():
     choice = input("What would you like to do?\n1. Start services only\n2. Start services and run tests\n3. Just run tests\nEnter choice (1-3): ")
     
     if choice == "1":
-        start_services()
+        stack = start_services()
         input("\nPress Enter to exit...")
+        stack.stop()
     elif choice == "2":
-        processes = start_services()
+        stack = start_services()
         run_tests()
         input("\nPress Enter to exit...")
+        stack.stop()
     elif choice == "3":
         run_tests()
     else:
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Front-End Scenarios in Parallel
+Runs browser scenarios concurrently, each in its own headless Chrome against
+its own isolated stack (free ports, temporary databases, as run_stacks.py),
+so they can't see each other's users and tasks. The page objects in
+Test/pages.py wait on the readiness signals the page exposes, never on fixed
+sleeps, and time every step; the report shows each step per scenario and the
+median of every step across them.
+
+Scenarios:
+    create_and_list   user and task through the forms, task shown for its user
+    live_updates      tasks created and deleted through the API appear and
+                      disappear without reloading the list
+    title_filter      only the tasks whose title matches are drawn
+    unknown_user      a task for a user that doesn't exist is rejected
+
+    python run_frontend_scenarios.py
+    python run_frontend_scenarios.py --copies 3 --parallel 6 --output scenarios.json
+    python run_frontend_scenarios.py --scenario live_updates --headed
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import tempfile
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import requests
+
+from run_stacks import start_stack
+
+BASE_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BASE_DIR / 'Test'))
+
+
+def create_and_list(page, stack):
+    user_id = page.create_user('Ana')
+    task_id = page.create_task('Terminar laboratorio', user_id)
+    page.filter_tasks(user_id=user_id)
+    row = page.task_row(task_id).text
+    assert 'Terminar laboratorio' in row and 'Ana' in row, row
+
+
+def live_updates(page, stack):
+    user_id = page.create_user('Luis')
+    tasks_url = stack.url('tasks')
+    response = requests.post(f'{tasks_url}/tasks', json={'title': 'Desde la API', 'user_id': user_id}, timeout=5)
+    response.raise_for_status()
+    task_id = response.json()['id']
+    # No refresh: the stream announces it
+    assert 'Desde la API' in page.task_row(task_id).text
+    requests.delete(f'{tasks_url}/tasks/{task_id}', timeout=5).raise_for_status()
+    page.wait_task_gone(task_id)
+
+
+def title_filter(page, stack):
+    user_id = page.create_user('Marta')
+    response = requests.post(f"{stack.url('tasks')}/tasks/batch", timeout=5, json=[
+        {'title': title, 'user_id': user_id} for title in ('Revisar informe', 'Preparar API', 'Revisar pruebas')])
+    response.raise_for_status()
+    created = response.json()['created']
+    page.refresh_tasks()
+    assert page.visible_task_ids() == [item['id'] for item in created], page.visible_task_ids()
+    page.filter_tasks(title='Revisar')
+    expected = [item['id'] for item in created if item['title'].startswith('Revisar')]
+    assert page.visible_task_ids() == expected, page.visible_task_ids()
+
+
+def unknown_user(page, stack):
+    from pages import FormError
+    try:
+        page.create_task('Sin dueño', 999999)
+    except FormError as e:
+        assert 'Error' in str(e), str(e)
+    else:
+        raise AssertionError('the task was created')
+
+
+SCENARIOS = {func.__name__: func for func in (create_and_list, live_updates, title_filter, unknown_user)}
+
+
+def run_scenario(index, name, headless, timeout, startup_timeout):
+    """Start a stack and a browser, run one scenario, stop both; returns its result"""
+    from pages import LabPage, StepTimer, chrome
+
+    workdir = Path(tempfile.mkdtemp(prefix=f'scenario{index}_{name}_'))
+    result = {'scenario': name, 'copy': index, 'workdir': str(workdir), 'ports': None}
+    timer = StepTimer()
+    stack = driver = None
+    try:
+        with timer.step('start_stack'):
+            stack, _ = start_stack(workdir, result, ready_timeout=startup_timeout)
+        with timer.step('start_browser'):
+            driver = chrome(headless=headless)
+        page = LabPage(driver, stack.url('frontend'), timeout=timeout, timer=timer)
+        page.open()
+        SCENARIOS[name](page, stack)
+    except Exception as e:
+        result['error'] = f'{type(e).__name__}: {e}'.strip()
+        (workdir / 'traceback.txt').write_text(traceback.format_exc())
+    finally:
+        if driver is not None:
+            driver.quit()
+        if stack is not None:
+            stack.stop()
+    result['steps'] = timer.steps
+    result['passed'] = 'error' not in result
+    return result
+
+
+def report(results):
+    for result in results:
+        print(f"\n{'✅' if result['passed'] else '❌'} {result['scenario']} #{result['copy']}"
+              f" (ports {result['ports']['users']}/{result['ports']['tasks']}/{result['ports']['frontend']})")
+        for step in result['steps']:
+            print(f"  {step['step']:<16} {step['seconds'] * 1000:>9.1f} ms  {step['status']}")
+        if not result['passed']:
+            print(f"  {result['error'].splitlines()[0]}")
+            print(f"  logs in {result['workdir']}")
+
+    by_step = {}
+    for result in results:
+        for step in result['steps']:
+            by_step.setdefault(step['step'], []).append(step['seconds'] * 1000)
+    print(f"\n{'step':<16} | {'count':>5} | {'p50 ms':>8} | {'max ms':>8}")
+    for name, times in by_step.items():
+        print(f'{name:<16} | {len(times):>5} | {statistics.median(times):>8.1f} | {max(times):>8.1f}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scenario', nargs='+', choices=sorted(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument('--copies', type=int, default=1, help='runs of every scenario')
+    parser.add_argument('--parallel', type=int, default=None, help='scenarios running at once (default: all)')
+    parser.add_argument('--headed', action='store_true', help='show the browser windows')
+    parser.add_argument('--timeout', type=float, default=10.0, help='seconds to wait for each condition')
+    parser.add_argument('--startup-timeout', type=float, default=30.0)
+    parser.add_argument('--output', help='write the results as JSON to this file')
+    args = parser.parse_args()
+
+    try:
+        import pages  # noqa: F401
+    except ImportError as e:
+        print(f'❌ The scenarios need Selenium and Chrome: {e}')
+        return 1
+
+    jobs = [(index, name) for name in args.scenario for index in range(args.copies)]
+    print(f"🚀 Running {len(jobs)} scenario(s), {args.parallel or len(jobs)} at a time")
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.parallel or len(jobs)) as pool:
+        futures = [pool.submit(run_scenario, index, name, not args.headed, args.timeout, args.startup_timeout)
+                   for index, name in jobs]
+        results = [future.result() for future in futures]
+    elapsed = time.perf_counter() - start
+
+    report(results)
+    passed = sum(result['passed'] for result in results)
+    print(f"\n📊 {passed}/{len(results)} scenarios passed in {elapsed:.1f}s")
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'elapsed': elapsed, 'scenarios': results}, f, indent=2)
+        print(f"📄 Results written to {args.output}")
+    return 0 if passed == len(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
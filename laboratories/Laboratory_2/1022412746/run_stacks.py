@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Parallel Stack Runner
+Starts N isolated stacks (Users_Service + Task_Service, and the Front-End for
+the frontend suite) on free ports with their own databases, runs the test
+suites against every stack concurrently and collects the results.
+
+Each stack gets a working directory with its databases, service logs, test
+output and PDF reports. Submissions are configured through shared/config.py,
+so only those that read it (USERS_PORT, USERS_SERVICE_URL, ...) can be run.
+A port can still be taken between choosing it and the service binding it;
+the stack is then started again on new ports.
+
+    python run_stacks.py --stacks 4
+    python run_stacks.py --stacks 2 --suite backend frontend --output results.json
+    python run_stacks.py --submission ../1022412746 --submission ../otra --stacks 2
+"""
+
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from orchestrator import PortInUse, StackOrchestrator
+
+BASE_DIR = Path(__file__).resolve().parent
+
+SUITES = {
+    'backend': ['Test/BackEnd-Test.py'],
+    # Several browsers at once: no windows
+    'frontend': ['Test/FrontEnd-Test.py', '--headless'],
+}
+
+
+# Launch attempts of a stack whose port was taken
+START_ATTEMPTS = 3
+
+# Ports already handed out in this run, so concurrent stacks never share one
+_ports_lock = threading.Lock()
+_ports_handed_out = set()
+
+
+def free_port():
+    with _ports_lock:
+        while True:
+            with socket.socket() as sock:
+                sock.bind(('127.0.0.1', 0))
+                port = sock.getsockname()[1]
+            if port not in _ports_handed_out:
+                _ports_handed_out.add(port)
+                return port
+
+
+def stack_env(workdir):
+    """Environment of an isolated stack: free ports and databases in `workdir`; returns (env, ports)"""
+    ports = {'users': free_port(), 'tasks': free_port(), 'frontend': free_port()}
+    env = {
+        **os.environ,
+        'PYTHONUNBUFFERED': '1',
+        'USERS_HOST': '127.0.0.1', 'USERS_PORT': str(ports['users']),
+        'TASKS_HOST': '127.0.0.1', 'TASKS_PORT': str(ports['tasks']),
+        'FRONTEND_HOST': '127.0.0.1', 'FRONTEND_PORT': str(ports['frontend']),
+        'USERS_SERVICE_URL': f"http://127.0.0.1:{ports['users']}",
+        'TASKS_SERVICE_URL': f"http://127.0.0.1:{ports['tasks']}",
+        'FRONTEND_URL': f"http://127.0.0.1:{ports['frontend']}",
+        'USERS_DATABASE_URI': f"sqlite:///{workdir / 'users.db'}",
+        'TASKS_DATABASE_URI': f"sqlite:///{workdir / 'tasks.db'}",
+    }
+    env.pop('STACK_CONFIG', None)
+    return env, ports
+
+
+def start_stack(workdir, result, services=('users', 'tasks', 'frontend'), attempts=START_ATTEMPTS, **options):
+    """Start an isolated stack in `workdir`, on new ports while one turns out taken
+
+    Records the ports in result['ports'] and returns (stack, env); `options`
+    go to StackOrchestrator.
+    """
+    for attempt in range(1, attempts + 1):
+        env, result['ports'] = stack_env(workdir)
+        stack = StackOrchestrator(services, env=env, stream_logs=False, log_dir=workdir, **options)
+        try:
+            stack.start()
+            return stack, env
+        except PortInUse:
+            if attempt == attempts:
+                raise
+
+
+def run_stack(index, submission, suites, startup_timeout, suite_timeout):
+    """Start one stack, run the suites against it and stop it; returns its result"""
+    workdir = Path(tempfile.mkdtemp(prefix=f'stack{index}_'))
+    result = {'stack': index, 'submission': str(submission), 'workdir': str(workdir), 'ports': None, 'suites': {}}
+
+    services = ['users', 'tasks'] + (['frontend'] if 'frontend' in suites else [])
+    stack = None
+    try:
+        stack, env = start_stack(workdir, result, services, ready_timeout=startup_timeout, base_dir=submission)
+        result['startup_seconds'] = stack.cold_start
+
+        for suite in suites:
+            suite_start = time.perf_counter()
+            log_path = workdir / f'{suite}-test.log'
+            with open(log_path, 'w') as log:
+                try:
+                    script, *script_args = SUITES[suite]
+                    completed = subprocess.run([sys.executable, str(submission / script), *script_args], cwd=workdir,
+                                               env=env, stdout=log, stderr=subprocess.STDOUT, timeout=suite_timeout)
+                    returncode = completed.returncode
+                except subprocess.TimeoutExpired:
+                    returncode = None
+            result['suites'][suite] = {
+                'passed': returncode == 0,
+                'returncode': returncode,
+                'seconds': round(time.perf_counter() - suite_start, 2),
+                'log': str(log_path),
+            }
+    except Exception as e:
+        result['error'] = str(e)
+    finally:
+        if stack is not None:
+            stack.stop()
+
+    result['reports'] = sorted(str(path) for path in (workdir / 'test_reports').glob('*.pdf'))
+    result['passed'] = 'error' not in result and all(s['passed'] for s in result['suites'].values())
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--stacks', type=int, default=2, help='stacks per submission')
+    parser.add_argument('--submission', action='append', type=Path,
+                        help='submission directory (repeatable; default: this one)')
+    parser.add_argument('--suite', nargs='+', choices=sorted(SUITES), default=['backend'])
+    parser.add_argument('--parallel', type=int, default=None, help='stacks running at once (default: all)')
+    parser.add_argument('--startup-timeout', type=float, default=30.0)
+    parser.add_argument('--suite-timeout', type=float, default=300.0)
+    parser.add_argument('--output', help='write the results as JSON to this file')
+    args = parser.parse_args()
+
+    submissions = []
+    for submission in args.submission or [BASE_DIR]:
+        submission = submission.resolve()
+        if not (submission / 'orchestrator.py').exists() or not (submission / 'shared' / 'config.py').exists():
+            print(f"⚠️  Skipping {submission}: it has no shared/config.py and /readyz, so its ports can't be changed")
+            continue
+        submissions.append(submission)
+    jobs = [(index, submission) for submission in submissions for index in range(args.stacks)]
+    if not jobs:
+        print("❌ Nothing to run")
+        return 1
+
+    print(f"🚀 Running {len(jobs)} stack(s), suites: {', '.join(args.suite)}")
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.parallel or len(jobs)) as pool:
+        futures = [pool.submit(run_stack, index, submission, args.suite, args.startup_timeout, args.suite_timeout)
+                   for index, submission in jobs]
+        results = [future.result() for future in futures]
+    elapsed = time.perf_counter() - start
+
+    print(f"\n{'stack':>5} | {'submission':<16} | {'ports (u/t/f)':<17} | {'startup':>7} | suites")
+    for result in results:
+        ports = result['ports']
+        startup = f"{result['startup_seconds']:.2f}s" if 'startup_seconds' in result else '-'
+        suites = ', '.join(f"{name} {'✅' if s['passed'] else '❌'} {s['seconds']:.1f}s"
+                           for name, s in result['suites'].items())
+        print(f"{result['stack']:>5} | {Path(result['submission']).name:<16} | "
+              f"{ports['users']}/{ports['tasks']}/{ports['frontend']:<5} | "
+              f"{startup:>7} | {suites or result.get('error')}")
+        if not result['passed']:
+            print(f"        logs in {result['workdir']}")
+
+    passed = sum(result['passed'] for result in results)
+    print(f"\n📊 {passed}/{len(results)} stacks passed in {elapsed:.1f}s")
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'elapsed': elapsed, 'stacks': results}, f, indent=2)
+        print(f"📄 Results written to {args.output}")
+    return 0 if passed == len(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -10,14 +10,16 @@ import time
 import os
 from datetime import datetime
 
+from shared import config
+
 def check_services():
     """Check if all required services are running"""
     import requests
     
     services = [
-        ("Frontend", "http://localhost:5000"),
-        ("Users Service", "http://localhost:5001/users"),
-        ("Task Service", "http://localhost:5002/tasks")
+        ("Frontend", config.frontend_url()),
+        ("Users Service", f"{config.users_service_url()}/users"),
+        ("Task Service", f"{config.tasks_service_url()}/tasks")
     ]
     
     print("🔍 Checking services...")
@@ -0,0 +1 @@
+"""Modules shared by Users_Service and Task_Service"""
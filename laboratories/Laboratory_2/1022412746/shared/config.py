@@ -0,0 +1,82 @@
+"""
+Stack configuration: bind addresses, ports, databases and peer URLs
+
+Every setting is read from the environment first, then from the JSON file
+named by STACK_CONFIG (if any), then from the defaults below, so one stack
+per machine keeps working unchanged while several can run side by side:
+
+    USERS_HOST / USERS_PORT         Users_Service bind address (127.0.0.1:5001)
+    TASKS_HOST / TASKS_PORT         Task_Service bind address (127.0.0.1:5002)
+    FRONTEND_HOST / FRONTEND_PORT   Front-End bind address (127.0.0.1:5000)
+    USERS_SERVICE_URL               how the others reach Users_Service (http://localhost:USERS_PORT)
+    TASKS_SERVICE_URL               how the others reach Task_Service (http://localhost:TASKS_PORT)
+    FRONTEND_URL                    how tests reach the Front-End (http://localhost:FRONTEND_PORT)
+    USERS_DATABASE_URI              Users_Service database (instance/users.db)
+    TASKS_DATABASE_URI              Task_Service database (instance/tasks.db)
+
+A config file holds the same names, e.g. {"USERS_PORT": 6001, "TASKS_PORT": 6002}.
+"""
+
+import functools
+import json
+import os
+
+DEFAULTS = {
+    'USERS_HOST': '127.0.0.1',
+    'USERS_PORT': 5001,
+    'TASKS_HOST': '127.0.0.1',
+    'TASKS_PORT': 5002,
+    'FRONTEND_HOST': '127.0.0.1',
+    'FRONTEND_PORT': 5000,
+}
+
+
+@functools.lru_cache(maxsize=None)
+def _file_settings(path):
+    with open(path, encoding='utf-8') as f:
+        settings = json.load(f)
+    if not isinstance(settings, dict):
+        raise ValueError(f'{path}: the configuration must be a JSON object')
+    return settings
+
+
+def setting(name, default=None, environ=None):
+    """Value of a setting: environment, then STACK_CONFIG file, then DEFAULTS/`default`
+
+    `environ` replaces os.environ, e.g. to resolve another stack's settings.
+    """
+    environ = os.environ if environ is None else environ
+    if name in environ:
+        return environ[name]
+    path = environ.get('STACK_CONFIG')
+    if path:
+        settings = _file_settings(os.path.abspath(path))
+        if name in settings:
+            return str(settings[name])
+    value = DEFAULTS.get(name, default)
+    return None if value is None else str(value)
+
+
+def bind(service, environ=None):
+    """(host, port) a service listens on; `service` is 'users', 'tasks' or 'frontend'"""
+    prefix = service.upper()
+    return setting(f'{prefix}_HOST', environ=environ), int(setting(f'{prefix}_PORT', environ=environ))
+
+
+def _url(service, name, environ):
+    url = setting(name, environ=environ)
+    if url is None:
+        url = f'http://localhost:{bind(service, environ)[1]}'
+    return url.rstrip('/')
+
+
+def users_service_url(environ=None):
+    return _url('users', 'USERS_SERVICE_URL', environ)
+
+
+def tasks_service_url(environ=None):
+    return _url('tasks', 'TASKS_SERVICE_URL', environ)
+
+
+def frontend_url(environ=None):
+    return _url('frontend', 'FRONTEND_URL', environ)
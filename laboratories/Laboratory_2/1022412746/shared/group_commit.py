@@ -0,0 +1,123 @@
+import queue
+import threading
+import time
+from concurrent import futures
+from concurrent.futures import Future
+
+
+class GroupCommitWriter:
+    """Batches concurrent inserts into shared transactions
+
+    Request threads call submit() and wait on the returned future. A single
+    background thread drains the queue, inserting up to `max_batch` rows in
+    one transaction, so N concurrent inserts cost one commit/fsync instead of
+    N. Rows that arrive while a commit is running form the next batch; with
+    `max_delay` > 0 the writer also lingers that many seconds after the first
+    row to collect more. Each future resolves with the row's column values,
+    generated ID included, only after the commit succeeded. A row whose
+    future is cancelled before its batch starts is never written.
+    """
+
+    def __init__(self, app, db, model, max_batch=100, max_delay=0.0):
+        self.app = app
+        self.db = db
+        self.model = model
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.columns = [column.name for column in model.__table__.columns]
+        self._queue = queue.Queue()
+        self._stopped = False
+        self.batches = 0
+        self.rows = 0
+        self._thread = threading.Thread(target=self._run, name=f'group-commit-{model.__tablename__}', daemon=True)
+        self._thread.start()
+
+    def submit(self, **fields):
+        """Queue one row for insertion; the future resolves to its stored values"""
+        if self._stopped:
+            raise RuntimeError('GroupCommitWriter is closed')
+        future = Future()
+        self._queue.put((fields, future))
+        return future
+
+    def insert(self, timeout=10, **fields):
+        """submit() and wait for the durable acknowledgement
+
+        Raises TimeoutError when the row is still queued after `timeout`
+        seconds; it is withdrawn then, so nothing was written. A row already
+        in a transaction by then is waited for, so the caller always learns
+        whether it was stored.
+        """
+        future = self.submit(**fields)
+        try:
+            return future.result(timeout=timeout)
+        except futures.TimeoutError:
+            if future.cancel():
+                raise TimeoutError(f'Row still queued after {timeout}s; not written') from None
+        return future.result()
+
+    def stats(self):
+        return {
+            'batches': self.batches,
+            'rows': self.rows,
+            'avg_batch': round(self.rows / self.batches, 2) if self.batches else 0.0,
+            'queued': self._queue.qsize()
+        }
+
+    def close(self, timeout=5):
+        """Flush what is queued and stop the writer thread"""
+        self._stopped = True
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+    def _run(self):
+        with self.app.app_context():
+            while True:
+                first = self._queue.get()
+                if first is None:
+                    return
+                batch = [first]
+                deadline = time.monotonic() + self.max_delay
+                while len(batch) < self.max_batch:
+                    remaining = deadline - time.monotonic()
+                    try:
+                        item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if item is None:
+                        self._queue.put(None)
+                        break
+                    batch.append(item)
+                self._flush(batch)
+
+    def _flush(self, batch):
+        # Skips rows whose caller gave up; the rest can no longer be cancelled
+        batch = [item for item in batch if item[1].set_running_or_notify_cancel()]
+        if not batch:
+            return
+        session = self.db.session
+        try:
+            self.rows += self._write(session, batch)
+            self.batches += 1
+        except Exception:
+            session.rollback()
+            # One bad row must not fail its neighbours: retry them one by one
+            for item in batch:
+                try:
+                    self.rows += self._write(session, [item])
+                    self.batches += 1
+                except Exception as e:
+                    session.rollback()
+                    item[1].set_exception(e)
+        finally:
+            session.remove()
+
+    def _write(self, session, batch):
+        objects = [self.model(**fields) for fields, _ in batch]
+        session.add_all(objects)
+        session.flush()
+        results = [{name: getattr(obj, name) for name in self.columns} for obj in objects]
+        session.commit()
+        for (_, future), result in zip(batch, results):
+            future.set_result(result)
+        return len(batch)
@@ -0,0 +1,55 @@
+"""
+Liveness and readiness endpoints
+
+    health = Health()
+    health.init_app(app, db)   # GET /healthz and GET /readyz
+    ...
+    db.create_all()
+    health.mark_ready()
+
+/healthz answers 200 as long as the process serves requests. /readyz answers
+503 until mark_ready() is called (the schema exists) and then 200 while a
+`SELECT 1` on the service's database succeeds, so an orchestrator can start
+the next service as soon as this one can really take traffic.
+"""
+
+import threading
+import time
+
+from flask import jsonify
+from sqlalchemy import text
+
+
+class Health:
+    def __init__(self):
+        self._ready = threading.Event()
+        self.started_at = time.time()
+        self.ready_at = None
+        self.db = None
+
+    def init_app(self, app, db=None):
+        self.db = db
+        app.add_url_rule('/healthz', 'healthz', self.healthz, methods=['GET'])
+        app.add_url_rule('/readyz', 'readyz', self.readyz, methods=['GET'])
+
+    def mark_ready(self):
+        if not self._ready.is_set():
+            self.ready_at = time.time()
+            self._ready.set()
+
+    @property
+    def ready(self):
+        return self._ready.is_set()
+
+    def healthz(self):
+        return jsonify({'status': 'ok', 'uptime': round(time.time() - self.started_at, 3)})
+
+    def readyz(self):
+        if not self.ready:
+            return jsonify({'status': 'starting'}), 503
+        if self.db is not None:
+            try:
+                self.db.session.execute(text('SELECT 1'))
+            except Exception as e:
+                return jsonify({'status': 'unavailable', 'error': str(e)}), 503
+        return jsonify({'status': 'ready', 'startup_seconds': round(self.ready_at - self.started_at, 3)})
@@ -0,0 +1,185 @@
+"""
+Request, database and outbound-call metrics in Prometheus text format
+
+    metrics = Metrics()
+    metrics.init_app(app)              # per-route counts/status/latency + GET /metrics
+    metrics.instrument_engine(engine)  # time every SQL statement
+    metrics.observe_outbound('users_service', 'user_exists', seconds, status)
+
+Latencies go into fixed-bucket histograms: recording is a bisect and a few
+additions under one lock, so the instrumentation can stay on. p50/p95/p99
+are estimated from the buckets (as Prometheus' histogram_quantile does) and
+exported as gauges next to the histograms. Streamed responses are timed up
+to the moment the response starts.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+
+from flask import Response, request
+from sqlalchemy import event
+
+# Upper bounds in seconds, from 0.5 ms (a cached lookup) to 10 s (a stuck call)
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+class Histogram:
+    """Counts per bucket plus sum and count; not thread-safe on its own"""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q):
+        """Linear interpolation inside the bucket holding the q-th observation"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        cumulative = 0
+        for index, count in enumerate(self.counts):
+            if cumulative + count >= rank and count:
+                if index == len(self.buckets):
+                    return self.buckets[-1]
+                lower = self.buckets[index - 1] if index else 0.0
+                return lower + (self.buckets[index] - lower) * (rank - cumulative) / count
+            cumulative += count
+        return self.buckets[-1]
+
+
+class Metrics:
+    """Thread-safe registry of the counters and histograms of one service"""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.enabled = True
+        self._lock = threading.Lock()
+        self._counters = {}    # (name, labels) -> int
+        self._histograms = {}  # (name, labels) -> Histogram
+
+    def inc(self, name, labels, amount=1):
+        key = (name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def observe(self, name, labels, value):
+        with self._lock:
+            self._observe(name, labels, value)
+
+    def observe_and_count(self, name, counter, labels, value, status):
+        """observe() plus a status-labelled counter, under a single lock acquisition"""
+        key = (counter, labels + (('status', str(status)),))
+        with self._lock:
+            self._observe(name, labels, value)
+            self._counters[key] = self._counters.get(key, 0) + 1
+
+    def _observe(self, name, labels, value):
+        key = (name, labels)
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            histogram = self._histograms[key] = Histogram(self.buckets)
+        histogram.observe(value)
+
+    def observe_outbound(self, target, operation, seconds, status):
+        """Record one call to another service; status is the HTTP code or 'error'"""
+        if not self.enabled:
+            return
+        self.observe_and_count('outbound_request_duration_seconds', 'outbound_requests_total',
+                               (('target', target), ('operation', operation)), seconds, status)
+
+    def init_app(self, app, path='/metrics'):
+        app.before_request(self._start_request)
+        app.after_request(self._end_request)
+        app.add_url_rule(path, 'metrics', self.render_response, methods=['GET'])
+
+    def instrument_engine(self, engine):
+        event.listen(engine, 'before_cursor_execute', self._start_query)
+        event.listen(engine, 'after_cursor_execute', self._end_query)
+
+    # Each access through the `request` proxy costs about as much as recording
+    # the observation, so the request object is resolved once
+    def _start_request(self):
+        if self.enabled:
+            request.environ['metrics.start'] = time.perf_counter()
+
+    def _end_request(self, response):
+        current = request._get_current_object()
+        start = current.environ.pop('metrics.start', None)
+        if start is None or not self.enabled:
+            return response
+        elapsed = time.perf_counter() - start
+        route = current.url_rule.rule if current.url_rule is not None else '<unmatched>'
+        self.observe_and_count('http_request_duration_seconds', 'http_requests_total',
+                               (('method', current.method), ('route', route)), elapsed, response.status_code)
+        return response
+
+    def _start_query(self, conn, cursor, statement, parameters, context, executemany):
+        if self.enabled:
+            conn.info['metrics_query_start'] = time.perf_counter()
+
+    def _end_query(self, conn, cursor, statement, parameters, context, executemany):
+        start = conn.info.pop('metrics_query_start', None)
+        if start is None or not self.enabled:
+            return
+        operation = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else 'OTHER'
+        self.observe('db_query_duration_seconds', (('operation', operation),), time.perf_counter() - start)
+
+    def render(self):
+        """All metrics in the Prometheus text exposition format"""
+        with self._lock:
+            counters = sorted(self._counters.items())
+            histograms = sorted(
+                (key, (list(h.counts), h.sum, h.count, [h.quantile(q) for q in QUANTILES]))
+                for key, h in self._histograms.items()
+            )
+
+        lines = []
+        declared = set()
+        for (name, labels), value in counters:
+            if name not in declared:
+                declared.add(name)
+                lines.append(f'# TYPE {name} counter')
+            lines.append(f'{name}{format_labels(labels)} {value}')
+
+        for (name, labels), (counts, total, count, quantiles) in histograms:
+            if name not in declared:
+                declared.add(name)
+                lines.append(f'# TYPE {name} histogram')
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += bucket_count
+                le = '+Inf' if bound == float('inf') else repr(bound)
+                lines.append(f'{name}_bucket{format_labels(labels + (("le", le),))} {cumulative}')
+            lines.append(f'{name}_sum{format_labels(labels)} {total!r}')
+            lines.append(f'{name}_count{format_labels(labels)} {count}')
+
+        for (name, labels), (_, _, _, quantiles) in histograms:
+            gauge = f'{name.removesuffix("_seconds")}_quantile_seconds'
+            if gauge not in declared:
+                declared.add(gauge)
+                lines.append(f'# TYPE {gauge} gauge')
+            for q, value in zip(QUANTILES, quantiles):
+                lines.append(f'{gauge}{format_labels(labels + (("quantile", str(q)),))} {value:.6f}')
+        return '\n'.join(lines) + '\n'
+
+    def render_response(self):
+        return Response(self.render(), mimetype='text/plain; version=0.0.4')
+
+
+def format_labels(labels):
+    if not labels:
+        return ''
+    pairs = ','.join(f'{key}="{escape_label(value)}"' for key, value in labels)
+    return '{' + pairs + '}'
+
+
+def escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
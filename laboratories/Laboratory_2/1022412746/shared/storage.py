@@ -0,0 +1,142 @@
+"""
+SQLite storage profile shared by Users_Service and Task_Service
+
+configure_sqlite() points a service at its database file and sets the
+engine/pool options; init_storage() applies the PRAGMAs below to every new
+connection. The profile can be tuned with environment variables:
+
+    SQLITE_SYNCHRONOUS   NORMAL (default) | FULL | OFF
+    SQLITE_BUSY_TIMEOUT  milliseconds to wait on a locked database (5000)
+    SQLITE_MMAP_SIZE     bytes of the file mapped into memory (256 MiB)
+    SQLITE_CACHE_KB      page cache per connection in KiB (65536)
+    SQLITE_POOL_SIZE     pooled connections per worker process (10)
+"""
+
+import functools
+import os
+import random
+import threading
+import time
+
+from sqlalchemy import event
+from sqlalchemy.exc import OperationalError
+
+from .config import setting
+
+SYNCHRONOUS = os.environ.get('SQLITE_SYNCHRONOUS', 'NORMAL').upper()
+BUSY_TIMEOUT_MS = int(os.environ.get('SQLITE_BUSY_TIMEOUT', '5000'))
+MMAP_SIZE = int(os.environ.get('SQLITE_MMAP_SIZE', str(256 * 1024 * 1024)))
+CACHE_KB = int(os.environ.get('SQLITE_CACHE_KB', '65536'))
+POOL_SIZE = int(os.environ.get('SQLITE_POOL_SIZE', '10'))
+
+# Applied in this order on every new connection. WAL lets readers run while a
+# writer commits; synchronous=NORMAL is durable across application crashes in
+# WAL mode and only risks the last transactions on power loss.
+PRAGMAS = (
+    ('journal_mode', 'WAL'),
+    ('synchronous', SYNCHRONOUS),
+    ('busy_timeout', BUSY_TIMEOUT_MS),
+    ('mmap_size', MMAP_SIZE),
+    ('cache_size', -CACHE_KB),
+    ('temp_store', 'MEMORY'),
+)
+
+
+def configure_sqlite(app, filename, env_var):
+    """Set the database URI (instance/<filename> unless the `env_var` setting overrides it) and engine options"""
+    instance_dir = os.path.join(app.root_path, 'instance')
+    os.makedirs(instance_dir, exist_ok=True)
+    default_uri = f"sqlite:///{os.path.join(instance_dir, filename)}"
+    uri = setting(env_var, default_uri)
+
+    app.config['SQLALCHEMY_DATABASE_URI'] = uri
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    if is_file_database(uri):
+        # The driver-level timeout is the busy handler for the first statements
+        # of a connection, before the busy_timeout PRAGMA runs
+        app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+            'pool_size': POOL_SIZE,
+            'max_overflow': POOL_SIZE,
+            'pool_pre_ping': False,
+            'connect_args': {'timeout': BUSY_TIMEOUT_MS / 1000, 'check_same_thread': False},
+        }
+
+
+def is_file_database(uri):
+    return uri.startswith('sqlite:///') and ':memory:' not in uri and 'mode=memory' not in uri
+
+
+def apply_pragmas(dbapi_connection, pragmas=PRAGMAS):
+    """Run the storage PRAGMAs on a raw sqlite3 connection"""
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in pragmas:
+            cursor.execute(f'PRAGMA {name}={value}')
+    finally:
+        cursor.close()
+
+
+def init_storage(app, db):
+    """Hook the PRAGMAs into the engine and make the pool safe across worker forks"""
+    with app.app_context():
+        engine = db.engine
+    if not is_file_database(str(engine.url)):
+        return engine
+
+    event.listen(engine, 'connect', lambda dbapi_connection, _record: apply_pragmas(dbapi_connection))
+    if hasattr(os, 'register_at_fork'):
+        # Workers forked from a preloaded app must open their own connections
+        os.register_at_fork(after_in_child=lambda: engine.dispose(close=False))
+    return engine
+
+
+def is_locked_error(error):
+    message = str(getattr(error, 'orig', error)).lower()
+    return 'database is locked' in message or 'database is busy' in message
+
+
+def retry_when_locked(attempts=4, base_delay=0.05, session=None):
+    """Retry a unit of work that hit SQLITE_BUSY after busy_timeout gave up
+
+    busy_timeout does not help when a read transaction tries to upgrade to a
+    write while another writer commits; the whole unit has to be re-run.
+    `session` (a callable returning the session) is rolled back between tries.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            for attempt in range(attempts):
+                try:
+                    return func(*args, **kwargs)
+                except OperationalError as e:
+                    if not is_locked_error(e) or attempt == attempts - 1:
+                        raise
+                    if session is not None:
+                        session().rollback()
+                    time.sleep(base_delay * (2 ** attempt) * (1 + random.random()))
+        return wrapper
+    return decorator
+
+
+def start_wal_checkpointer(app, db, interval=30.0, mode='PASSIVE'):
+    """Checkpoint the WAL in the background so it doesn't grow without bound
+
+    PASSIVE never blocks readers or writers; whatever it couldn't copy is
+    picked up on the next run.
+    """
+    with app.app_context():
+        engine = db.engine
+    if not is_file_database(str(engine.url)):
+        return None
+    stop = threading.Event()
+
+    def run():
+        while not stop.wait(interval):
+            try:
+                with engine.connect() as connection:
+                    connection.exec_driver_sql(f'PRAGMA wal_checkpoint({mode})')
+            except Exception as e:
+                print(f'WAL checkpoint failed: {e}')
+
+    threading.Thread(target=run, name='wal-checkpoint', daemon=True).start()
+    return stop
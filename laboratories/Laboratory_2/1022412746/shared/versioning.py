@@ -0,0 +1,185 @@
+"""
+Per-table version counters and conditional GET for list endpoints
+
+Every commit that inserted, updated or deleted rows of a tracked table bumps
+that table's version. List endpoints derive their ETag from the version, so
+If-None-Match is answered with 304 without touching the database, and the
+serialized body is cached per version so unchanged tables are served from
+memory.
+
+The counters live in the process: run a single worker per service (the
+Flask server does) or a write handled by another worker would not be seen.
+"""
+
+import threading
+import time
+import uuid
+from email.utils import formatdate
+
+from flask import Response, request
+from sqlalchemy import event
+
+from .serialization import JSON, encode, negotiate
+
+
+class TableVersions:
+    """Monotonic version per table, bumped after each commit that wrote it"""
+
+    def __init__(self, db, tables):
+        # A fresh prefix per process keeps ETags from a previous run from matching
+        self.instance = uuid.uuid4().hex[:8]
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        self._versions = {table: 0 for table in tables}
+        self._modified = {table: time.time() for table in tables}
+        # Without a Flask-SQLAlchemy db the caller bump()s after its own commits
+        if db is not None:
+            event.listen(db.session, 'after_flush', self._after_flush)
+            event.listen(db.session, 'do_orm_execute', self._do_orm_execute)
+            event.listen(db.session, 'after_commit', self._after_commit)
+            event.listen(db.session, 'after_rollback', self._forget)
+
+    def current(self, table):
+        """(version, last-modified timestamp) of a table"""
+        with self._lock:
+            return self._versions[table], self._modified[table]
+
+    def etag(self, table, version=None):
+        if version is None:
+            version = self.current(table)[0]
+        return f'{self.instance}-{table}-{version}'
+
+    def bump(self, *tables):
+        with self._lock:
+            now = time.time()
+            for table in tables:
+                if table in self._versions:
+                    self._versions[table] += 1
+                    self._modified[table] = now
+            self._changed.notify_all()
+
+    def wait_for_change(self, table, version, timeout):
+        """Block until the table is past `version` or `timeout` seconds pass; returns the current version"""
+        with self._lock:
+            self._changed.wait_for(lambda: self._versions[table] != version, timeout)
+            return self._versions[table]
+
+    def _touch(self, session, table):
+        if table in self._versions:
+            session.info.setdefault('touched_tables', set()).add(table)
+
+    def _after_flush(self, session, flush_context):
+        for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+            table = getattr(obj, '__table__', None)
+            if table is not None:
+                self._touch(session, table.name)
+
+    def _do_orm_execute(self, state):
+        # Query.delete()/update() and insert()/delete() statements skip the flush
+        if state.is_insert or state.is_update or state.is_delete:
+            table = getattr(state.statement, 'table', None)
+            if table is not None:
+                self._touch(session=state.session, table=table.name)
+
+    def _after_commit(self, session):
+        touched = session.info.pop('touched_tables', None)
+        if touched:
+            self.bump(*touched)
+
+    def _forget(self, session):
+        session.info.pop('touched_tables', None)
+
+
+class ListCache:
+    """Serialized list bodies for the current version of each table"""
+
+    def __init__(self, max_variants=64):
+        self.max_variants = max_variants
+        self._lock = threading.Lock()
+        self._entries = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, table, version, variant):
+        with self._lock:
+            entry = self._entries.get(table)
+            if entry and entry[0] == version and variant in entry[1]:
+                self.hits += 1
+                return entry[1][variant]
+            self.misses += 1
+            return None
+
+    def put(self, table, version, variant, body):
+        with self._lock:
+            entry = self._entries.get(table)
+            if not entry or entry[0] < version:
+                entry = (version, {})
+                self._entries[table] = entry
+            elif entry[0] > version:
+                return  # built from an older version while a newer one was cached
+            if len(entry[1]) < self.max_variants:
+                entry[1][variant] = body
+
+
+def conditional_list(versions, cache, table, build_data):
+    """Answer a list GET with ETag/Last-Modified, 304 or the body cached for this version
+
+    build_data() returns the list as plain Python data and only runs when this
+    version hasn't been served yet with this path, query string, format and coding.
+    The body is cached already encoded (and compressed).
+    """
+    version, modified, etag, variant, not_modified = list_validators(versions, table, request)
+    cached = None
+    if not not_modified:
+        cached = cache.get(table, version, variant)
+        if cached is None:
+            cached = encode(build_data(), *variant[2:])
+            cache.put(table, version, variant, cached)
+    return list_response(Response, cached, variant[2], etag, modified)
+
+
+async def conditional_list_async(versions, cache, table, build_data, req, response_class):
+    """conditional_list() for an asyncio app: build_data is a coroutine function,
+    req the framework's request and response_class its Response"""
+    version, modified, etag, variant, not_modified = list_validators(versions, table, req)
+    cached = None
+    if not not_modified:
+        cached = cache.get(table, version, variant)
+        if cached is None:
+            cached = encode(await build_data(), *variant[2:])
+            cache.put(table, version, variant, cached)
+    return list_response(response_class, cached, variant[2], etag, modified)
+
+
+def list_validators(versions, table, req):
+    """(version, modified, etag, cache variant, whether req already has this version)"""
+    version, modified = versions.current(table)
+    mimetype, encoding = negotiate(req)
+    etag = versions.etag(table, version)
+    if mimetype != JSON:
+        etag += '-msgpack'
+
+    not_modified = False
+    if req.if_none_match:
+        not_modified = req.if_none_match.contains_weak(etag)
+    elif req.if_modified_since is not None:
+        not_modified = int(modified) <= req.if_modified_since.timestamp()
+    return version, modified, etag, (req.path, req.query_string, mimetype, encoding), not_modified
+
+
+def list_response(response_class, cached, mimetype, etag, modified):
+    """304 when cached is None, else the encoded body; with the validators set"""
+    if cached is None:
+        response = response_class(status=304)
+    else:
+        body, applied_encoding = cached
+        response = response_class(body, mimetype=mimetype)
+        if applied_encoding:
+            response.headers['Content-Encoding'] = applied_encoding
+
+    response.vary.update(('Accept', 'Accept-Encoding'))
+    response.set_etag(etag, weak=True)
+    response.headers['Last-Modified'] = formatdate(modified, usegmt=True)
+    # Clients may keep the body but must revalidate it on every use
+    response.headers['Cache-Control'] = 'no-cache'
+    return response